@@ -8,6 +8,8 @@ from datetime import datetime
 import csv
 from io import StringIO
 
+from engine import generate_text_report
+
 st.set_page_config(
     page_title="EU Digital Resilience Toolkit", 
     page_icon="🛡️", 
@@ -42,71 +44,6 @@ def calculate_risk_level(score: int) -> str:
     else:
         return "HIGH"
 
-def generate_text_report(result: AssessmentResult) -> str:
-    """Generate professional text report"""
-    report = f"""
-================================================================================
-EU DIGITAL RESILIENCE ASSESSMENT REPORT
-================================================================================
-
-Generated: {result.timestamp}
-Sector: {result.sector}
-Regulatory Scope: {result.scope}
-
---------------------------------------------------------------------------------
-EXECUTIVE SUMMARY
---------------------------------------------------------------------------------
-
-Total Risk Score: {result.total_score}/100
-Risk Classification: {result.risk_level}
-
-Domain Breakdown:
-  - Governance & Scope:        {result.governance_score}/25
-  - Logging & Monitoring:      {result.logging_score}/25
-  - ICT Third-Party Risk:      {result.third_party_score}/25
-  - Incident & Resilience:     {result.incident_score}/25
-
---------------------------------------------------------------------------------
-REGULATORY GAPS IDENTIFIED
---------------------------------------------------------------------------------
-"""
-    
-    for domain, gaps in result.regulatory_gaps.items():
-        if gaps:
-            report += f"\n{domain}:\n"
-            for gap in gaps:
-                report += f"  - {gap}\n"
-    
-    report += f"""
---------------------------------------------------------------------------------
-FINDINGS ({len(result.findings)} items)
---------------------------------------------------------------------------------
-"""
-    for i, finding in enumerate(result.findings, 1):
-        report += f"{i}. {finding}\n"
-    
-    report += f"""
---------------------------------------------------------------------------------
-RECOMMENDATIONS ({len(result.recommendations)} items)
---------------------------------------------------------------------------------
-"""
-    for i, rec in enumerate(result.recommendations, 1):
-        priority = "[HIGH]" if i <= 3 else "[MEDIUM]" if i <= 6 else "[LOW]"
-        report += f"{priority} {rec}\n"
-    
-    report += """
---------------------------------------------------------------------------------
-DISCLAIMER
---------------------------------------------------------------------------------
-This assessment is a readiness and risk evaluation tool. It does not constitute
-legal advice. Organizations should consult legal counsel for compliance strategy.
-
-Tool: EU Digital Resilience Toolkit v1.0
-Framework: NIS2 Directive + DORA Regulation (integrated assessment)
-================================================================================
-"""
-    return report
-
 def generate_csv_export(result: AssessmentResult) -> str:
     """Generate CSV export for data analysis"""
     output = StringIO()
@@ -0,0 +1,92 @@
+"""
+EU Digital Resilience Toolkit - assessment engine.
+
+Headless scoring, feedback and reporting for the NIS2/DORA assessment.
+This package never imports Streamlit, so batch jobs and worker processes
+can use it without the UI start-up cost. The Streamlit pages are thin
+clients on top of it.
+
+Modules with heavy imports are not re-exported here; import them from
+their submodule when needed: engine.bundle (zipfile, process pools),
+engine.serialize (orjson), engine.store (sqlite3), engine.pdf (fpdf2).
+"""
+
+from .models import AssessmentResult
+from .rules import Rule, RULES, RULE_IDS, rule_mask, mask_rule_ids
+from .scoring import (
+    TIMESTAMP_FORMAT,
+    RISK_LEVELS,
+    DOMAINS,
+    calculate_risk_level,
+    assess_governance,
+    assess_logging,
+    assess_third_party,
+    assess_incident,
+    build_result,
+    assess,
+)
+from .catalog import Catalog, CatalogError, load_catalog, get_catalog
+from .feedback import get_answer_feedback, get_practical_advice
+from .reports import generate_text_report, generate_csv_export
+from .render import render_report, write_report
+from .compact import CompactResult
+from .bulk import score_many
+from .cache import LRUCache, DOMAIN_CACHE, cached_assess, cached_assess_masked
+from .exports import ExportCache, EXPORT_CACHE, result_digest, get_export
+from .incremental import LiveAssessment
+from .analytics import PortfolioStats, portfolio_stats
+from .sketch import ScoreSketch
+from .diff import AssessmentDiff, diff_results, diff_answers, diff_many
+from .remediation import Change, RemediationPlan, ranked_changes, plan_remediation, plan_many
+
+__all__ = [
+    'AssessmentResult',
+    'Rule',
+    'RULES',
+    'RULE_IDS',
+    'rule_mask',
+    'mask_rule_ids',
+    'TIMESTAMP_FORMAT',
+    'RISK_LEVELS',
+    'DOMAINS',
+    'calculate_risk_level',
+    'assess_governance',
+    'assess_logging',
+    'assess_third_party',
+    'assess_incident',
+    'build_result',
+    'assess',
+    'Catalog',
+    'CatalogError',
+    'load_catalog',
+    'get_catalog',
+    'get_answer_feedback',
+    'get_practical_advice',
+    'generate_text_report',
+    'render_report',
+    'write_report',
+    'generate_csv_export',
+    'CompactResult',
+    'score_many',
+    'LRUCache',
+    'DOMAIN_CACHE',
+    'cached_assess',
+    'cached_assess_masked',
+    'ExportCache',
+    'EXPORT_CACHE',
+    'result_digest',
+    'get_export',
+    'LiveAssessment',
+    'PortfolioStats',
+    'portfolio_stats',
+    'ScoreSketch',
+    'AssessmentDiff',
+    'diff_results',
+    'diff_answers',
+    'diff_many',
+    'Change',
+    'RemediationPlan',
+    'ranked_changes',
+    'plan_remediation',
+    'plan_many',
+]
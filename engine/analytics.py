@@ -0,0 +1,239 @@
+# engine/analytics.py - EU Digital Resilience Toolkit
+# Single-pass portfolio analytics with mergeable accumulators
+#
+# PortfolioStats consumes AssessmentResults (or CompactResults) once and
+# keeps only fixed-size counters: a histogram per domain score (0-25) and
+# for the total (0-100), risk level counts per sector, and how often each
+# rule fired (read from rule_mask). Score sketches per sector and per
+# regulatory scope give exact percentiles (see engine/sketch.py). Memory
+# does not grow with the number of results, and partial stats from
+# parallel workers or separate time windows merge exactly.
+
+from typing import Iterable
+
+from .questions import DOMAIN_KEYS, scope_entries
+from .rules import RULES, RULE_IDS, DOMAIN_MAX_SCORE, format_rule_texts
+from .scoring import DOMAINS, RISK_LEVELS
+from .sketch import (
+    DEFAULT_QUANTILES, ScoreSketch, histogram_quantile, new_sketches, add_result,
+    merge_sketches,
+)
+
+MAX_TOTAL_SCORE = DOMAIN_MAX_SCORE * len(DOMAIN_KEYS)
+
+# domain key -> report label ('governance' -> 'Governance & Scope')
+_DOMAIN_LABELS = dict(zip(DOMAIN_KEYS, (label for label, _ in DOMAINS)))
+
+def _rule_label(i: int, field: str) -> str:
+    """Finding or gap text of RULES[i], with templated parts elided"""
+    finding, gap, _ = format_rule_texts(i, answer='…', cloud_count='…')
+    return finding if field == 'finding' else gap
+
+class PortfolioStats:
+    """Mergeable score distributions, risk mix and gap frequencies"""
+
+    def __init__(self):
+        self.count = 0
+        # histograms[key][score] = number of results with that score
+        self.histograms = {domain: [0] * (DOMAIN_MAX_SCORE + 1) for domain in DOMAIN_KEYS}
+        self.histograms['total'] = [0] * (MAX_TOTAL_SCORE + 1)
+        # sector -> risk level -> count
+        self.risk_by_sector = {}
+        # rule_counts[i] = number of results where RULES[i] fired
+        self.rule_counts = [0] * len(RULES)
+        # sector / single scope entry -> score key -> ScoreSketch
+        self.by_sector = {}
+        self.by_scope = {}
+
+    # -----------------------------
+    # Accumulation
+    # -----------------------------
+
+    def add(self, result):
+        """Fold one AssessmentResult or CompactResult into the stats"""
+        self.count += 1
+        h = self.histograms
+        h['governance'][result.governance_score] += 1
+        h['logging'][result.logging_score] += 1
+        h['third_party'][result.third_party_score] += 1
+        h['incident'][result.incident_score] += 1
+        h['total'][result.total_score] += 1
+
+        levels = self.risk_by_sector.get(result.sector)
+        if levels is None:
+            levels = self.risk_by_sector[result.sector] = dict.fromkeys(RISK_LEVELS, 0)
+        levels[result.risk_level] += 1
+
+        sketches = self.by_sector.get(result.sector)
+        if sketches is None:
+            sketches = self.by_sector[result.sector] = new_sketches()
+        add_result(sketches, result)
+        for scope in scope_entries(result.scope):
+            sketches = self.by_scope.get(scope)
+            if sketches is None:
+                sketches = self.by_scope[scope] = new_sketches()
+            add_result(sketches, result)
+
+        mask = result.rule_mask
+        counts = self.rule_counts
+        i = 0
+        while mask:
+            if mask & 1:
+                counts[i] += 1
+            mask >>= 1
+            i += 1
+
+    def update(self, results: Iterable) -> 'PortfolioStats':
+        """Fold a stream of results; returns self"""
+        for result in results:
+            self.add(result)
+        return self
+
+    def merge(self, other: 'PortfolioStats') -> 'PortfolioStats':
+        """Add another accumulator's counts into this one; returns self"""
+        self.count += other.count
+        for key, hist in other.histograms.items():
+            mine = self.histograms[key]
+            for score, n in enumerate(hist):
+                mine[score] += n
+        for sector, levels in other.risk_by_sector.items():
+            mine = self.risk_by_sector.setdefault(sector, dict.fromkeys(RISK_LEVELS, 0))
+            for level, n in levels.items():
+                mine[level] += n
+        for i, n in enumerate(other.rule_counts):
+            self.rule_counts[i] += n
+        for mine, theirs in ((self.by_sector, other.by_sector), (self.by_scope, other.by_scope)):
+            for group, sketches in theirs.items():
+                merge_sketches(mine.setdefault(group, new_sketches()), sketches)
+        return self
+
+    def __add__(self, other: 'PortfolioStats') -> 'PortfolioStats':
+        return PortfolioStats().merge(self).merge(other)
+
+    def __eq__(self, other):
+        if not isinstance(other, PortfolioStats):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+
+    def mean(self, key: str = 'total') -> float:
+        """Mean score of a domain key or 'total'"""
+        if not self.count:
+            return 0.0
+        return sum(score * n for score, n in enumerate(self.histograms[key])) / self.count
+
+    def quantile(self, q: float, key: str = 'total'):
+        """Exact nearest-rank quantile of a domain key or 'total' over all results"""
+        return histogram_quantile(self.histograms[key], q)
+
+    def percentiles(self, by: str = 'sector', key: str = 'total', qs: tuple = DEFAULT_QUANTILES) -> dict:
+        """Group -> quantiles of `key`, grouped by 'sector' or 'scope'
+
+        An assessment covering several scopes counts once in each of them.
+        """
+        groups = self.by_sector if by == 'sector' else self.by_scope
+        return {group: sketches[key].quantiles(qs) for group, sketches in sorted(groups.items())}
+
+    def risk_counts(self) -> dict:
+        """Risk level -> count over all sectors"""
+        totals = dict.fromkeys(RISK_LEVELS, 0)
+        for levels in self.risk_by_sector.values():
+            for level, n in levels.items():
+                totals[level] += n
+        return totals
+
+    def rule_frequencies(self) -> dict:
+        """Rule ID -> number of results where it fired"""
+        return dict(zip(RULE_IDS, self.rule_counts))
+
+    def _top(self, field: str, n: int) -> list:
+        ranked = sorted(
+            (i for i, rule in enumerate(RULES) if getattr(rule, field) and self.rule_counts[i]),
+            key=lambda i: (-self.rule_counts[i], i)
+        )
+        return [
+            {
+                'rule_id': RULE_IDS[i],
+                'domain': _DOMAIN_LABELS[RULES[i].domain],
+                'text': _rule_label(i, field),
+                'count': self.rule_counts[i],
+                'share': self.rule_counts[i] / self.count,
+            }
+            for i in ranked[:n]
+        ]
+
+    def top_gaps(self, n: int = 10) -> list:
+        """Most frequent regulatory gaps, most common first"""
+        return self._top('gap', n)
+
+    def top_findings(self, n: int = 10) -> list:
+        """Most frequent findings, most common first"""
+        return self._top('finding', n)
+
+    # -----------------------------
+    # Serialisation
+    # -----------------------------
+
+    def to_dict(self) -> dict:
+        """JSON-friendly snapshot (round-trips through from_dict)"""
+        return {
+            'count': self.count,
+            'histograms': {key: list(hist) for key, hist in self.histograms.items()},
+            'risk_by_sector': {sector: dict(levels) for sector, levels in self.risk_by_sector.items()},
+            'rule_counts': dict(zip(RULE_IDS, self.rule_counts)),
+            'by_sector': _sketches_to_dict(self.by_sector),
+            'by_scope': _sketches_to_dict(self.by_scope),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> 'PortfolioStats':
+        stats = cls()
+        stats.count = payload['count']
+        for key, hist in payload['histograms'].items():
+            stats.histograms[key] = list(hist)
+        stats.risk_by_sector = {
+            sector: dict(dict.fromkeys(RISK_LEVELS, 0), **levels)
+            for sector, levels in payload['risk_by_sector'].items()
+        }
+        counts = payload['rule_counts']
+        stats.rule_counts = [counts.get(rule_id, 0) for rule_id in RULE_IDS]
+        stats.by_sector = _sketches_from_dict(payload.get('by_sector', {}))
+        stats.by_scope = _sketches_from_dict(payload.get('by_scope', {}))
+        return stats
+
+    def summary(self, top: int = 10) -> dict:
+        """Report-ready view: means, risk mix, top gaps and findings"""
+        return {
+            'count': self.count,
+            'mean_scores': {key: round(self.mean(key), 2) for key in self.histograms},
+            'risk_levels': self.risk_counts(),
+            'risk_by_sector': {sector: dict(levels) for sector, levels in sorted(self.risk_by_sector.items())},
+            'top_gaps': self.top_gaps(top),
+            'top_findings': self.top_findings(top),
+            'percentiles': {
+                'quantiles': list(DEFAULT_QUANTILES),
+                'sector': {
+                    group: {key: sketch.quantiles() for key, sketch in sketches.items()}
+                    for group, sketches in sorted(self.by_sector.items())
+                },
+                'scope': {
+                    group: {key: sketch.quantiles() for key, sketch in sketches.items()}
+                    for group, sketches in sorted(self.by_scope.items())
+                },
+            },
+        }
+
+def _sketches_to_dict(groups: dict) -> dict:
+    return {group: {key: sketch.to_dict() for key, sketch in sketches.items()}
+            for group, sketches in groups.items()}
+
+def _sketches_from_dict(payload: dict) -> dict:
+    return {group: {key: ScoreSketch.from_dict(sketch) for key, sketch in sketches.items()}
+            for group, sketches in payload.items()}
+
+def portfolio_stats(results: Iterable) -> PortfolioStats:
+    """Accumulate a stream of results in one pass"""
+    return PortfolioStats().update(results)
@@ -0,0 +1,26 @@
+# engine/bulk.py - EU Digital Resilience Toolkit
+# Streaming bulk scoring for questionnaire dumps
+
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from .compact import CompactResult
+from .models import AssessmentResult
+from .scoring import TIMESTAMP_FORMAT, assess
+
+def score_many(rows: Iterable[dict], timestamp: str = None,
+               compact: bool = False) -> Iterator[AssessmentResult]:
+    """Score answer dicts one at a time
+    
+    Generator: each row is scored when the consumer asks for it and nothing
+    is kept afterwards, so memory stays constant however many rows the
+    iterable yields (e.g. a csv.DictReader over a 500k-row vendor dump).
+    All results of one run share the same timestamp.
+    
+    compact=True yields CompactResult records instead, for callers that
+    keep many results in memory.
+    """
+    timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+    score = CompactResult.from_answers if compact else assess
+    for data in rows:
+        yield score(data, timestamp)
@@ -0,0 +1,172 @@
+# engine/bundle.py - EU Digital Resilience Toolkit
+# Streamed ZIP bundle of per-entity reports
+#
+# Layout:
+#   index.csv                 one row per entity: folder, scores, fired rules
+#   <entity>/<entity>.txt     generate_text_report
+#   <entity>/<entity>.csv     generate_csv_export
+#   <entity>/<entity>.pdf     build_pdf (needs fpdf2)
+#
+# Entries are written one entity at a time to any binary sink. Seekable
+# files work, and so do sockets or response bodies: zipfile then writes
+# data descriptors instead of seeking back. The index is spooled to a
+# temporary file and added last, so memory stays flat for any number of
+# entities (only zipfile's central directory, a few hundred bytes per
+# file, is kept until close). iter_bundle() yields the archive as byte
+# chunks. If bundling fails, the central directory is never written, so a
+# partial archive cannot be mistaken for a complete one.
+
+import csv
+import shutil
+import tempfile
+import zipfile
+from io import TextIOWrapper
+from typing import Iterable, Iterator
+
+from .io import ENTITY_COLUMN, LIST_SEPARATOR, UniqueNames
+from .models import AssessmentResult
+from .reports import generate_text_report, generate_csv_export
+from .rules import mask_rule_ids
+
+BUNDLE_FORMATS = ('txt', 'csv', 'pdf')
+INDEX_NAME = 'index.csv'
+INDEX_COLUMNS = [
+    ENTITY_COLUMN, 'folder', 'timestamp', 'sector', 'scope',
+    'governance_score', 'logging_score', 'third_party_score', 'incident_score',
+    'total_score', 'risk_level', 'fired_rules',
+]
+
+# PDFs are already compressed: store them as they are
+_COMPRESSION = {'pdf': zipfile.ZIP_STORED}
+_INDEX_SPOOL_BYTES = 1024 * 1024
+
+def render_files(result: AssessmentResult, formats: tuple = BUNDLE_FORMATS) -> list:
+    """(extension, bytes) for each requested format"""
+    files = []
+    for fmt in formats:
+        if fmt == 'txt':
+            files.append((fmt, generate_text_report(result).encode('utf-8')))
+        elif fmt == 'csv':
+            files.append((fmt, generate_csv_export(result).encode('utf-8')))
+        elif fmt == 'pdf':
+            from .pdf import build_pdf
+            files.append((fmt, build_pdf(result)))
+        else:
+            raise ValueError(f"Unknown bundle format: {fmt} (expected one of {', '.join(BUNDLE_FORMATS)})")
+    return files
+
+def _index_row(entity_id: str, folder: str, result: AssessmentResult) -> list:
+    return [
+        entity_id, folder, result.timestamp, result.sector, result.scope,
+        result.governance_score, result.logging_score, result.third_party_score,
+        result.incident_score, result.total_score, result.risk_level,
+        LIST_SEPARATOR.join(mask_rule_ids(result.rule_mask)),
+    ]
+
+class BundleWriter:
+    """Writes entities into a ZIP archive on `sink`; close() adds the index"""
+
+    def __init__(self, sink, formats: tuple = BUNDLE_FORMATS):
+        unknown = [fmt for fmt in formats if fmt not in BUNDLE_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown bundle format(s): {', '.join(unknown)} "
+                             f"(expected {', '.join(BUNDLE_FORMATS)})")
+        self.formats = tuple(formats)
+        self.entities = 0
+        self._zip = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._folder = UniqueNames()  # repeated entity ids get -2, -3... folders
+        self._index = tempfile.SpooledTemporaryFile(max_size=_INDEX_SPOOL_BYTES, mode='w+',
+                                                    newline='', encoding='utf-8')
+        self._index_writer = csv.writer(self._index)
+        self._index_writer.writerow(INDEX_COLUMNS)
+
+    def add(self, entity_id: str, result: AssessmentResult):
+        self.add_rendered(entity_id, result, render_files(result, self.formats))
+
+    def add_rendered(self, entity_id: str, result: AssessmentResult, files: list):
+        """Add an entity whose files were rendered elsewhere (e.g. a worker process)"""
+        folder = self._folder(entity_id)
+        for extension, data in files:
+            self._zip.writestr(f"{folder}/{folder}.{extension}", data,
+                               compress_type=_COMPRESSION.get(extension, zipfile.ZIP_DEFLATED))
+        self._index_writer.writerow(_index_row(entity_id, folder, result))
+        self.entities += 1
+
+    def abort(self):
+        """Stop without the index or central directory: what was written is not a valid ZIP"""
+        if self._zip.fp is None:
+            return
+        self._zip.fp = None  # zipfile's close() then skips the central directory
+        self._zip.close()
+        self._index.close()
+
+    def close(self):
+        if self._zip.fp is None:
+            return
+        self._index.seek(0)
+        with self._zip.open(INDEX_NAME, 'w') as entry:
+            text = TextIOWrapper(entry, encoding='utf-8', newline='')
+            shutil.copyfileobj(self._index, text)
+            text.flush()
+            text.detach()
+        self._index.close()
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # A failed run must not look like a complete (if shorter) bundle
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+# -----------------------------
+# Whole Portfolios
+# -----------------------------
+
+def _bundle_shard(shard: list, formats: tuple) -> list:
+    """Worker: (entity_id, result, files) for each (entity_id, result)"""
+    return [(entity_id, result, render_files(result, formats)) for entity_id, result in shard]
+
+def write_bundle(items: Iterable[tuple], sink, formats: tuple = BUNDLE_FORMATS,
+                 workers: int = 1, shard_size: int = 50) -> int:
+    """Bundle (entity_id, result) pairs into a ZIP on `sink`; returns the entity count
+
+    With workers > 1 the reports are rendered in worker processes (at most
+    two shards in flight per worker) and written in input order.
+    """
+    from .parallel import iter_shards, map_shards  # process pools only load when bundling
+    with BundleWriter(sink, formats) as bundle:
+        shards = iter_shards(items, shard_size)
+        for rendered in map_shards(_bundle_shard, shards, workers, args=(bundle.formats,)):
+            for entity_id, result, files in rendered:
+                bundle.add_rendered(entity_id, result, files)
+    return bundle.entities
+
+class _ChunkSink:
+    """Non-seekable sink that hands written bytes to iter_bundle"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> list:
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+def iter_bundle(items: Iterable[tuple], formats: tuple = BUNDLE_FORMATS) -> Iterator[bytes]:
+    """The ZIP bundle of (entity_id, result) pairs as byte chunks, one entity at a time"""
+    sink = _ChunkSink()
+    with BundleWriter(sink, formats) as bundle:
+        for entity_id, result in items:
+            bundle.add(entity_id, result)
+            yield from sink.drain()
+    yield from sink.drain()
@@ -0,0 +1,101 @@
+# engine/cache.py - EU Digital Resilience Toolkit
+# Bounded, thread-safe memoization of domain assessments
+#
+# Streamlit reruns the page script on every widget interaction, and many
+# users submit identical answer combinations. Domain results are cached
+# per process (shared by every session) keyed on the canonical answers
+# the domain actually reads.
+
+import threading
+from collections import OrderedDict
+
+from .questions import DOMAIN_QUESTIONS
+from .rules import evaluate_domain_masked
+
+class LRUCache:
+    """Thread-safe LRU mapping with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+# -----------------------------
+# Cached Domain Assessments
+# -----------------------------
+
+# Shared by every session of this process
+DOMAIN_CACHE = LRUCache()
+
+def _freeze(value):
+    """Hashable, canonical form of an answer (multiselects -> tuple)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value
+
+def domain_key(domain: str, data: dict) -> tuple:
+    """Canonical frozen answers one domain depends on"""
+    cloud_usage = tuple(sorted(data.get('cloud_usage', [])))  # order is irrelevant
+    return (domain, cloud_usage) + tuple(
+        _freeze(data.get(question_id)) for question_id in DOMAIN_QUESTIONS[domain]
+    )
+
+def cached_assess_masked(domain: str, data: dict) -> tuple:
+    """Memoized (score, findings, recs, gaps, mask); mask holds the domain's fired-rule bits
+
+    The four masks OR-ed together are the result's rule_mask (see
+    build_result's domain_masks), so reruns never re-evaluate the rules.
+    Returns fresh lists, so callers may extend them without touching the cache.
+    """
+    key = domain_key(domain, data)
+    cached = DOMAIN_CACHE.get(key)
+    if cached is None:
+        score, findings, recs, gaps, mask = evaluate_domain_masked(domain, data)
+        cached = (score, tuple(findings), tuple(recs), tuple(gaps), mask)
+        DOMAIN_CACHE.put(key, cached)
+    score, findings, recs, gaps, mask = cached
+    return score, list(findings), list(recs), list(gaps), mask
+
+def cached_assess(domain: str, data: dict) -> tuple:
+    """Memoized assess_<domain>: (score, findings, recs, gaps)"""
+    return cached_assess_masked(domain, data)[:4]
@@ -0,0 +1,91 @@
+# engine/catalog.py - EU Digital Resilience Toolkit
+# Feedback and advice catalog: loaded once from catalog.json, validated,
+# and compiled into immutable lookups keyed by (question_id, option index)
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+from .questions import QUESTIONS, option_index
+
+CATALOG_PATH = Path(__file__).with_name('catalog.json')
+CATALOG_VERSION = 1
+
+FEEDBACK_STATUSES = ('optimal', 'acceptable', 'needs_improvement', 'critical')
+FEEDBACK_FIELDS = ('status', 'icon', 'message', 'advice')
+
+# Returned when a question/answer has no catalog entry
+DEFAULT_FEEDBACK = MappingProxyType({
+    'status': 'info',
+    'icon': 'ℹ️',
+    'message': 'Risposta registrata.',
+    'advice': ''
+})
+
+class CatalogError(ValueError):
+    """Raised when the catalog file does not match the questionnaire"""
+
+class Catalog:
+    """Immutable feedback/advice lookups keyed by (question_id, option index)"""
+
+    def __init__(self, version: int, feedback: dict, advice: dict):
+        self.version = version
+        self.feedback = MappingProxyType(feedback)
+        self.advice = MappingProxyType(advice)
+
+    @staticmethod
+    def key(question_id: str, answer) -> tuple:
+        """Lookup key for an answer (None if the question is unknown)"""
+        if question_id not in QUESTIONS:
+            return None
+        return question_id, option_index(question_id, answer)
+
+    def get_feedback(self, question_id: str, answer):
+        return self.feedback.get(self.key(question_id, answer), DEFAULT_FEEDBACK)
+
+    def get_advice(self, question_id: str, answer) -> str:
+        return self.advice.get(self.key(question_id, answer), "")
+
+def _option_key(section: str, question_id: str, option: str) -> tuple:
+    if question_id not in QUESTIONS:
+        raise CatalogError(f"{section}: unknown question '{question_id}'")
+    if option not in QUESTIONS[question_id]:
+        raise CatalogError(f"{section}: '{option}' is not an option of '{question_id}'")
+    return question_id, QUESTIONS[question_id].index(option)
+
+def compile_catalog(raw: dict) -> Catalog:
+    """Validate a parsed catalog document and compile its lookups"""
+    version = raw.get('version')
+    if version != CATALOG_VERSION:
+        raise CatalogError(f"Unsupported catalog version {version!r} (expected {CATALOG_VERSION})")
+
+    feedback = {}
+    for question_id, options in raw.get('feedback', {}).items():
+        for option, entry in options.items():
+            key = _option_key('feedback', question_id, option)
+            if sorted(entry) != sorted(FEEDBACK_FIELDS):
+                raise CatalogError(f"feedback {key}: fields must be {', '.join(FEEDBACK_FIELDS)}")
+            if entry['status'] not in FEEDBACK_STATUSES:
+                raise CatalogError(f"feedback {key}: unknown status '{entry['status']}'")
+            feedback[key] = MappingProxyType(dict(entry))
+
+    advice = {}
+    for question_id, options in raw.get('advice', {}).items():
+        for option, text in options.items():
+            key = _option_key('advice', question_id, option)
+            if not isinstance(text, str) or not text:
+                raise CatalogError(f"advice {key}: text must be a non-empty string")
+            advice[key] = text
+
+    return Catalog(version, feedback, advice)
+
+def load_catalog(path=CATALOG_PATH) -> Catalog:
+    """Read, validate and compile a catalog file"""
+    with open(path, encoding='utf-8') as f:
+        return compile_catalog(json.load(f))
+
+@lru_cache(maxsize=None)
+def get_catalog() -> Catalog:
+    """The bundled catalog, loaded on first use and shared afterwards"""
+    return load_catalog()
@@ -0,0 +1,367 @@
+# engine/cli.py - EU Digital Resilience Toolkit
+# Command-line bulk scoring
+#
+# Usage:
+#   python -m engine score answers.csv -o results/
+#   python -m engine score answers_dir/ -o results/ --workers 8
+#   python -m engine score answers.csv -o portfolio.csv --format wide
+#   python -m engine score answers.csv -o results.ndjson --format ndjson
+#   python -m engine score answers.csv -o results/ --store assessments.db
+#   python -m engine score answers.csv -o results/ --report html
+#   python -m engine stats answers.csv --top 5
+#   python -m engine trend assessments.db --sector Energy --since 2024-Q1
+#   python -m engine diff assessments.db
+#   python -m engine plan answers.csv -o plans.csv
+#   python -m engine pdf answers.csv -o pdfs/ --workers 8
+#   python -m engine bundle answers.csv -o portfolio.zip --formats txt,csv,pdf
+#   python -m engine bundle assessments.db --from-store -o history.zip --limit 5000
+#   python -m engine serve --port 8600
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .analytics import PortfolioStats
+from .bundle import BUNDLE_FORMATS, write_bundle
+from .compact import CompactResult
+from .diff import diff_many
+from .remediation import LOW_THRESHOLD, plan_remediation
+from .io import ENTITY_COLUMN, LIST_SEPARATOR, WIDE_COLUMNS, UniqueNames, read_answers, wide_row
+from .parallel import iter_shards, map_shards
+from .render import STYLES, render_report
+from .reports import generate_csv_export
+from .scoring import TIMESTAMP_FORMAT, assess
+from .serialize import JSONArrayWriter, NDJSONWriter, to_json_bytes
+from .store import ResultStore
+
+def _score_shard(shard: list, timestamp: str, fmt: str, keep: bool = False, report: str = None) -> tuple:
+    """Worker: score (row number, answers) pairs
+
+    fmt 'files': (entity_id, CSV export, report or None) per row;
+    'wide': one WIDE_COLUMNS row each; 'ndjson' / 'json': one encoded
+    export document each. keep=True also returns (entity_id, answers,
+    result) items for the store.
+    """
+    out = []
+    kept = []
+    for row_number, data in shard:
+        entity_id = data.get(ENTITY_COLUMN) or f"{row_number:06d}"
+        result = assess(data, timestamp)
+        if fmt == 'wide':
+            out.append(wide_row(entity_id, result))
+        elif fmt in ('ndjson', 'json'):
+            answers = {key: value for key, value in data.items() if key != ENTITY_COLUMN}
+            out.append(to_json_bytes(result, entity_id, answers))
+        else:
+            out.append((entity_id, generate_csv_export(result),
+                        render_report(result, report) if report else None))
+        if keep:
+            kept.append((entity_id, data, result))
+    return out, kept
+
+def cmd_score(args) -> int:
+    output = Path(args.output)
+    if args.format == 'wide':
+        output.parent.mkdir(parents=True, exist_ok=True)
+        wide_file = open(output, 'w', newline='', encoding='utf-8')
+        wide_writer = csv.writer(wide_file)
+        wide_writer.writerow(WIDE_COLUMNS)
+    elif args.format in ('ndjson', 'json'):
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # ndjson appends to an existing file; json writes one array
+        json_writer = NDJSONWriter(output) if args.format == 'ndjson' else JSONArrayWriter(output)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+        file_name = UniqueNames()  # one file per row, even for repeated entity ids
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+
+    store = ResultStore(args.store) if args.store else None
+
+    rows = enumerate(read_answers(args.input), 1)
+    shards = iter_shards(rows, args.shard_size)
+
+    started = time.perf_counter()
+    total = 0
+    try:
+        for shard_number, (results, kept) in enumerate(
+                map_shards(_score_shard, shards, args.workers,
+                           args=(timestamp, args.format, store is not None, args.report)), 1):
+            if args.format == 'wide':
+                wide_writer.writerows(results)
+            elif args.format in ('ndjson', 'json'):
+                for line in results:
+                    json_writer.write_line(line)
+            else:
+                for entity_id, csv_text, report_text in results:
+                    name = file_name(entity_id)
+                    with open(output / f"{name}.csv", 'w', newline='', encoding='utf-8') as f:
+                        f.write(csv_text)
+                    if report_text is not None:
+                        with open(output / f"{name}.{args.report}", 'w', encoding='utf-8') as f:
+                            f.write(report_text)
+            if store is not None:
+                store.add_many(kept)
+            total += len(results)
+            if not args.quiet:
+                print(f"shard {shard_number}: {len(results)} rows ({total} total)", file=sys.stderr)
+    finally:
+        if args.format == 'wide':
+            wide_file.close()
+        elif args.format in ('ndjson', 'json'):
+            json_writer.close()
+        if store is not None:
+            store.close()
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0.0
+    print(f"Scored {total} assessments in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {output}")
+    return 0
+
+def _stats_shard(shard: list, timestamp: str) -> PortfolioStats:
+    """Worker: partial portfolio stats of a shard of answer dicts"""
+    stats = PortfolioStats()
+    for data in shard:
+        stats.add(CompactResult.from_answers(data, timestamp))
+    return stats
+
+def cmd_stats(args) -> int:
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    shards = iter_shards(read_answers(args.input), args.shard_size)
+    stats = PortfolioStats()
+    for partial in map_shards(_stats_shard, shards, args.workers, args=(timestamp,)):
+        stats.merge(partial)
+    json.dump(stats.summary(args.top), sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0
+
+def cmd_trend(args) -> int:
+    with ResultStore(args.db) as store:
+        if args.rebuild:
+            store.rebuild_rollups()
+        if args.entity:
+            trend = store.entity_trend(args.entity, args.since, args.until)
+        else:
+            trend = store.sector_trend(args.sector, args.since, args.until)
+    json.dump(trend, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0
+
+def cmd_diff(args) -> int:
+    with ResultStore(args.db) as store:
+        pairs = store.latest_pairs(by_quarter=not args.last_two)
+    diffs = {entity_id: diff.to_dict() for entity_id, diff in diff_many(pairs)}
+    json.dump(diffs, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0
+
+PLAN_COLUMNS = [ENTITY_COLUMN, 'total_score', 'changes_needed', 'projected_score', 'feasible', 'changes']
+
+def _plan_shard(shard: list, target_score: int) -> list:
+    """Worker: one PLAN_COLUMNS row per (row number, answers) pair"""
+    out = []
+    for row_number, data in shard:
+        plan = plan_remediation(data, target_score)
+        out.append([
+            data.get(ENTITY_COLUMN) or f"{row_number:06d}",
+            plan.total_score, len(plan.changes), plan.projected_score, int(plan.feasible),
+            LIST_SEPARATOR.join(f"{change.question}={change.target or '*'}" for change in plan.changes),
+        ])
+    return out
+
+def cmd_plan(args) -> int:
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    shards = iter_shards(enumerate(read_answers(args.input), 1), args.shard_size)
+    started = time.perf_counter()
+    total = 0
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(PLAN_COLUMNS)
+        for rows in map_shards(_plan_shard, shards, args.workers, args=(args.target,)):
+            writer.writerows(rows)
+            total += len(rows)
+    print(f"Planned {total} assessments in {time.perf_counter() - started:.2f}s -> {output}")
+    return 0
+
+def _pdf_shard(shard: list, timestamp: str, output: str) -> tuple:
+    """Worker: score (file name, answers) pairs and write one PDF each; (files, bytes)"""
+    from .pdf import write_pdf
+    total_bytes = 0
+    for name, data in shard:
+        total_bytes += write_pdf(assess(data, timestamp), Path(output) / f"{name}.pdf")
+    return len(shard), total_bytes
+
+def _named_rows(path: str):
+    """(unique file name, answers) per questionnaire
+
+    Names are assigned here, before sharding: workers cannot see each
+    other's names, so repeated entity ids would overwrite each other.
+    """
+    file_name = UniqueNames()
+    for row_number, data in enumerate(read_answers(path), 1):
+        yield file_name(data.get(ENTITY_COLUMN) or f"{row_number:06d}"), data
+
+def cmd_pdf(args) -> int:
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    shards = iter_shards(_named_rows(args.input), args.shard_size)
+    started = time.perf_counter()
+    files = total_bytes = 0
+    for count, size in map_shards(_pdf_shard, shards, args.workers, args=(timestamp, str(output))):
+        files += count
+        total_bytes += size
+        if not args.quiet:
+            print(f"{files} PDFs written", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    rate = files / elapsed * 60 if elapsed else 0.0
+    print(f"Rendered {files} PDFs ({total_bytes / 1e6:.1f} MB) in {elapsed:.2f}s ({rate:,.0f}/min) -> {output}")
+    return 0
+
+def _scored(path: str, timestamp: str):
+    """(entity_id, result) per questionnaire, scored as they are read"""
+    for row_number, data in enumerate(read_answers(path), 1):
+        yield data.get(ENTITY_COLUMN) or f"{row_number:06d}", assess(data, timestamp)
+
+def _stored_items(path: str, limit: int = None):
+    """(entity_id, result) per stored assessment, newest first, read in chunks"""
+    with ResultStore(path) as store:
+        for stored in store.iter_query(limit=limit, newest_first=True):
+            yield stored.entity_id or f"assessment-{stored.id}", stored.result
+
+def cmd_bundle(args) -> int:
+    formats = tuple(fmt.strip() for fmt in args.formats.split(',') if fmt.strip())
+    unknown = [fmt for fmt in formats if fmt not in BUNDLE_FORMATS]
+    if unknown or not formats:
+        print(f"--formats: expected a comma-separated subset of {','.join(BUNDLE_FORMATS)}", file=sys.stderr)
+        return 2
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    started = time.perf_counter()
+    if args.from_store:
+        items = _stored_items(args.input, args.limit)
+    else:
+        items = _scored(args.input, timestamp)
+    if args.output == '-':
+        # Streamed: stdout is not seekable, zipfile writes data descriptors
+        total = write_bundle(items, sys.stdout.buffer, formats, args.workers, args.shard_size)
+        sys.stdout.buffer.flush()
+        destination = 'stdout'
+    else:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(output, 'wb') as f:
+                total = write_bundle(items, f, formats, args.workers, args.shard_size)
+        except BaseException:
+            output.unlink(missing_ok=True)  # no partial ZIP left behind
+            raise
+        destination = output
+    print(f"Bundled {total} assessments ({', '.join(formats)}) in {time.perf_counter() - started:.2f}s "
+          f"-> {destination}", file=sys.stderr)
+    return 0
+
+def cmd_serve(args) -> int:
+    from .server import run
+    run(args.host, args.port, args.workers, args.max_concurrency)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m engine',
+                                     description="EU Digital Resilience Toolkit - bulk assessment engine")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    score = sub.add_parser('score', help="score a CSV file or a directory of questionnaires")
+    score.add_argument('input', help="CSV file, JSON file or directory of questionnaires")
+    score.add_argument('-o', '--output', required=True,
+                       help="output directory (files) or file (wide, ndjson, json)")
+    score.add_argument('--format', choices=['files', 'wide', 'ndjson', 'json'], default='files',
+                       help="files: one Metric/Value CSV per assessment (repeated entity ids "
+                            "get -2, -3... suffixes); "
+                            "wide: one portfolio CSV, one row per assessment; "
+                            "ndjson: append one JSON document per line; json: one JSON array")
+    score.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                       help="worker processes (default: CPU count, 1 = no pool)")
+    score.add_argument('--shard-size', type=int, default=1000, help="rows per shard (default: 1000)")
+    score.add_argument('--store', metavar='DB',
+                       help="also save results and answers to this SQLite history database")
+    score.add_argument('--report', choices=list(STYLES),
+                       help="files: also write a full report per assessment in this format")
+    score.add_argument('-q', '--quiet', action='store_true', help="no per-shard progress")
+    score.set_defaults(func=cmd_score)
+
+    stats = sub.add_parser('stats', help="portfolio analytics (score distribution, risk mix, top gaps) as JSON")
+    stats.add_argument('input', help="CSV file, JSON file or directory of questionnaires")
+    stats.add_argument('--top', type=int, default=10, help="gaps/findings to list (default: 10)")
+    stats.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                       help="worker processes (default: CPU count, 1 = no pool)")
+    stats.add_argument('--shard-size', type=int, default=1000, help="rows per shard (default: 1000)")
+    stats.set_defaults(func=cmd_stats)
+
+    trend = sub.add_parser('trend', help="quarterly score trends from a --store history database")
+    trend.add_argument('db', help="SQLite history database")
+    group = trend.add_mutually_exclusive_group()
+    group.add_argument('--sector', help="one sector (default: whole portfolio)")
+    group.add_argument('--entity', help="one entity_id")
+    trend.add_argument('--since', help="first quarter, e.g. 2024-Q1")
+    trend.add_argument('--until', help="last quarter, e.g. 2025-Q4")
+    trend.add_argument('--rebuild', action='store_true', help="recompute the rollups from the full history first")
+    trend.set_defaults(func=cmd_trend)
+
+    diff = sub.add_parser('diff', help="compare every entity's two latest quarters in a history database")
+    diff.add_argument('db', help="SQLite history database")
+    diff.add_argument('--last-two', action='store_true',
+                      help="compare the last two assessments instead of the last two quarters")
+    diff.set_defaults(func=cmd_diff)
+
+    plan = sub.add_parser('plan', help="fewest answer changes that bring each assessment to LOW risk")
+    plan.add_argument('input', help="CSV file, JSON file or directory of questionnaires")
+    plan.add_argument('-o', '--output', required=True, help="output CSV file")
+    plan.add_argument('--target', type=int, default=LOW_THRESHOLD,
+                      help=f"total score to reach (default: {LOW_THRESHOLD}, the LOW threshold)")
+    plan.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                      help="worker processes (default: CPU count, 1 = no pool)")
+    plan.add_argument('--shard-size', type=int, default=1000, help="rows per shard (default: 1000)")
+    plan.set_defaults(func=cmd_plan)
+
+    pdf = sub.add_parser('pdf', help="one PDF report per assessment, rendered in parallel")
+    pdf.add_argument('input', help="CSV file, JSON file or directory of questionnaires")
+    pdf.add_argument('-o', '--output', required=True, help="output directory")
+    pdf.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                     help="worker processes (default: CPU count, 1 = no pool)")
+    pdf.add_argument('--shard-size', type=int, default=50, help="rows per shard (default: 50)")
+    pdf.add_argument('-q', '--quiet', action='store_true', help="no per-shard progress")
+    pdf.set_defaults(func=cmd_pdf)
+
+    bundle = sub.add_parser('bundle', help="one ZIP with per-entity TXT/CSV/PDF reports and an index")
+    bundle.add_argument('input', help="CSV file, JSON file or directory of questionnaires "
+                                      "(a --store database with --from-store)")
+    bundle.add_argument('--from-store', action='store_true',
+                        help="bundle the saved assessments of a --store database instead")
+    bundle.add_argument('--limit', type=int, help="with --from-store: only the N most recent")
+    bundle.add_argument('-o', '--output', required=True, help="output ZIP file ('-' = stdout)")
+    bundle.add_argument('--formats', default=','.join(BUNDLE_FORMATS),
+                        help=f"reports per entity (default: {','.join(BUNDLE_FORMATS)})")
+    bundle.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="worker processes rendering the reports (default: CPU count, 1 = no pool)")
+    bundle.add_argument('--shard-size', type=int, default=50, help="entities per shard (default: 50)")
+    bundle.set_defaults(func=cmd_bundle)
+
+    serve = sub.add_parser('serve', help="run the local JSON-over-HTTP scoring service")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8600)
+    serve.add_argument('-w', '--workers', type=int, default=None,
+                       help="scoring processes (default: CPU count)")
+    serve.add_argument('--max-concurrency', type=int, default=64,
+                       help="scoring jobs in flight before requests wait (default: 64)")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
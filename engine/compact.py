@@ -0,0 +1,145 @@
+# engine/compact.py - EU Digital Resilience Toolkit
+# Compact, slotted assessment results for large in-memory portfolios
+#
+# An AssessmentResult carries full English sentences for every finding,
+# gap and recommendation, repeated verbatim across results. CompactResult
+# keeps integer scores plus a bitmask of fired rules (bit i = RULES[i]);
+# the texts stay in the rule table and are only expanded when rendered.
+
+import sys
+
+from .models import AssessmentResult
+from .questions import DOMAIN_KEYS
+from .rules import RULES, TEMPLATED_RULES, DOMAIN_MAX_SCORE, fired_rules, format_rule_texts
+from .scoring import DOMAINS, calculate_risk_level
+
+# domain key -> regulatory_gaps label ('governance' -> 'Governance & Scope')
+_DOMAIN_LABELS = dict(zip(DOMAIN_KEYS, (label for label, _ in DOMAINS)))
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class CompactResult:
+    """Slotted assessment record: scores, fired-rule bitmask, template args
+
+    Compared and hashed by value over all slots, so equal records dedupe in
+    sets and dict keys; don't reassign fields of a record used as a key.
+    """
+
+    __slots__ = (
+        'timestamp', 'sector', 'scope',
+        'governance_score', 'logging_score', 'third_party_score', 'incident_score',
+        'rule_mask', 'cloud_count', 'text_args',
+    )
+
+    def __init__(self, timestamp, sector, scope, governance_score, logging_score,
+                 third_party_score, incident_score, rule_mask, cloud_count=0, text_args=()):
+        self.timestamp = _intern(timestamp)
+        self.sector = _intern(sector)
+        self.scope = _intern(scope)
+        self.governance_score = governance_score
+        self.logging_score = logging_score
+        self.third_party_score = third_party_score
+        self.incident_score = incident_score
+        self.rule_mask = rule_mask
+        self.cloud_count = cloud_count
+        # Raw answers used by templated texts of fired rules, in rule order
+        self.text_args = text_args
+
+    @classmethod
+    def from_answers(cls, data: dict, timestamp: str) -> 'CompactResult':
+        """Score an answer dict straight into compact form"""
+        scores = dict.fromkeys(DOMAIN_KEYS, DOMAIN_MAX_SCORE)
+        mask = 0
+        text_args = []
+        for i in fired_rules(data):
+            rule = RULES[i]
+            scores[rule.domain] -= rule.penalty
+            mask |= 1 << i
+            if i in TEMPLATED_RULES:
+                text_args.append(_intern(data.get(rule.question)))
+        return cls(
+            timestamp, data.get('sector', 'Unknown'), data.get('scope', 'Unknown'),
+            scores['governance'], scores['logging'], scores['third_party'], scores['incident'],
+            mask, len(data.get('cloud_usage', [])), tuple(text_args)
+        )
+
+    # -----------------------------
+    # Derived fields
+    # -----------------------------
+
+    @property
+    def total_score(self) -> int:
+        return self.governance_score + self.logging_score + self.third_party_score + self.incident_score
+
+    @property
+    def risk_level(self) -> str:
+        return calculate_risk_level(self.total_score)
+
+    def fired(self) -> list:
+        """Indices into RULES of the fired rules, in report order"""
+        mask = self.rule_mask
+        return [i for i in range(len(RULES)) if mask >> i & 1]
+
+    def _texts(self):
+        """(rule index, finding, gap, recommendation) per fired rule"""
+        args = iter(self.text_args)
+        for i in self.fired():
+            answer = next(args) if i in TEMPLATED_RULES else None
+            yield (i,) + format_rule_texts(i, answer, self.cloud_count)
+
+    @property
+    def findings(self) -> list:
+        return [finding for _, finding, _, _ in self._texts() if finding]
+
+    @property
+    def recommendations(self) -> list:
+        return [rec for _, _, _, rec in self._texts() if rec]
+
+    @property
+    def regulatory_gaps(self) -> dict:
+        gaps = {label: [] for label, _ in DOMAINS}
+        for i, _, gap, _ in self._texts():
+            if gap:
+                gaps[_DOMAIN_LABELS[RULES[i].domain]].append(gap)
+        return gaps
+
+    def to_result(self) -> AssessmentResult:
+        """Expand into a full AssessmentResult (for rendering and exports)"""
+        return AssessmentResult(
+            timestamp=self.timestamp,
+            sector=self.sector,
+            scope=self.scope,
+            governance_score=self.governance_score,
+            logging_score=self.logging_score,
+            third_party_score=self.third_party_score,
+            incident_score=self.incident_score,
+            total_score=self.total_score,
+            risk_level=self.risk_level,
+            findings=self.findings,
+            recommendations=self.recommendations,
+            regulatory_gaps=self.regulatory_gaps,
+            rule_mask=self.rule_mask
+        )
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactResult):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (f"CompactResult(total_score={self.total_score}, risk_level={self.risk_level!r}, "
+                f"rule_mask={self.rule_mask:#x})")
+
+    def __getstate__(self):
+        return self._key()
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, _intern(value) if name in ('timestamp', 'sector', 'scope') else value)
@@ -0,0 +1,123 @@
+# engine/diff.py - EU Digital Resilience Toolkit
+# Rule-level comparison of two assessments
+#
+# Works on rule_mask rather than rendered text: the XOR of two masks gives
+# the rules that started or stopped firing, and every score and gap follows
+# from the fired rules (domain score = 25 - penalties of its fired rules;
+# gap texts are fixed per rule).
+
+from dataclasses import dataclass, asdict
+from typing import Iterable, Iterator
+
+from .models import AssessmentResult
+from .questions import QUESTIONS, DOMAIN_KEYS
+from .rules import RULES, RULE_IDS, DOMAIN_MAX_SCORE, rule_mask
+from .scoring import DOMAINS, calculate_risk_level
+
+# Answer keys compared by diff_answers (cloud_usage compared as a set)
+ANSWER_KEYS = tuple(QUESTIONS) + ('cloud_usage',)
+
+_DOMAIN_LABELS = dict(zip(DOMAIN_KEYS, (label for label, _ in DOMAINS)))
+_SCORE_FIELDS = tuple(f"{domain}_score" for domain in DOMAIN_KEYS)
+
+@dataclass
+class AssessmentDiff:
+    """What changed between a `before` and an `after` assessment"""
+    changed_answers: dict   # answer key -> (before, after)
+    rules_started: list     # rule IDs firing only in `after`
+    rules_stopped: list     # rule IDs firing only in `before`
+    score_deltas: dict      # domain key / 'total' -> after - before
+    gaps_opened: dict       # domain label -> gaps only in `after`
+    gaps_closed: dict       # domain label -> gaps only in `before`
+    risk_before: str
+    risk_after: str
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.changed_answers or self.rules_started or self.rules_stopped)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+def _mask_bits(mask: int) -> list:
+    bits = []
+    i = 0
+    while mask:
+        if mask & 1:
+            bits.append(i)
+        mask >>= 1
+        i += 1
+    return bits
+
+def _gaps(indices: list) -> dict:
+    gaps = {}
+    for i in indices:
+        if RULES[i].gap:
+            gaps.setdefault(_DOMAIN_LABELS[RULES[i].domain], []).append(RULES[i].gap)
+    return gaps
+
+def mask_scores(mask: int) -> dict:
+    """Domain scores and total implied by a fired-rule bitmask"""
+    scores = dict.fromkeys(DOMAIN_KEYS, DOMAIN_MAX_SCORE)
+    for i in _mask_bits(mask):
+        scores[RULES[i].domain] -= RULES[i].penalty
+    scores['total'] = sum(scores.values())
+    return scores
+
+def _answer_changes(before: dict, after: dict) -> dict:
+    changes = {}
+    for key in ANSWER_KEYS:
+        old, new = before.get(key), after.get(key)
+        if key == 'cloud_usage':
+            if set(old or ()) == set(new or ()):
+                continue
+        elif old == new:
+            continue
+        changes[key] = (old, new)
+    return changes
+
+def diff_masks(before_mask: int, after_mask: int, before_scores: dict, after_scores: dict,
+               changed_answers: dict = None) -> AssessmentDiff:
+    """Diff from two rule masks and their {domain key..., 'total': score} dicts"""
+    changed = before_mask ^ after_mask
+    started = _mask_bits(changed & after_mask)
+    stopped = _mask_bits(changed & before_mask)
+    return AssessmentDiff(
+        changed_answers=changed_answers or {},
+        rules_started=[RULE_IDS[i] for i in started],
+        rules_stopped=[RULE_IDS[i] for i in stopped],
+        score_deltas={key: after_scores[key] - before_scores[key] for key in DOMAIN_KEYS + ('total',)},
+        gaps_opened=_gaps(started),
+        gaps_closed=_gaps(stopped),
+        risk_before=calculate_risk_level(before_scores['total']),
+        risk_after=calculate_risk_level(after_scores['total']),
+    )
+
+def _result_scores(result: AssessmentResult) -> dict:
+    scores = {domain: getattr(result, field) for domain, field in zip(DOMAIN_KEYS, _SCORE_FIELDS)}
+    scores['total'] = result.total_score
+    return scores
+
+def diff_results(before: AssessmentResult, after: AssessmentResult,
+                 before_answers: dict = None, after_answers: dict = None) -> AssessmentDiff:
+    """Compare two results; answer changes are listed when both answer dicts are given"""
+    changes = None
+    if before_answers is not None and after_answers is not None:
+        changes = _answer_changes(before_answers, after_answers)
+    return diff_masks(before.rule_mask, after.rule_mask,
+                      _result_scores(before), _result_scores(after), changes)
+
+def diff_answers(before: dict, after: dict) -> AssessmentDiff:
+    """Compare two answer dicts without building full results"""
+    before_mask, after_mask = rule_mask(before), rule_mask(after)
+    return diff_masks(before_mask, after_mask, mask_scores(before_mask), mask_scores(after_mask),
+                      _answer_changes(before, after))
+
+def diff_many(pairs: Iterable[tuple]) -> Iterator[tuple]:
+    """(key, diff) for each (key, before, after) StoredResult pair
+
+    Feed it ResultStore.latest_pairs() to diff every entity's last two
+    quarters in one pass.
+    """
+    for key, before, after in pairs:
+        yield key, diff_results(before.result, after.result, before.answers, after.answers)
@@ -0,0 +1,115 @@
+# engine/exports.py - EU Digital Resilience Toolkit
+# Content-addressed cache of rendered exports
+#
+# An export depends only on the result, so it is keyed on a SHA-256 of the
+# result's canonical JSON plus the export format; the JSON export also
+# embeds the answers, so its key adds a digest of those. The cache is per process
+# (shared by every session), bounded by the total size of the stored
+# exports, and evicts least recently used entries first. Exports are only
+# rendered when first requested.
+
+import json
+from dataclasses import asdict
+
+from .cache import LRUCache
+from .models import AssessmentResult
+from .render import render_report
+from .reports import generate_text_report, generate_csv_export
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def _pdf(result: AssessmentResult) -> bytes:
+    from .pdf import build_pdf  # fpdf2 is only needed once a PDF is asked for
+    return build_pdf(result)
+
+def _json(result: AssessmentResult, answers: dict = None) -> str:
+    from .serialize import to_json
+    return to_json(result, answers=answers, indent=2)
+
+# format -> (exporter, MIME type)
+EXPORTERS = {
+    'txt': (generate_text_report, 'text/plain'),
+    'csv': (generate_csv_export, 'text/csv'),
+    'md': (lambda result: render_report(result, 'md'), 'text/markdown'),
+    'html': (lambda result: render_report(result, 'html'), 'text/html'),
+    'pdf': (_pdf, 'application/pdf'),
+    'json': (_json, 'application/json'),
+}
+
+# Formats whose export includes the answers (passed as `answers=`)
+ANSWER_FORMATS = frozenset({'json'})
+
+def result_digest(result: AssessmentResult) -> str:
+    """Stable SHA-256 hex digest of a result (same content, same digest)"""
+    import hashlib  # loaded on first export, not with the package
+    canonical = json.dumps(asdict(result), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def answers_digest(answers: dict) -> str:
+    """Stable SHA-256 hex digest of answers as exported (key order is irrelevant)"""
+    import hashlib
+    from .serialize import normalize_answers
+    canonical = json.dumps(normalize_answers(answers), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class ExportCache(LRUCache):
+    """LRU of rendered exports bounded by total size in bytes"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, maxsize: int = 100_000):
+        super().__init__(maxsize)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._sizes = {}
+
+    def put(self, key, value):
+        size = len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            self.bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while self.bytes > self.max_bytes or len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                self.bytes -= self._sizes.pop(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._sizes.clear()
+            self.bytes = 0
+        super().clear()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update(bytes=self.bytes, max_bytes=self.max_bytes)
+        return stats
+
+# Shared by every session of this process
+EXPORT_CACHE = ExportCache()
+
+def get_export(result: AssessmentResult, fmt: str, digest: str = None, cache: ExportCache = EXPORT_CACHE,
+               answers: dict = None):
+    """Rendered export of `result` in `fmt` (bytes for 'pdf'), generated on first request only
+
+    Pass `digest` (from result_digest) when asking for several formats of
+    the same result to hash it once. `answers` are only accepted by the
+    ANSWER_FORMATS ('json'), and are part of the cache key there.
+    """
+    try:
+        exporter, _ = EXPORTERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(EXPORTERS)})")
+    if answers is not None and fmt not in ANSWER_FORMATS:
+        raise ValueError(f"The {fmt} export does not include answers")
+    key = (digest or result_digest(result), fmt)
+    if answers is not None:
+        key += (answers_digest(answers),)
+    export = cache.get(key)
+    if export is None:
+        export = exporter(result) if answers is None else exporter(result, answers)
+        cache.put(key, export)
+    return export
+
+def export_mime(fmt: str) -> str:
+    return EXPORTERS[fmt][1]
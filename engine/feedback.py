@@ -0,0 +1,21 @@
+# engine/feedback.py - EU Digital Resilience Toolkit
+# Real-time answer feedback and practical remediation advice
+# Texts live in engine/catalog.json (see engine/catalog.py)
+
+from .catalog import get_catalog
+
+def get_answer_feedback(question_id: str, answer: str) -> dict:
+    """
+    Fornisce feedback real-time per ogni risposta con:
+    - status: 'optimal', 'acceptable', 'needs_improvement', 'critical'
+    - message: spiegazione della valutazione
+    - advice: cosa fare per migliorare
+    - icon: emoji per visualizzazione
+
+    La mappa restituita è in sola lettura (condivisa tra le sessioni).
+    """
+    return get_catalog().get_feedback(question_id, answer)
+
+def get_practical_advice(question_id: str, answer: str) -> str:
+    """Genera consigli pratici specifici basati sulla risposta"""
+    return get_catalog().get_advice(question_id, answer)
@@ -0,0 +1,97 @@
+# engine/incremental.py - EU Digital Resilience Toolkit
+# Incremental re-scoring driven by the answer -> rule dependency graph
+
+from .models import AssessmentResult
+from .questions import DOMAIN_KEYS
+from .rules import RULES, DOMAIN_RULES, DOMAIN_MAX_SCORE, rule_fires, rule_texts
+from .scoring import calculate_risk_level, build_result
+
+def _dependency_graph() -> dict:
+    """answer key -> indices of the rules that read it"""
+    graph = {}
+    for i, rule in enumerate(RULES):
+        graph.setdefault(rule.question, []).append(i)
+        if rule.min_cloud:
+            graph.setdefault('cloud_usage', []).append(i)
+    return {key: tuple(indices) for key, indices in graph.items()}
+
+# e.g. DEPENDENTS['cloud_usage'] -> the four cloud-gated rules (one per domain)
+DEPENDENTS = _dependency_graph()
+
+class LiveAssessment:
+    """Assessment kept up to date one answer at a time
+
+    Only the rules that depend on a changed answer are re-evaluated; domain
+    scores are adjusted by the penalty difference. Findings and texts are
+    produced on demand from the set of fired rules.
+    """
+
+    def __init__(self, data: dict = None):
+        self.data = {}
+        self.fired = [False] * len(RULES)
+        self.penalties = dict.fromkeys(DOMAIN_KEYS, 0)
+        for i in range(len(RULES)):
+            self._evaluate(i)
+        if data:
+            self.update(data)
+
+    def _evaluate(self, i: int) -> bool:
+        """Re-check one rule; True if its state changed"""
+        fires = rule_fires(i, self.data)
+        if fires == self.fired[i]:
+            return False
+        self.fired[i] = fires
+        rule = RULES[i]
+        self.penalties[rule.domain] += rule.penalty if fires else -rule.penalty
+        return True
+
+    def set(self, question_id: str, value) -> list:
+        """Record one answer; returns indices of rules whose state changed"""
+        if question_id in self.data and self.data[question_id] == value:
+            return []
+        self.data[question_id] = list(value) if isinstance(value, list) else value
+        return [i for i in DEPENDENTS.get(question_id, ()) if self._evaluate(i)]
+
+    def update(self, data: dict) -> list:
+        """Record several answers (e.g. one phase of st.session_state.data)"""
+        changed = []
+        for question_id, value in data.items():
+            changed.extend(self.set(question_id, value))
+        return changed
+
+    @property
+    def rule_mask(self) -> int:
+        return sum(1 << i for i, fired in enumerate(self.fired) if fired)
+
+    def domain_score(self, domain: str) -> int:
+        return DOMAIN_MAX_SCORE - self.penalties[domain]
+
+    @property
+    def total_score(self) -> int:
+        return sum(self.domain_score(domain) for domain in DOMAIN_KEYS)
+
+    @property
+    def risk_level(self) -> str:
+        return calculate_risk_level(self.total_score)
+
+    def domain_result(self, domain: str) -> tuple:
+        """(score, findings, recs, gaps), same as assess_<domain>"""
+        findings = []
+        recs = []
+        gaps = []
+        for i in DOMAIN_RULES[domain]:
+            if self.fired[i]:
+                finding, gap, rec = rule_texts(i, self.data)
+                if finding:
+                    findings.append(finding)
+                if gap:
+                    gaps.append(gap)
+                if rec:
+                    recs.append(rec)
+        return self.domain_score(domain), findings, recs, gaps
+
+    def result(self, timestamp: str = None) -> AssessmentResult:
+        return build_result(
+            self.data, [self.domain_result(domain) for domain in DOMAIN_KEYS], timestamp,
+            rule_mask=self.rule_mask
+        )
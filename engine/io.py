@@ -0,0 +1,130 @@
+# engine/io.py - EU Digital Resilience Toolkit
+# Reading questionnaire answers (CSV files, JSON directories) and writing
+# one-row-per-assessment portfolio CSVs
+#
+# CSV layout: one row per questionnaire, one column per answer key
+# (e.g. risk_framework, log_retention, 24h_reporting). cloud_usage holds
+# the selected services separated by ';'. An optional entity_id column
+# identifies the organisation. Empty cells are treated as unanswered.
+
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .models import AssessmentResult
+from .rules import RULE_IDS
+from .scoring import TIMESTAMP_FORMAT, assess
+
+ENTITY_COLUMN = 'entity_id'
+LIST_SEPARATOR = ';'
+
+def row_to_answers(row: dict) -> dict:
+    """Turn one CSV row into the answer dict used by the assess_* functions"""
+    data = {key: value for key, value in row.items() if key and value not in (None, '')}
+    cloud_usage = data.get('cloud_usage')
+    if cloud_usage is not None:
+        data['cloud_usage'] = [c.strip() for c in cloud_usage.split(LIST_SEPARATOR) if c.strip()]
+    return data
+
+def read_answers_csv(path) -> Iterator[dict]:
+    """Stream answer dicts from a CSV file, one row at a time"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield row_to_answers(row)
+
+def read_answers_json(path) -> Iterator[dict]:
+    """Answer dicts from a JSON file holding one dict or a list of dicts"""
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    records = payload if isinstance(payload, list) else [payload]
+    for data in records:
+        if ENTITY_COLUMN not in data and len(records) == 1:
+            data = dict(data, **{ENTITY_COLUMN: Path(path).stem})
+        yield data
+
+def read_answers(path) -> Iterator[dict]:
+    """Answers from a CSV file, a JSON file, or a directory of both (sorted by name)"""
+    path = Path(path)
+    if path.is_dir():
+        for child in sorted(path.iterdir()):
+            if child.suffix.lower() in ('.csv', '.json'):
+                yield from read_answers(child)
+    elif path.suffix.lower() == '.json':
+        yield from read_answers_json(path)
+    else:
+        yield from read_answers_csv(path)
+
+def safe_name(value: str) -> str:
+    """Filesystem-safe version of an entity id"""
+    cleaned = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(value)).strip('.')
+    return cleaned or 'entity'
+
+class UniqueNames:
+    """Issues safe_name()s that are unique within one output
+
+    Repeated entity ids (e.g. several assessments of the same entity) get
+    a -2, -3... suffix, skipping names already issued for another id.
+    Names are compared case-insensitively, for case-insensitive filesystems.
+    """
+
+    def __init__(self):
+        self._issued = set()
+        self._last_suffix = {}
+
+    def __call__(self, entity_id) -> str:
+        base = safe_name(entity_id)
+        name = base
+        suffix = self._last_suffix.get(base.lower(), 1)
+        while name.lower() in self._issued:
+            suffix += 1
+            name = f"{base}-{suffix}"
+        self._last_suffix[base.lower()] = suffix
+        self._issued.add(name.lower())
+        return name
+
+# -----------------------------
+# Wide Portfolio CSV
+# -----------------------------
+
+# Fixed layout: identification, scores, fired-rule bitmask, then one 0/1
+# flag per rule
+WIDE_COLUMNS = [
+    ENTITY_COLUMN, 'timestamp', 'sector', 'scope',
+    'governance_score', 'logging_score', 'third_party_score', 'incident_score',
+    'total_score', 'risk_level', 'rule_mask',
+] + list(RULE_IDS)
+
+def wide_row(entity_id: str, result: AssessmentResult) -> list:
+    """One WIDE_COLUMNS row for a scored questionnaire"""
+    mask = result.rule_mask
+    return [
+        entity_id, result.timestamp, result.sector, result.scope,
+        result.governance_score, result.logging_score, result.third_party_score,
+        result.incident_score, result.total_score, result.risk_level, mask,
+    ] + [mask >> i & 1 for i in range(len(RULE_IDS))]
+
+def write_wide_csv(rows: Iterable[list], path) -> int:
+    """Write WIDE_COLUMNS rows to `path` as they arrive; returns the row count"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(WIDE_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def score_to_wide_csv(input_path, output_path, timestamp: str = None) -> int:
+    """Stream questionnaires from `input_path` into one wide CSV
+
+    Rows are read, scored and written one at a time, so memory does not
+    grow with the size of the export.
+    """
+    timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+    rows = (
+        wide_row(data.get(ENTITY_COLUMN) or f"{n:06d}", assess(data, timestamp))
+        for n, data in enumerate(read_answers(input_path), 1)
+    )
+    return write_wide_csv(rows, output_path)
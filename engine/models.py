@@ -0,0 +1,21 @@
+# engine/models.py - EU Digital Resilience Toolkit
+# Data Models
+
+from dataclasses import dataclass
+
+@dataclass
+class AssessmentResult:
+    timestamp: str
+    sector: str
+    scope: str
+    governance_score: int
+    logging_score: int
+    third_party_score: int
+    incident_score: int
+    total_score: int
+    risk_level: str
+    findings: list
+    recommendations: list
+    regulatory_gaps: dict
+    # Bit i set when RULES[i] fired (see engine/rules.py)
+    rule_mask: int = 0
@@ -0,0 +1,85 @@
+# engine/montecarlo.py - EU Digital Resilience Toolkit
+# Monte Carlo sensitivity analysis for uncertain answers
+#
+# Any answer can be given as a probability distribution over its options,
+# e.g. {'24h_reporting': {'Yes, process established': 0.3, 'Uncertain': 0.7}}.
+# Scenarios are sampled straight into option-code matrices and scored
+# with the vectorized rule tables, so 100k samples take a few tens of ms.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .questions import QUESTIONS, DOMAIN_KEYS, MAX_CLOUD_COUNT
+from .rules import DOMAIN_MAX_SCORE
+from .scoring import RISK_LEVELS
+from .vectorized import COLUMNS, CLOUD_COLUMN, encode_answers, score_matrix
+
+DEFAULT_SAMPLES = 100_000
+MAX_TOTAL_SCORE = DOMAIN_MAX_SCORE * len(DOMAIN_KEYS)
+
+@dataclass
+class SimulationResult:
+    """Distribution of the total score over sampled scenarios"""
+    samples: int
+    mean: float
+    std: float
+    percentiles: dict           # 'p5', 'p50', 'p95' -> total score
+    histogram: list             # histogram[score] = number of samples
+    risk_probabilities: dict    # risk level -> probability
+    domain_means: dict          # domain key -> mean score
+
+def _column_distribution(question_id: str, distribution: dict) -> tuple:
+    """(option codes, probabilities) for one uncertain answer"""
+    if question_id == 'cloud_usage':
+        # Keys are numbers of cloud service types in use
+        codes = [min(int(count), MAX_CLOUD_COUNT) for count in distribution]
+    elif question_id in QUESTIONS:
+        options = QUESTIONS[question_id]
+        unknown = [option for option in distribution if option not in options]
+        if unknown:
+            raise ValueError(f"Unknown option(s) for {question_id}: {', '.join(map(str, unknown))}")
+        codes = [options.index(option) for option in distribution]
+    else:
+        raise ValueError(f"Unknown question: {question_id}")
+
+    weights = np.array(list(distribution.values()), dtype=np.float64)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"Probabilities for {question_id} must be non-negative and not all zero")
+    return np.array(codes, dtype=np.uint8), weights / weights.sum()
+
+def sample_codes(data: dict, distributions: dict, samples: int = DEFAULT_SAMPLES,
+                 rng: np.random.Generator = None) -> np.ndarray:
+    """(samples, len(COLUMNS)) code matrix: fixed answers from `data`, the rest sampled"""
+    rng = rng or np.random.default_rng()
+    codes = np.empty((samples, len(COLUMNS)), dtype=np.uint8)
+    codes[:] = np.array(encode_answers(data), dtype=np.uint8)
+    for question_id, distribution in distributions.items():
+        column = CLOUD_COLUMN if question_id == 'cloud_usage' else COLUMNS.index(question_id)
+        options, probabilities = _column_distribution(question_id, distribution)
+        codes[:, column] = options[rng.choice(len(options), size=samples, p=probabilities)]
+    return codes
+
+def simulate(data: dict, distributions: dict, samples: int = DEFAULT_SAMPLES, seed: int = None) -> SimulationResult:
+    """Score `samples` scenarios drawn from the answer distributions
+
+    `data` gives the answers that are known; `distributions` maps question
+    id -> {option: probability} (weights are normalised) and overrides them.
+    For cloud_usage the keys are numbers of service types.
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    scores = score_matrix(sample_codes(data, distributions, samples, np.random.default_rng(seed)))
+    total = scores['total']
+    histogram = np.bincount(total, minlength=MAX_TOTAL_SCORE + 1)
+    risk = np.bincount(scores['risk_class'], minlength=len(RISK_LEVELS)) / samples
+    p5, p50, p95 = np.percentile(total, (5, 50, 95), method='inverted_cdf')
+    return SimulationResult(
+        samples=samples,
+        mean=float(total.mean()),
+        std=float(total.std()),
+        percentiles={'p5': int(p5), 'p50': int(p50), 'p95': int(p95)},
+        histogram=histogram.tolist(),
+        risk_probabilities={level: float(p) for level, p in zip(RISK_LEVELS, risk)},
+        domain_means={key: float(scores[key].mean()) for key in DOMAIN_KEYS},
+    )
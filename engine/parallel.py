@@ -0,0 +1,41 @@
+# engine/parallel.py - EU Digital Resilience Toolkit
+# Ordered, bounded sharding of row streams across a process pool
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+def iter_shards(rows: Iterable, size: int) -> Iterator[list]:
+    """Split a stream into lists of at most `size` items"""
+    rows = iter(rows)
+    while True:
+        shard = list(islice(rows, size))
+        if not shard:
+            return
+        yield shard
+
+def map_shards(fn: Callable, shards: Iterable[list], workers: int = None,
+               max_pending: int = None, args: tuple = ()) -> Iterator:
+    """Apply fn(shard, *args) to every shard in worker processes
+
+    Results come back in input order. At most `max_pending` shards (default
+    2 per worker) are in flight, so memory stays flat for any input size.
+    workers=1 runs inline, without a pool.
+    """
+    if workers == 1:
+        for shard in shards:
+            yield fn(shard, *args)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(fn, shard, *args))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
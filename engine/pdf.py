@@ -0,0 +1,199 @@
+# engine/pdf.py - EU Digital Resilience Toolkit
+# PDF report (fpdf2)
+#
+# Same content as the text report: header, executive summary, domain
+# breakdown as score bars, regulatory gaps, findings and prioritized
+# recommendations. Uses the core Helvetica font, so every text goes
+# through latin1() first (catalog texts are user-editable).
+#
+# Usage:
+#   pdf_bytes = build_pdf(result)
+#   write_pdf(result, 'report.pdf')
+#   python -m engine pdf answers.csv -o pdfs/    # whole portfolio, in parallel
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from .models import AssessmentResult
+from .render import DOCUMENT_TITLE, REPORT_TITLE, priority_label
+from .rules import DOMAIN_MAX_SCORE
+from .scoring import DOMAINS
+
+# Colors (same palette as the web report)
+PRIMARY = (102, 126, 234)
+SECONDARY = (100, 116, 139)
+DANGER = (239, 68, 68)
+WARNING = (245, 158, 11)
+SUCCESS = (34, 197, 94)
+LIGHT = (248, 250, 252)
+TRACK = (226, 232, 240)
+
+RISK_COLORS = {'LOW': SUCCESS, 'MEDIUM': WARNING, 'HIGH': DANGER}
+PRIORITY_COLORS = {'HIGH': DANGER, 'MEDIUM': WARNING, 'LOW': SUCCESS}
+
+# Result field of each domain score, in DOMAINS order
+_SCORE_FIELDS = ('governance_score', 'logging_score', 'third_party_score', 'incident_score')
+
+MARGIN = 15
+BAR_WIDTH = 100
+LINE_HEIGHT = 5.5
+
+# Common non-Latin-1 characters and their closest Latin-1 spelling
+_LATIN1_REPLACEMENTS = str.maketrans({
+    '–': '-', '—': '-', '‘': "'", '’': "'", '“': '"', '”': '"',
+    '•': '-', '…': '...', '→': '->', '≤': '<=', '≥': '>=', '€': 'EUR',
+})
+
+def latin1(text) -> str:
+    """Text the core PDF fonts can encode (unknown characters become '?')"""
+    return str(text).translate(_LATIN1_REPLACEMENTS).encode('latin-1', 'replace').decode('latin-1')
+
+def bar_color(score: int, maximum: int = DOMAIN_MAX_SCORE) -> tuple:
+    ratio = score / maximum
+    if ratio >= 0.8:
+        return SUCCESS
+    if ratio >= 0.6:
+        return WARNING
+    return DANGER
+
+# -----------------------------
+# Document
+# -----------------------------
+
+class ReportPDF(FPDF):
+    """A4 report page with a footer line and page numbers"""
+
+    def __init__(self):
+        super().__init__(format='A4')
+        self.set_margins(MARGIN, MARGIN, MARGIN)
+        self.set_auto_page_break(True, margin=MARGIN + 5)
+        self.set_author('EU Digital Resilience Toolkit')
+        self.set_title(DOCUMENT_TITLE)
+
+    def footer(self):
+        self.set_y(-MARGIN)
+        self.set_font('Helvetica', '', 8)
+        self.set_text_color(*SECONDARY)
+        self.cell(0, 5, 'EU Digital Resilience Toolkit v1.0 - NIS2 Directive + DORA Regulation')
+        self.cell(0, 5, f'Page {self.page_no()}/{{nb}}', align='R')
+
+    def heading(self, text: str):
+        if self.get_y() > self.h - 50:
+            self.add_page()
+        self.ln(4)
+        self.set_font('Helvetica', 'B', 13)
+        self.set_text_color(*PRIMARY)
+        self.cell(0, 8, latin1(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_draw_color(*PRIMARY)
+        self.line(MARGIN, self.get_y(), self.w - MARGIN, self.get_y())
+        self.ln(2)
+        self.set_text_color(0, 0, 0)
+
+    def item(self, label: str, text: str, color: tuple = None, width: float = 18):
+        """Hanging-indent list item: `label` in a `width` mm column, wrapped text"""
+        self.set_font('Helvetica', 'B', 9)
+        self.set_text_color(*(color or SECONDARY))
+        self.cell(width, LINE_HEIGHT, latin1(label))
+        self.set_font('Helvetica', '', 10)
+        self.set_text_color(0, 0, 0)
+        self.multi_cell(0, LINE_HEIGHT, latin1(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.ln(0.8)
+
+def _header(pdf: ReportPDF, result: AssessmentResult):
+    pdf.set_fill_color(*PRIMARY)
+    pdf.rect(0, 0, pdf.w, 36, style='F')
+    pdf.set_xy(MARGIN, 10)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font('Helvetica', 'B', 18)
+    pdf.cell(0, 9, REPORT_TITLE, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font('Helvetica', '', 10)
+    pdf.cell(0, 6, latin1(f"Generated: {result.timestamp}   |   Sector: {result.sector}"),
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.multi_cell(0, 5, latin1(f"Regulatory Scope: {result.scope}"), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_y(42)
+
+def _summary(pdf: ReportPDF, result: AssessmentResult):
+    pdf.heading("Executive Summary")
+    top = pdf.get_y()
+    pdf.set_fill_color(*LIGHT)
+    pdf.rect(MARGIN, top, pdf.w - 2 * MARGIN, 22, style='F')
+    pdf.set_xy(MARGIN + 5, top + 4)
+    pdf.set_font('Helvetica', 'B', 22)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(45, 14, f"{result.total_score}/100")
+    pdf.set_font('Helvetica', '', 10)
+    pdf.set_text_color(*SECONDARY)
+    pdf.cell(35, 14, "Risk Classification:")
+    pdf.set_fill_color(*RISK_COLORS.get(result.risk_level, SECONDARY))
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.cell(30, 14, latin1(result.risk_level), align='C', fill=True)
+    pdf.set_y(top + 26)
+
+def _domain_bars(pdf: ReportPDF, result: AssessmentResult):
+    pdf.heading("Domain Breakdown")
+    for (label, _), field in zip(DOMAINS, _SCORE_FIELDS):
+        score = getattr(result, field)
+        y = pdf.get_y()
+        pdf.set_font('Helvetica', '', 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(55, 7, latin1(label))
+        x = pdf.get_x()
+        pdf.set_fill_color(*TRACK)
+        pdf.rect(x, y + 1.5, BAR_WIDTH, 4, style='F')
+        if score > 0:
+            pdf.set_fill_color(*bar_color(score))
+            pdf.rect(x, y + 1.5, BAR_WIDTH * min(score, DOMAIN_MAX_SCORE) / DOMAIN_MAX_SCORE, 4, style='F')
+        pdf.set_x(x + BAR_WIDTH + 4)
+        pdf.set_font('Helvetica', 'B', 10)
+        pdf.cell(0, 7, f"{score}/{DOMAIN_MAX_SCORE}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+def _gaps(pdf: ReportPDF, result: AssessmentResult):
+    pdf.heading("Regulatory Gaps Identified")
+    groups = [(group, items) for group, items in result.regulatory_gaps.items() if items]
+    if not groups:
+        pdf.item('', "No regulatory gaps identified.")
+    for group, items in groups:
+        pdf.set_font('Helvetica', 'B', 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(0, 7, latin1(group), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        for gap in items:
+            pdf.item('-', gap, width=6)
+
+def _findings(pdf: ReportPDF, result: AssessmentResult):
+    pdf.heading(f"Findings ({len(result.findings)} items)")
+    for n, finding in enumerate(result.findings, 1):
+        pdf.item(f"{n}.", finding)
+
+def _recommendations(pdf: ReportPDF, result: AssessmentResult):
+    pdf.heading(f"Recommendations ({len(result.recommendations)} items)")
+    for n, rec in enumerate(result.recommendations, 1):
+        priority = priority_label(n)
+        pdf.item(f"[{priority}]", rec, PRIORITY_COLORS[priority])
+
+def _disclaimer(pdf: ReportPDF):
+    pdf.heading("Disclaimer")
+    pdf.set_font('Helvetica', 'I', 9)
+    pdf.set_text_color(*SECONDARY)
+    pdf.multi_cell(0, 4.5, "This assessment is a readiness and risk evaluation tool. It does not constitute "
+                           "legal advice. Organizations should consult legal counsel for compliance strategy.")
+
+def build_pdf(result: AssessmentResult) -> bytes:
+    """Render the assessment report as PDF bytes"""
+    pdf = ReportPDF()
+    pdf.add_page()
+    _header(pdf, result)
+    _summary(pdf, result)
+    _domain_bars(pdf, result)
+    _gaps(pdf, result)
+    _findings(pdf, result)
+    _recommendations(pdf, result)
+    _disclaimer(pdf)
+    return bytes(pdf.output())
+
+def write_pdf(result: AssessmentResult, path) -> int:
+    """Write the PDF report to `path`; returns its size in bytes"""
+    data = build_pdf(result)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
@@ -0,0 +1,87 @@
+# engine/questions.py - EU Digital Resilience Toolkit
+# Questionnaire vocabulary: the fixed option lists of every question
+
+# Options in the order offered by the st.selectbox / st.select_slider calls
+# of the Risk Assessment page. Any other value (missing answer, "N/A" when
+# no cloud is used, free text from imported data) is encoded as OTHER.
+QUESTIONS = {
+    # Phase 1: Governance & Scope
+    'sector': [
+        "Financial services", "Energy", "Transport", "Digital infrastructure",
+        "Healthcare", "Public administration", "Manufacturing", "Other/Mixed",
+        # Not offered by the page, but scored by assess_governance
+        "Unknown", "Not applicable"
+    ],
+    'risk_framework': [
+        "No framework", "Ad-hoc processes", "Partially documented",
+        "Yes, documented and tested"
+    ],
+    'board_oversight': [
+        "No oversight", "Annual review", "Bi-annual reviews", "Yes, quarterly reviews"
+    ],
+    'cloud_governance': ["No specific framework", "Informal processes", "Yes, formalized"],
+    
+    # Phase 2: Logging & Monitoring
+    'centralized_logging': ["No centralization", "Partial (some sources)", "Yes, SIEM deployed"],
+    'log_retention': ["<6 months", "6-12 months", "12-18 months", "18-24 months", "24+ months"],
+    'log_integrity': ["No verification", "Manual spot-checks", "Yes, automated verification"],
+    'cloud_logs_integrated': ["No", "Partially", "Yes, all sources"],
+    'realtime_monitoring': ["No active monitoring", "Business hours only", "Yes, 24/7 SOC"],
+    
+    # Phase 3: ICT Third-Party Risk
+    'vendor_inventory': ["No inventory", "Informal list", "Yes, complete and current"],
+    'audit_rights': ["Not in contracts", "In some contracts", "Yes, in all critical contracts"],
+    'incident_notification_sla': ["No SLA", "72+ hours", "24 hours", "12 hours"],
+    'cloud_exit_plan': ["No exit plan", "Documented but not tested", "Yes, tested annually"],
+    'supply_chain_monitoring': ["No monitoring", "Annual assessments", "Yes, continuous assessment"],
+    
+    # Phase 4: Incident & Resilience
+    'incident_process': ["No formal process", "Process exists, not tested", "Yes, documented and tested"],
+    '24h_reporting': ["No", "Uncertain", "Yes, process established"],
+    'resilience_testing': ["Never", "Annually", "Bi-annually", "Quarterly"],
+    'rto_rpo_defined': ["No", "For some systems", "Yes, for all critical systems"],
+    'cloud_incident_integration': ["No", "Yes"],
+}
+
+# cloud_usage is a multiselect: only the number of service types is scored
+CLOUD_SERVICES = [
+    "IaaS (AWS, Azure, GCP)", "SaaS (M365, Salesforce, etc.)",
+    "PaaS", "Managed security services"
+]
+MAX_CLOUD_COUNT = len(CLOUD_SERVICES)
+
+# Questions scored by each domain (cloud_usage feeds all four)
+DOMAIN_KEYS = ('governance', 'logging', 'third_party', 'incident')
+DOMAIN_QUESTIONS = {
+    'governance': ['sector', 'risk_framework', 'board_oversight', 'cloud_governance'],
+    'logging': ['centralized_logging', 'log_retention', 'log_integrity',
+                'cloud_logs_integrated', 'realtime_monitoring'],
+    'third_party': ['vendor_inventory', 'audit_rights', 'incident_notification_sla',
+                    'cloud_exit_plan', 'supply_chain_monitoring'],
+    'incident': ['incident_process', '24h_reporting', 'resilience_testing',
+                 'rto_rpo_defined', 'cloud_incident_integration'],
+}
+
+# question_id -> {option: index}, built once
+_OPTION_INDEX = {
+    question_id: {option: i for i, option in enumerate(options)}
+    for question_id, options in QUESTIONS.items()
+}
+
+def other_code(question_id: str) -> int:
+    """Code used for any answer outside the option list"""
+    return len(QUESTIONS[question_id])
+
+def option_index(question_id: str, answer) -> int:
+    """Encode an answer as its option index (OTHER code if not an option)"""
+    index = _OPTION_INDEX[question_id]
+    return index.get(answer, len(index)) if isinstance(answer, str) else len(index)
+
+def cloud_count(data: dict) -> int:
+    """Number of cloud service types, capped at MAX_CLOUD_COUNT"""
+    return min(len(data.get('cloud_usage', [])), MAX_CLOUD_COUNT)
+
+def scope_entries(scope: str) -> list:
+    """Individual regulatory scopes of a 'scope' answer (joined with ', ' by the page)"""
+    entries = [part.strip() for part in (scope or '').split(',') if part.strip()]
+    return entries or ['Unknown']
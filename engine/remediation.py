@@ -0,0 +1,151 @@
+# engine/remediation.py - EU Digital Resilience Toolkit
+# Cheapest set of answer improvements that reaches LOW risk
+#
+# Improving one answer (e.g. risk_framework -> "Yes, documented and
+# tested") stops every rule on that question, so each question with fired
+# rules is an item whose gain is the sum of their penalties. Reaching LOW
+# (total >= 85) is then a covering knapsack: pick items with the least
+# total cost whose gains add up to the missing points.
+#
+# With the default cost of one change per question, taking the largest
+# gains first is optimal (and also the largest gain for that number of
+# changes). Custom per-question costs use a DP over the missing points,
+# which is at most 85 wide.
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from .questions import QUESTIONS
+from .rules import RULES, RULE_IDS, rule_mask
+from .scoring import RISK_LEVELS, calculate_risk_level
+from .diff import mask_scores
+
+# Lowest total classified LOW by calculate_risk_level
+LOW_THRESHOLD = next(score for score in range(101) if calculate_risk_level(score) == RISK_LEVELS[0])
+
+# question -> indices into RULES that read it (cloud_usage only gates rules)
+QUESTION_RULES = {}
+for _i, _rule in enumerate(RULES):
+    QUESTION_RULES.setdefault(_rule.question, []).append(_i)
+
+def _target_answer(question: str):
+    """First option that fires none of the question's rules
+
+    None when a rule only lists failing answers (e.g. sector "Unknown"):
+    any real answer fixes it.
+    """
+    rules = [RULES[i] for i in QUESTION_RULES[question]]
+    if any(rule.passing is None for rule in rules):
+        return None
+    for option in QUESTIONS[question]:
+        if not any(rule.fires_on(option) for rule in rules):
+            return option
+    return None
+
+TARGET_ANSWERS = {question: _target_answer(question) for question in QUESTION_RULES}
+
+@dataclass
+class Change:
+    """One answer improvement and the points it recovers"""
+    question: str
+    current: object
+    target: str        # None: any answer outside the failing ones
+    gain: int
+    rule_ids: list
+    cost: int = 1
+
+    @property
+    def gain_per_cost(self) -> float:
+        return self.gain / self.cost
+
+@dataclass
+class RemediationPlan:
+    """Changes that lift the total to `target_score`, cheapest first found"""
+    total_score: int
+    target_score: int
+    changes: list = field(default_factory=list)
+    feasible: bool = True
+
+    @property
+    def gain(self) -> int:
+        return sum(change.gain for change in self.changes)
+
+    @property
+    def cost(self) -> int:
+        return sum(change.cost for change in self.changes)
+
+    @property
+    def projected_score(self) -> int:
+        return self.total_score + self.gain
+
+    @property
+    def projected_risk_level(self) -> str:
+        return calculate_risk_level(self.projected_score)
+
+def ranked_changes(data: dict, costs: dict = None, mask: int = None) -> list:
+    """Every improving change for an answer dict, best points-per-cost first"""
+    mask = rule_mask(data) if mask is None else mask
+    costs = costs or {}
+    changes = []
+    for question, indices in QUESTION_RULES.items():
+        fired = [i for i in indices if mask >> i & 1]
+        if fired:
+            changes.append(Change(
+                question=question,
+                current=data.get(question),
+                target=TARGET_ANSWERS[question],
+                gain=sum(RULES[i].penalty for i in fired),
+                rule_ids=[RULE_IDS[i] for i in fired],
+                cost=costs.get(question, 1),
+            ))
+    changes.sort(key=lambda change: (-change.gain_per_cost, -change.gain, change.question))
+    return changes
+
+def _cheapest_cover(changes: list, needed: int) -> list:
+    """Least-cost subset with gain >= needed (DP over capped gain); None if impossible"""
+    # best[g] = (cost, -gain, chosen indices) reaching capped gain g
+    best = {0: (0, 0, ())}
+    for n, change in enumerate(changes):
+        for reached, (cost, neg_gain, chosen) in list(best.items()):
+            key = min(needed, reached + change.gain)
+            candidate = (cost + change.cost, neg_gain - change.gain, chosen + (n,))
+            if key not in best or candidate[:2] < best[key][:2]:
+                best[key] = candidate
+    if needed not in best:
+        return None
+    return [changes[n] for n in best[needed][2]]
+
+def plan_remediation(data: dict, target_score: int = LOW_THRESHOLD, costs: dict = None) -> RemediationPlan:
+    """Smallest-cost answer improvements lifting the total to `target_score`
+
+    Default: one cost unit per changed question, so the plan has the fewest
+    changes (and, among those, the largest gain). `costs` maps question ->
+    effort to weigh changes differently.
+    """
+    mask = rule_mask(data)
+    total = mask_scores(mask)['total']
+    plan = RemediationPlan(total_score=total, target_score=target_score)
+    needed = target_score - total
+    if needed <= 0:
+        return plan
+
+    changes = ranked_changes(data, costs, mask)
+    if not costs or len(set(change.cost for change in changes)) <= 1:
+        chosen = []
+        for change in sorted(changes, key=lambda change: -change.gain):
+            if needed <= 0:
+                break
+            chosen.append(change)
+            needed -= change.gain
+        plan.changes = chosen
+        plan.feasible = needed <= 0
+    else:
+        chosen = _cheapest_cover(changes, needed)
+        plan.feasible = chosen is not None
+        plan.changes = chosen if chosen is not None else changes
+    return plan
+
+def plan_many(rows: Iterable[dict], target_score: int = LOW_THRESHOLD, costs: dict = None) -> Iterator[RemediationPlan]:
+    """Remediation plan per answer dict, one at a time"""
+    for data in rows:
+        yield plan_remediation(data, target_score, costs)
@@ -0,0 +1,288 @@
+# engine/render.py - EU Digital Resilience Toolkit
+# Compiled, streaming report renderer (TXT, Markdown, HTML)
+#
+# REPORT_TEMPLATE describes the report once as a sequence of blocks. Each
+# output style turns the blocks into markup, and the result is compiled
+# at import time into one Python function per style: adjacent static
+# blocks become a single f-string, gaps / findings / recommendations
+# become plain loops. The function hands every chunk to a `write`
+# callable, so a report can go straight to a file or socket, or be
+# joined once.
+#
+# The TXT style reproduces generate_text_report exactly.
+
+from html import escape as html_escape
+from string import Formatter
+
+from .models import AssessmentResult
+
+RULE_WIDTH = 80
+
+# Priority label of the n-th recommendation (1-based): first three HIGH,
+# next three MEDIUM, the rest LOW
+_PRIORITIES = (None,) + ('HIGH',) * 3 + ('MEDIUM',) * 3
+
+def priority_label(n: int) -> str:
+    return _PRIORITIES[n] if n < len(_PRIORITIES) else 'LOW'
+
+REPORT_TITLE = "EU DIGITAL RESILIENCE ASSESSMENT REPORT"
+# Document metadata title (HTML <title>, PDF properties); str.title() would give "Eu"
+DOCUMENT_TITLE = "EU Digital Resilience Assessment Report"
+
+REPORT_TEMPLATE = (
+    ('title', REPORT_TITLE),
+    ('fields', (('Generated', '{timestamp}'), ('Sector', '{sector}'), ('Regulatory Scope', '{scope}'))),
+    ('section', "EXECUTIVE SUMMARY"),
+    ('fields', (('Total Risk Score', '{total_score}/100'), ('Risk Classification', '{risk_level}'))),
+    ('table', "Domain Breakdown", (
+        ('Governance & Scope', '{governance_score}/25'),
+        ('Logging & Monitoring', '{logging_score}/25'),
+        ('ICT Third-Party Risk', '{third_party_score}/25'),
+        ('Incident & Resilience', '{incident_score}/25'),
+    )),
+    ('section', "REGULATORY GAPS IDENTIFIED"),
+    ('groups', 'regulatory_gaps'),
+    ('section', "FINDINGS ({findings_count} items)"),
+    ('numbered', 'findings'),
+    ('section', "RECOMMENDATIONS ({recommendations_count} items)"),
+    ('prioritized', 'recommendations'),
+    ('section', "DISCLAIMER"),
+    ('paragraph', (
+        "This assessment is a readiness and risk evaluation tool. It does not constitute",
+        "legal advice. Organizations should consult legal counsel for compliance strategy.",
+    )),
+    ('fields', (('Tool', 'EU Digital Resilience Toolkit v1.0'),
+                ('Framework', 'NIS2 Directive + DORA Regulation (integrated assessment)'))),
+    ('end',),
+)
+
+# -----------------------------
+# Output Styles
+# -----------------------------
+
+class TextStyle:
+    """Plain text, 80 columns (the original report layout)"""
+    extension = 'txt'
+    mime = 'text/plain'
+    escape = None
+    begin = ''
+    end_document = ''
+
+    def title(self, text):
+        return f"\n{'=' * RULE_WIDTH}\n{text}\n{'=' * RULE_WIDTH}\n"
+
+    def section(self, text):
+        return f"\n{'-' * RULE_WIDTH}\n{text}\n{'-' * RULE_WIDTH}\n"
+
+    def fields(self, pairs):
+        return '\n' + ''.join(f"{label}: {value}\n" for label, value in pairs)
+
+    def table(self, caption, rows):
+        return f"\n{caption}:\n" + ''.join(f"  - {label + ':':<27}{value}\n" for label, value in rows)
+
+    def paragraph(self, lines):
+        return ''.join(f"{line}\n" for line in lines)
+
+    def end(self):
+        return f"{'=' * RULE_WIDTH}\n"
+
+    # Loops: (before, item, after); groups add a per-group header
+    group_header = "\n{group}:\n"
+    group_item = ("", "  - {item}\n", "")
+    numbered = ("", "{n}. {item}\n", "")
+    prioritized = ("", "[{priority}] {item}\n", "")
+
+# Characters Markdown would read as emphasis, headings, code or links
+_MARKDOWN_SPECIALS = str.maketrans({c: '\\' + c for c in '\\`*_#[]'})
+
+def markdown_escape(text: str) -> str:
+    return text.translate(_MARKDOWN_SPECIALS)
+
+class MarkdownStyle:
+    extension = 'md'
+    mime = 'text/markdown'
+    escape = staticmethod(markdown_escape)
+    begin = ''
+    end_document = ''
+
+    def title(self, text):
+        return f"# {text}\n"
+
+    def section(self, text):
+        return f"\n## {text}\n"
+
+    def fields(self, pairs):
+        return '\n' + ''.join(f"- **{label}:** {value}\n" for label, value in pairs)
+
+    def table(self, caption, rows):
+        return (f"\n**{caption}**\n\n| Domain | Score |\n|---|---|\n"
+                + ''.join(f"| {label} | {value} |\n" for label, value in rows))
+
+    def paragraph(self, lines):
+        return '\n' + ' '.join(lines) + '\n'
+
+    def end(self):
+        return ''
+
+    group_header = "\n### {group}\n\n"
+    group_item = ("", "- {item}\n", "")
+    numbered = ("\n", "{n}. {item}\n", "")
+    prioritized = ("\n", "- **[{priority}]** {item}\n", "")
+
+class HtmlStyle:
+    extension = 'html'
+    mime = 'text/html'
+    escape = staticmethod(html_escape)
+    begin = ('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+             f'<title>{DOCUMENT_TITLE}</title>\n</head>\n<body>\n')
+    end_document = '</body>\n</html>\n'
+
+    def title(self, text):
+        return f"<h1>{html_escape(text)}</h1>\n"
+
+    def section(self, text):
+        return f"<h2>{html_escape(text)}</h2>\n"
+
+    def fields(self, pairs):
+        return ('<ul>\n' + ''.join(f"<li><strong>{html_escape(label)}:</strong> {html_escape(value)}</li>\n"
+                                   for label, value in pairs) + '</ul>\n')
+
+    def table(self, caption, rows):
+        return (f"<table>\n<caption>{html_escape(caption)}</caption>\n"
+                + ''.join(f"<tr><th>{html_escape(label)}</th><td>{html_escape(value)}</td></tr>\n" for label, value in rows)
+                + '</table>\n')
+
+    def paragraph(self, lines):
+        return f"<p>{html_escape(' '.join(lines))}</p>\n"
+
+    def end(self):
+        return ''
+
+    group_header = "<h3>{group}</h3>\n"
+    group_item = ("<ul>\n", "<li>{item}</li>\n", "</ul>\n")
+    numbered = ("<ol>\n", "<li>{item}</li>\n", "</ol>\n")
+    prioritized = ("<ul>\n", "<li><strong>[{priority}]</strong> {item}</li>\n", "</ul>\n")
+
+STYLES = {style.extension: style() for style in (TextStyle, MarkdownStyle, HtmlStyle)}
+
+# -----------------------------
+# Compilation
+# -----------------------------
+
+# Names a template may use: result fields, list lengths, loop variables
+_TEXT_FIELDS = ('timestamp', 'sector', 'scope', 'risk_level')
+_NUMBER_FIELDS = ('total_score', 'governance_score', 'logging_score', 'third_party_score', 'incident_score')
+_COUNT_FIELDS = {'findings_count': 'findings', 'recommendations_count': 'recommendations'}
+_LOOP_FIELDS = ('group', 'n', 'item', 'priority')
+TEMPLATE_FIELDS = _TEXT_FIELDS + _NUMBER_FIELDS + tuple(_COUNT_FIELDS) + _LOOP_FIELDS
+
+_FORMATTER = Formatter()
+
+def _fstring(template: str) -> str:
+    """Python source of an f-string equivalent to a str.format template"""
+    for _, field, spec, conversion in _FORMATTER.parse(template):
+        if field is not None and (field not in TEMPLATE_FIELDS or spec or conversion):
+            raise ValueError(f"Unsupported template field: {{{field}}}")
+    return 'f' + repr(template)
+
+def compile_template(template: tuple, style):
+    """Compile a block template for one style into render(result, write)
+
+    Style output uses str.format syntax ('{field}', literal braces
+    doubled). The whole report becomes one generated Python function of
+    f-strings and loops, built once per style.
+    """
+    escape = style.escape is not None
+    body = []
+    pending = []
+
+    def emit(line, depth=1):
+        body.append('    ' * depth + line)
+
+    def flush():
+        text = ''.join(pending)
+        pending.clear()
+        if text:
+            emit(f"write({_fstring(text)})")
+
+    def write_literal(text, depth):
+        if text:
+            emit(f"write({text!r})", depth)
+
+    for name in _NUMBER_FIELDS:
+        emit(f"{name} = result.{name}")
+    for name in _TEXT_FIELDS:
+        emit(f"{name} = escape(str(result.{name}))" if escape else f"{name} = result.{name}")
+    for name, source in _COUNT_FIELDS.items():
+        emit(f"{name} = len(result.{source})")
+
+    pending.append(style.begin)
+    for kind, *args in template:
+        if kind in ('title', 'section', 'fields', 'table', 'paragraph', 'end'):
+            pending.append(getattr(style, kind)(*args))
+        elif kind == 'groups':
+            flush()
+            before, item, after = style.group_item
+            emit(f"for group, items in result.{args[0]}.items():")
+            emit("if items:", 2)
+            if escape:
+                emit("group = escape(group)", 3)
+            emit(f"write({_fstring(style.group_header)})", 3)
+            write_literal(before, 3)
+            emit("for n, item in enumerate(items, 1):", 3)
+            if escape:
+                emit("item = escape(item)", 4)
+            emit(f"write({_fstring(item)})", 4)
+            write_literal(after, 3)
+        elif kind in ('numbered', 'prioritized'):
+            flush()
+            before, item, after = getattr(style, kind)
+            write_literal(before, 1)
+            emit(f"for n, item in enumerate(result.{args[0]}, 1):")
+            if escape:
+                emit("item = escape(item)", 2)
+            if '{priority}' in item:
+                emit("priority = PRIORITIES[n] if n < PRIORITY_COUNT else 'LOW'", 2)
+            emit(f"write({_fstring(item)})", 2)
+            write_literal(after, 1)
+        else:
+            raise ValueError(f"Unknown template block: {kind}")
+    pending.append(style.end_document)
+    flush()
+
+    source = "def render(result, write):\n" + "\n".join(body) + "\n"
+    namespace = {'escape': style.escape, 'PRIORITIES': _PRIORITIES, 'PRIORITY_COUNT': len(_PRIORITIES)}
+    exec(compile(source, f"<report template: {style.extension}>", 'exec'), namespace)
+    render = namespace['render']
+    render.source = source
+    return render
+
+RENDERERS = {fmt: compile_template(REPORT_TEMPLATE, style) for fmt, style in STYLES.items()}
+
+# -----------------------------
+# Rendering
+# -----------------------------
+
+def render_report(result: AssessmentResult, fmt: str = 'txt', out=None):
+    """Render a report in `fmt` ('txt', 'md' or 'html')
+
+    With `out` (any object with a write() method, e.g. an open text file)
+    chunks are written as they are produced and None is returned;
+    otherwise the report is returned as one string.
+    """
+    try:
+        render = RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown report format: {fmt} (expected one of {', '.join(STYLES)})")
+    if out is not None:
+        render(result, out.write)
+        return None
+    chunks = []
+    render(result, chunks.append)
+    return ''.join(chunks)
+
+def write_report(result: AssessmentResult, path, fmt: str = None):
+    """Stream a report to a file; fmt defaults to the file extension"""
+    fmt = fmt or str(path).rsplit('.', 1)[-1].lower()
+    with open(path, 'w', encoding='utf-8') as f:
+        render_report(result, fmt, f)
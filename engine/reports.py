@@ -0,0 +1,40 @@
+# engine/reports.py - EU Digital Resilience Toolkit
+# Text and CSV report generation (the text report comes from engine/render.py)
+
+import csv
+from io import StringIO
+
+from .models import AssessmentResult
+from .render import render_report
+
+def generate_text_report(result: AssessmentResult) -> str:
+    """Generate professional text report"""
+    return render_report(result, 'txt')
+
+def generate_csv_export(result: AssessmentResult) -> str:
+    """Generate CSV export for data analysis"""
+    output = StringIO()
+    writer = csv.writer(output)
+    
+    writer.writerow(['Metric', 'Value'])
+    writer.writerow(['Timestamp', result.timestamp])
+    writer.writerow(['Sector', result.sector])
+    writer.writerow(['Regulatory Scope', result.scope])
+    writer.writerow(['Total Score', result.total_score])
+    writer.writerow(['Risk Level', result.risk_level])
+    writer.writerow(['Governance Score', result.governance_score])
+    writer.writerow(['Logging Score', result.logging_score])
+    writer.writerow(['Third-Party Score', result.third_party_score])
+    writer.writerow(['Incident Score', result.incident_score])
+    writer.writerow([])
+    
+    writer.writerow(['Findings'])
+    for finding in result.findings:
+        writer.writerow([finding])
+    writer.writerow([])
+    
+    writer.writerow(['Recommendations'])
+    for rec in result.recommendations:
+        writer.writerow([rec])
+    
+    return output.getvalue()
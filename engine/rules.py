@@ -0,0 +1,239 @@
+# engine/rules.py - EU Digital Resilience Toolkit
+# Declarative scoring rules, compiled into per-question penalty lookups
+
+from dataclasses import dataclass
+
+from .questions import QUESTIONS, DOMAIN_KEYS, option_index
+
+DOMAIN_MAX_SCORE = 25
+
+# -----------------------------
+# Rule Definition
+# -----------------------------
+
+@dataclass(frozen=True)
+class Rule:
+    """One deduction: fires when the answer to `question` fails the condition
+
+    Exactly one of `passing` (fires on any other answer, including a missing
+    one) or `failing` (fires only on these answers) is set. Gated rules only
+    apply when at least `min_cloud` cloud service types are in use.
+    Texts may use {answer} (the raw answer) and {cloud_count}.
+    """
+    rule_id: str
+    domain: str
+    question: str
+    penalty: int
+    finding: str = None
+    gap: str = None
+    recommendation: str = None
+    passing: tuple = None
+    failing: tuple = None
+    min_cloud: int = 0
+
+    def fires_on(self, answer) -> bool:
+        """Condition check on a raw answer (ignores the cloud gate)"""
+        if self.failing is not None:
+            return answer in self.failing
+        return answer not in self.passing
+
+# Order matters: findings, gaps and recommendations are reported in this order
+RULES = (
+    # Phase 1: Governance & Scope
+    Rule('GOV-01', 'governance', 'sector', 3,
+         failing=("Unknown", "Not applicable"),
+         gap="NIS2/DORA: Sector classification unclear",
+         recommendation="Determine if organization qualifies as Essential/Important Entity (NIS2) or Financial Entity (DORA)"),
+    Rule('GOV-02', 'governance', 'risk_framework', 8,
+         passing=("Yes, documented and tested",),
+         finding="No mature ICT risk management framework in place",
+         gap="NIS2 Art. 21 / DORA Art. 6: ICT risk management framework missing",
+         recommendation="Establish documented ICT risk management framework covering identification, protection, detection, response, recovery"),
+    Rule('GOV-03', 'governance', 'board_oversight', 4,
+         passing=("Yes, quarterly reviews",),
+         finding="Insufficient board-level oversight of ICT and cyber risks",
+         gap="NIS2 Art. 20 / DORA Art. 5: Management body accountability",
+         recommendation="Establish quarterly board reporting on ICT risks, incidents, and resilience metrics"),
+    Rule('GOV-04', 'governance', 'cloud_governance', 3,
+         passing=("Yes, formalized",), min_cloud=2,
+         finding="Significant cloud usage ({cloud_count} service types) without formalized governance",
+         gap="DORA Art. 28: Cloud service provider governance",
+         recommendation="Implement cloud governance framework: inventory, risk assessment, contractual controls, exit strategies"),
+
+    # Phase 2: Logging & Monitoring
+    Rule('LOG-01', 'logging', 'centralized_logging', 6,
+         passing=("Yes, SIEM deployed",),
+         finding="Logs not centralized in SIEM/log management platform",
+         gap="NIS2 Art. 21: Log collection and monitoring",
+         recommendation="Deploy SIEM solution (Splunk, ELK, Sentinel) for centralized log collection and correlation"),
+    Rule('LOG-02', 'logging', 'log_retention', 6,
+         passing=("18-24 months", "24+ months"),
+         finding="Log retention ({answer}) below regulatory minimum (18 months)",
+         gap="NIS2: 18-month minimum retention for audit logs",
+         recommendation="CRITICAL: Extend log retention to minimum 18 months for all security-relevant logs"),
+    Rule('LOG-03', 'logging', 'log_integrity', 4,
+         passing=("Yes, automated verification",),
+         finding="Log integrity not cryptographically verified",
+         gap="NIS2/DORA: Log tamper-evidence for audit purposes",
+         recommendation="Implement automated log hashing (SHA-256) with secure hash storage and periodic verification"),
+    Rule('LOG-04', 'logging', 'cloud_logs_integrated', 3,
+         passing=("Yes, all sources",), min_cloud=1,
+         finding="Cloud platform logs not fully integrated into central monitoring",
+         recommendation="Integrate all cloud provider logs (AWS CloudTrail, Azure Monitor, GCP Cloud Logging) into SIEM"),
+    Rule('LOG-05', 'logging', 'realtime_monitoring', 2,
+         passing=("Yes, 24/7 SOC",),
+         finding="No 24/7 security monitoring capability",
+         recommendation="Establish 24/7 SOC or engage managed detection and response (MDR) provider"),
+
+    # Phase 3: ICT Third-Party Risk
+    Rule('TPR-01', 'third_party', 'vendor_inventory', 5,
+         passing=("Yes, complete and current",),
+         finding="ICT third-party inventory incomplete or outdated",
+         gap="DORA Art. 28: Register of ICT third-party providers",
+         recommendation="Maintain current register of all ICT third-party providers with criticality classification"),
+    Rule('TPR-02', 'third_party', 'audit_rights', 5,
+         passing=("Yes, in all critical contracts",),
+         finding="Right-to-audit clauses missing in critical vendor contracts",
+         gap="DORA Art. 30: Contractual audit and access rights",
+         recommendation="Negotiate right-to-audit, security testing rights, and access to SOC 2/ISO certifications in all critical contracts"),
+    Rule('TPR-03', 'third_party', 'incident_notification_sla', 4,
+         passing=("24 hours", "12 hours"),
+         finding="Vendor incident notification SLAs inadequate or undefined",
+         gap="DORA Art. 19: Incident reporting by ICT providers",
+         recommendation="Require 24-hour notification for security incidents in all critical vendor contracts"),
+    Rule('TPR-04', 'third_party', 'cloud_exit_plan', 4,
+         passing=("Yes, tested annually",), min_cloud=1,
+         finding="Cloud exit/portability strategies not tested",
+         gap="DORA Art. 28: Exit strategies for critical cloud providers",
+         recommendation="Develop and test annual cloud exit plans: data portability, alternative CSPs, 90-day transition timeline"),
+    Rule('TPR-05', 'third_party', 'supply_chain_monitoring', 3,
+         passing=("Yes, continuous assessment",),
+         finding="No continuous monitoring of third-party security posture",
+         recommendation="Deploy third-party risk monitoring platform (BitSight, SecurityScorecard, Prevalent) for continuous assessment"),
+
+    # Phase 4: Incident & Resilience
+    Rule('INC-01', 'incident', 'incident_process', 6,
+         passing=("Yes, documented and tested",),
+         finding="Incident response process not mature",
+         gap="NIS2 Art. 23: Incident handling and reporting",
+         recommendation="Establish documented incident response plan with quarterly tabletop exercises"),
+    Rule('INC-02', 'incident', '24h_reporting', 6,
+         passing=("Yes, process established",),
+         finding="Cannot meet 24-hour initial incident notification requirement",
+         gap="NIS2 Art. 23: 24-hour early warning, 72-hour notification deadlines",
+         recommendation="CRITICAL: Establish 24/7 incident detection and 24-hour reporting capability to authorities"),
+    Rule('INC-03', 'incident', 'resilience_testing', 4,
+         passing=("Quarterly", "Bi-annually"),
+         finding="Insufficient resilience and recovery testing frequency",
+         gap="DORA Art. 24: ICT resilience testing",
+         recommendation="Conduct resilience testing at least bi-annually: disaster recovery, incident response, threat-led penetration testing (TLPT)"),
+    Rule('INC-04', 'incident', 'rto_rpo_defined', 2,
+         passing=("Yes, for all critical systems",),
+         finding="Recovery time/point objectives not defined for all critical systems",
+         recommendation="Define and document RTO/RPO for all critical ICT systems and applications"),
+    Rule('INC-05', 'incident', 'cloud_incident_integration', 2,
+         passing=("Yes",), min_cloud=1,
+         finding="Cloud provider incidents not integrated into organizational incident response",
+         recommendation="Integrate cloud provider incident notifications into organizational incident management workflow"),
+)
+
+RULE_IDS = tuple(rule.rule_id for rule in RULES)
+
+def rules_fingerprint() -> str:
+    """Stable hash of the rule table and vocabulary (detects stale artefacts)"""
+    import hashlib  # only the table build/load needs it
+    payload = repr((RULES, sorted(QUESTIONS.items())))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+# -----------------------------
+# Compiled Tables
+# -----------------------------
+
+def _compile_penalties(rule: Rule) -> tuple:
+    """Penalty per option code of the rule's question (last code = OTHER)"""
+    options = QUESTIONS[rule.question]
+    penalties = [rule.penalty if rule.fires_on(option) else 0 for option in options]
+    # Any answer outside the vocabulary only fails a `passing` condition
+    penalties.append(rule.penalty if rule.failing is None else 0)
+    return tuple(penalties)
+
+# RULE_PENALTIES[i][code] = points deducted by RULES[i] for that option code
+RULE_PENALTIES = tuple(_compile_penalties(rule) for rule in RULES)
+
+# domain -> indices into RULES, in report order
+DOMAIN_RULES = {
+    domain: tuple(i for i, rule in enumerate(RULES) if rule.domain == domain)
+    for domain in DOMAIN_KEYS
+}
+
+# Rules whose texts need formatting with the answer / cloud count
+TEMPLATED_RULES = frozenset(
+    i for i, rule in enumerate(RULES)
+    if any('{' in text for text in (rule.finding, rule.gap, rule.recommendation) if text)
+)
+
+# -----------------------------
+# Evaluation
+# -----------------------------
+
+def rule_fires(i: int, data: dict) -> bool:
+    """Whether RULES[i] deducts points for an answer dict"""
+    rule = RULES[i]
+    return len(data.get('cloud_usage', [])) >= rule.min_cloud and \
+        RULE_PENALTIES[i][option_index(rule.question, data.get(rule.question))] > 0
+
+def fired_rules(data: dict, domain: str = None) -> list:
+    """Indices into RULES of the deductions that fire for an answer dict"""
+    indices = DOMAIN_RULES[domain] if domain else range(len(RULES))
+    return [i for i in indices if rule_fires(i, data)]
+
+def format_rule_texts(i: int, answer=None, cloud_count: int = 0) -> tuple:
+    """(finding, gap, recommendation) of RULES[i], templates filled in"""
+    rule = RULES[i]
+    if i not in TEMPLATED_RULES:
+        return rule.finding, rule.gap, rule.recommendation
+    return tuple(text.format(answer=answer, cloud_count=cloud_count) if text else text
+                 for text in (rule.finding, rule.gap, rule.recommendation))
+
+def rule_mask(data: dict) -> int:
+    """Fired-rule bitmask of an answer dict (bit i = RULES[i])"""
+    mask = 0
+    for i in fired_rules(data):
+        mask |= 1 << i
+    return mask
+
+def mask_rule_ids(mask: int) -> list:
+    """Rule IDs set in a fired-rule bitmask, in rule order"""
+    return [rule_id for i, rule_id in enumerate(RULE_IDS) if mask >> i & 1]
+
+def rule_texts(i: int, data: dict) -> tuple:
+    """(finding, gap, recommendation) of RULES[i] for an answer dict"""
+    if i not in TEMPLATED_RULES:
+        rule = RULES[i]
+        return rule.finding, rule.gap, rule.recommendation
+    return format_rule_texts(i, data.get(RULES[i].question), len(data.get('cloud_usage', [])))
+
+def evaluate_domain_masked(domain: str, data: dict) -> tuple:
+    """evaluate_domain() plus the domain's fired-rule bits: (score, findings, recs, gaps, mask)"""
+    score = DOMAIN_MAX_SCORE
+    findings = []
+    recs = []
+    gaps = []
+    mask = 0
+
+    for i in fired_rules(data, domain):
+        score -= RULES[i].penalty
+        mask |= 1 << i
+        finding, gap, rec = rule_texts(i, data)
+        if finding:
+            findings.append(finding)
+        if gap:
+            gaps.append(gap)
+        if rec:
+            recs.append(rec)
+
+    return score, findings, recs, gaps, mask
+
+def evaluate_domain(domain: str, data: dict) -> tuple:
+    """Score one domain by table lookup: (score, findings, recs, gaps)"""
+    return evaluate_domain_masked(domain, data)[:4]
@@ -0,0 +1,127 @@
+# engine/scoring.py - EU Digital Resilience Toolkit
+# Domain scoring and risk classification (NIS2 + DORA)
+# The deductions themselves are data: see RULES in engine/rules.py
+
+from datetime import datetime
+
+from .models import AssessmentResult
+from .rules import evaluate_domain, rule_mask as compute_rule_mask
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M UTC"
+
+# Every value calculate_risk_level can return, best first
+RISK_LEVELS = ("LOW", "MEDIUM", "HIGH")
+
+def calculate_risk_level(score: int) -> str:
+    """Risk classification based on total score"""
+    if score >= 85:
+        return "LOW"
+    elif score >= 65:
+        return "MEDIUM"
+    else:
+        return "HIGH"
+
+def assess_governance(data: dict) -> tuple:
+    """Phase 1: Governance & Scope - 25 points
+    
+    Detailed scoring:
+    - Sector classification: 5 pts
+    - ICT risk framework: 10 pts
+    - Board oversight: 5 pts
+    - Cloud governance: 5 pts
+    """
+    return evaluate_domain('governance', data)
+
+def assess_logging(data: dict) -> tuple:
+    """Phase 2: Logging & Monitoring - 25 points
+    
+    Detailed scoring:
+    - Centralized logging: 7 pts
+    - Log retention: 7 pts
+    - Log integrity: 5 pts
+    - Cloud log integration: 3 pts
+    - Real-time monitoring: 3 pts
+    """
+    return evaluate_domain('logging', data)
+
+def assess_third_party(data: dict) -> tuple:
+    """Phase 3: ICT Third-Party Risk - 25 points
+    
+    Detailed scoring:
+    - Vendor inventory: 6 pts
+    - Audit rights: 6 pts
+    - Incident notification SLA: 5 pts
+    - Cloud exit strategies: 4 pts
+    - Supply chain monitoring: 4 pts
+    """
+    return evaluate_domain('third_party', data)
+
+def assess_incident(data: dict) -> tuple:
+    """Phase 4: Incident & Resilience - 25 points
+    
+    Detailed scoring:
+    - Incident response process: 7 pts
+    - 24h reporting capability: 7 pts
+    - Resilience testing: 5 pts
+    - RTO/RPO defined: 3 pts
+    - Cloud incident integration: 3 pts
+    """
+    return evaluate_domain('incident', data)
+
+# -----------------------------
+# Full Assessment
+# -----------------------------
+
+# Domain label (as used in regulatory_gaps) and scorer, in report order
+DOMAINS = (
+    ('Governance & Scope', assess_governance),
+    ('Logging & Monitoring', assess_logging),
+    ('ICT Third-Party Risk', assess_third_party),
+    ('Incident & Resilience', assess_incident),
+)
+
+def build_result(data: dict, domain_results: list, timestamp: str = None,
+                 rule_mask: int = None, domain_masks: list = None) -> AssessmentResult:
+    """Combine the four (score, findings, recs, gaps) tuples into an AssessmentResult
+    
+    rule_mask is computed from `data` unless the caller already has it, or
+    has the four per-domain fired-rule masks (cached_assess_masked), which
+    are OR-ed together.
+    """
+    if rule_mask is None:
+        if domain_masks is None:
+            rule_mask = compute_rule_mask(data)
+        else:
+            rule_mask = 0
+            for mask in domain_masks:
+                rule_mask |= mask
+    
+    (gov_score, gov_findings, gov_recs, gov_gaps), \
+        (log_score, log_findings, log_recs, log_gaps), \
+        (tp_score, tp_findings, tp_recs, tp_gaps), \
+        (inc_score, inc_findings, inc_recs, inc_gaps) = domain_results
+    
+    total_score = gov_score + log_score + tp_score + inc_score
+    
+    return AssessmentResult(
+        timestamp=timestamp or datetime.now().strftime(TIMESTAMP_FORMAT),
+        sector=data.get('sector', 'Unknown'),
+        scope=data.get('scope', 'Unknown'),
+        governance_score=gov_score,
+        logging_score=log_score,
+        third_party_score=tp_score,
+        incident_score=inc_score,
+        total_score=total_score,
+        risk_level=calculate_risk_level(total_score),
+        findings=gov_findings + log_findings + tp_findings + inc_findings,
+        recommendations=gov_recs + log_recs + tp_recs + inc_recs,
+        regulatory_gaps={
+            label: domain_gaps
+            for (label, _), (_, _, _, domain_gaps) in zip(DOMAINS, domain_results)
+        },
+        rule_mask=rule_mask
+    )
+
+def assess(data: dict, timestamp: str = None) -> AssessmentResult:
+    """Run all four domain assessments on one answer dict"""
+    return build_result(data, [scorer(data) for _, scorer in DOMAINS], timestamp)
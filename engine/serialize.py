@@ -0,0 +1,240 @@
+# engine/serialize.py - EU Digital Resilience Toolkit
+# Versioned JSON / NDJSON export of assessment results
+#
+# Document (one per result, keys always in this order):
+#   {"schema": "eu-resilience-assessment", "schema_version": 1,
+#    "entity_id": ..., "timestamp": ..., "sector": ..., "scope": ...,
+#    "risk_level": ..., "scores": {"total", "governance", "logging",
+#    "third_party", "incident"}, "rule_mask": ..., "rule_ids": [...],
+#    "findings": [...], "recommendations": [...],
+#    "regulatory_gaps": {domain label: [...]}, "answers": {...} | null}
+#
+# The shape is fixed, so the built-in path writes the document from
+# pre-encoded key fragments instead of reflecting over the dataclass.
+# Findings, recommendations and gaps come from the rule catalog and
+# repeat across results, so their JSON encoding is memoized. With orjson
+# installed, to_json_bytes() uses it instead. Both produce the same
+# compact bytes because only strings, lists, null and integers reach
+# either encoder: answers are normalised first (keys and scalar values
+# become strings, lists become lists of strings), and so are entity_id,
+# timestamp, sector and scope. A numeric entity_id 42 is exported as "42".
+
+import json
+from json.encoder import encode_basestring
+from typing import Iterable, Iterator
+
+from .models import AssessmentResult
+from .rules import mask_rule_ids
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+SCHEMA_NAME = 'eu-resilience-assessment'
+SCHEMA_VERSION = 1
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Cap on memoized encodings (catalog texts number in the hundreds)
+_MAX_MEMO = 4096
+_memo = {}
+
+_encode_answers = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+def _scalar(value):
+    """str or None (floats and big ints encode differently per backend)"""
+    return value if value is None or type(value) is str else str(value)
+
+def normalize_answers(answers: dict) -> dict:
+    """Answers as exported: string keys, values str, list of str or None"""
+    if answers is None:
+        return None
+    normalized = {}
+    for key, value in answers.items():
+        kind = type(value)
+        if kind is list or kind is tuple:
+            value = [item if type(item) is str else _scalar(item) for item in value]
+        elif kind is not str and value is not None:
+            value = str(value)
+        normalized[key if type(key) is str else str(key)] = value
+    return normalized
+
+def result_document(result: AssessmentResult, entity_id: str = None, answers: dict = None) -> dict:
+    """The export document of a result as a plain dict"""
+    return {
+        'schema': SCHEMA_NAME,
+        'schema_version': SCHEMA_VERSION,
+        'entity_id': _scalar(entity_id),
+        'timestamp': _scalar(result.timestamp),
+        'sector': _scalar(result.sector),
+        'scope': _scalar(result.scope),
+        'risk_level': result.risk_level,
+        'scores': {
+            'total': result.total_score,
+            'governance': result.governance_score,
+            'logging': result.logging_score,
+            'third_party': result.third_party_score,
+            'incident': result.incident_score,
+        },
+        'rule_mask': result.rule_mask,
+        'rule_ids': mask_rule_ids(result.rule_mask),
+        'findings': result.findings,
+        'recommendations': result.recommendations,
+        'regulatory_gaps': result.regulatory_gaps,
+        'answers': normalize_answers(answers),
+    }
+
+# -----------------------------
+# Built-in Serializer
+# -----------------------------
+
+def _text(value: str) -> str:
+    """JSON string literal, memoized for repeated catalog texts"""
+    encoded = _memo.get(value)
+    if encoded is None:
+        encoded = encode_basestring(value)
+        if len(_memo) < _MAX_MEMO:
+            _memo[value] = encoded
+    return encoded
+
+def _value(value) -> str:
+    """JSON of a field that is normally a string (None -> null, like orjson)"""
+    return 'null' if value is None else encode_basestring(_scalar(value))
+
+def _texts(values: list) -> str:
+    return '[' + ','.join([_text(value) for value in values]) + ']'
+
+_HEADER = f'{{"schema":{encode_basestring(SCHEMA_NAME)},"schema_version":{SCHEMA_VERSION},"entity_id":'
+
+def to_json(result: AssessmentResult, entity_id: str = None, answers: dict = None, indent: int = None) -> str:
+    """One export document as a JSON string (compact unless `indent` is given)"""
+    if indent is not None:
+        return json.dumps(result_document(result, entity_id, answers), indent=indent, ensure_ascii=False)
+    return ''.join((
+        _HEADER, _value(entity_id),
+        ',"timestamp":', _value(result.timestamp),
+        ',"sector":', _value(result.sector),
+        ',"scope":', _value(result.scope),
+        ',"risk_level":', _text(result.risk_level),
+        ',"scores":{"total":', str(result.total_score),
+        ',"governance":', str(result.governance_score),
+        ',"logging":', str(result.logging_score),
+        ',"third_party":', str(result.third_party_score),
+        ',"incident":', str(result.incident_score),
+        '},"rule_mask":', str(result.rule_mask),
+        ',"rule_ids":', _texts(mask_rule_ids(result.rule_mask)),
+        ',"findings":', _texts(result.findings),
+        ',"recommendations":', _texts(result.recommendations),
+        ',"regulatory_gaps":{', ','.join([_text(group) + ':' + _texts(gaps)
+                                           for group, gaps in result.regulatory_gaps.items()]),
+        '},"answers":', 'null' if answers is None else _encode_answers(normalize_answers(answers)),
+        '}',
+    ))
+
+def to_json_bytes(result: AssessmentResult, entity_id: str = None, answers: dict = None) -> bytes:
+    """Compact UTF-8 export document, via orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(result_document(result, entity_id, answers))
+    return to_json(result, entity_id, answers).encode('utf-8')
+
+# -----------------------------
+# Reading
+# -----------------------------
+
+def load_result(document) -> tuple:
+    """(entity_id, AssessmentResult, answers) from a document (dict, str or bytes)"""
+    if isinstance(document, (str, bytes)):
+        document = orjson.loads(document) if orjson is not None else json.loads(document)
+    if document.get('schema') != SCHEMA_NAME:
+        raise ValueError(f"Not an assessment export: schema {document.get('schema')!r}")
+    version = document.get('schema_version')
+    if not isinstance(version, int) or version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported schema_version {version!r} (this version reads up to {SCHEMA_VERSION})")
+    scores = document['scores']
+    result = AssessmentResult(
+        timestamp=document['timestamp'],
+        sector=document['sector'],
+        scope=document['scope'],
+        governance_score=scores['governance'],
+        logging_score=scores['logging'],
+        third_party_score=scores['third_party'],
+        incident_score=scores['incident'],
+        total_score=scores['total'],
+        risk_level=document['risk_level'],
+        findings=document['findings'],
+        recommendations=document['recommendations'],
+        regulatory_gaps=document['regulatory_gaps'],
+        rule_mask=document['rule_mask'],
+    )
+    return document['entity_id'], result, document['answers']
+
+def iter_ndjson(path) -> Iterator[tuple]:
+    """(entity_id, result, answers) per non-empty line of an NDJSON export"""
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield load_result(line)
+
+# -----------------------------
+# Writing
+# -----------------------------
+
+class NDJSONWriter:
+    """Appends one document per line to an NDJSON file (append=False truncates)"""
+
+    def __init__(self, path, append: bool = True):
+        self.count = 0
+        self._file = open(path, 'ab' if append else 'wb')
+
+    def write(self, result: AssessmentResult, entity_id: str = None, answers: dict = None):
+        self.write_line(to_json_bytes(result, entity_id, answers))
+
+    def write_line(self, line: bytes):
+        """Append an already-encoded document (e.g. from a worker process)"""
+        self._file.write(line + b'\n')
+        self.count += 1
+
+    def write_many(self, items: Iterable[tuple]) -> int:
+        """Append (entity_id, result, answers) items; returns how many"""
+        before = self.count
+        for entity_id, result, answers in items:
+            self.write(result, entity_id, answers)
+        return self.count - before
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JSONArrayWriter:
+    """Streams documents into a JSON array file, one document per line"""
+
+    def __init__(self, path):
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(b'[')
+
+    def write(self, result: AssessmentResult, entity_id: str = None, answers: dict = None):
+        self.write_line(to_json_bytes(result, entity_id, answers))
+
+    def write_line(self, line: bytes):
+        self._file.write((b',\n' if self.count else b'\n') + line)
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.write(b'\n]\n')
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
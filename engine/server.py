@@ -0,0 +1,261 @@
+# engine/server.py - EU Digital Resilience Toolkit
+# Local JSON-over-HTTP scoring service (asyncio, standard library only)
+#
+# Endpoints:
+#   POST /score            body: one answer dict, or a list of them
+#                          ?include=text,csv adds generate_text_report /
+#                          generate_csv_export output to every result
+#   GET  /metrics/latency  latency histogram per endpoint
+#   GET  /health
+#
+# Invalid JSON, bad value types or a bad Content-Length get a 400; any
+# other failure while handling a request gets a JSON 500.
+#
+# Parsing, validation, scoring and encoding of a /score body all happen
+# in a worker process, so a 16 MB batch never blocks the event loop.
+# Small bodies holding a single answer object are scored inline: one
+# assessment is cheaper than the round trip to the pool.
+#
+# Usage:
+#   python -m engine serve --port 8600 --workers 4
+
+import asyncio
+import json
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from .reports import generate_text_report, generate_csv_export
+from .scoring import assess
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH = 10000
+# Single answer objects up to this size are scored on the event loop
+INLINE_BODY_BYTES = 64 * 1024
+
+ROUTES = ('/score', '/metrics/latency', '/health')
+
+# Upper bounds of the latency buckets, in milliseconds (last bucket: +Inf)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+    def __reduce__(self):
+        # Raised in worker processes: keep the status through pickling
+        return HTTPError, (self.status, str(self))
+
+# -----------------------------
+# Payload Validation
+# -----------------------------
+
+def clean_answers(record: dict, position: int = None) -> dict:
+    """Answer object with checked value types (raises HTTPError 400)
+
+    cloud_usage must be a list of strings (null counts as not answered);
+    every other answer must be a string or null.
+    """
+    where = f" in record {position}" if position is not None else ""
+    answers = {}
+    for key, value in record.items():
+        if key == 'cloud_usage':
+            if value is None:
+                continue
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"cloud_usage must be a list of strings{where}")
+        elif value is not None and not isinstance(value, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{key} must be a string or null{where}")
+        answers[key] = value
+    return answers
+
+def parse_payload(body: bytes):
+    """Answer dict, or list of them, from a /score body (raises HTTPError)"""
+    try:
+        payload = json.loads(body or b'null')
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON")
+    if isinstance(payload, dict):
+        return clean_answers(payload)
+    if isinstance(payload, list) and all(isinstance(item, dict) for item in payload):
+        if len(payload) > MAX_BATCH:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"At most {MAX_BATCH} records per batch")
+        return [clean_answers(item, n) for n, item in enumerate(payload)]
+    raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected an answer object or a list of answer objects")
+
+def encode_json(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+# -----------------------------
+# Scoring (runs in worker processes)
+# -----------------------------
+
+def score_records(records: list, include: tuple = ()) -> list:
+    """Score answer dicts and serialise the results as plain dicts"""
+    out = []
+    for data in records:
+        result = assess(data)
+        item = asdict(result)
+        if 'text' in include:
+            item['text_report'] = generate_text_report(result)
+        if 'csv' in include:
+            item['csv_export'] = generate_csv_export(result)
+        out.append(item)
+    return out
+
+def score_body(body: bytes, include: tuple = ()) -> bytes:
+    """Parse, validate, score and encode a whole /score request body"""
+    payload = parse_payload(body)
+    if isinstance(payload, dict):
+        return encode_json(score_records([payload], include)[0])
+    return encode_json({'results': score_records(payload, include)})
+
+# -----------------------------
+# Metrics
+# -----------------------------
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (per-bucket counts, not cumulative)"""
+
+    def __init__(self, buckets_ms: tuple = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        self.counts[bisect_left(self.buckets_ms, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}ms" for b in self.buckets_ms] + ['le_inf']
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+# -----------------------------
+# HTTP Server
+# -----------------------------
+
+class ScoringServer:
+    """Minimal HTTP/1.1 server (keep-alive, JSON bodies) around the engine"""
+
+    def __init__(self, workers: int = None, max_concurrency: int = 64):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.max_concurrency = max_concurrency
+        self.semaphore = None  # created on the running loop
+        self.latency = {}
+
+    async def _score(self, body: bytes, include: tuple) -> bytes:
+        if len(body) <= INLINE_BODY_BYTES and body.lstrip()[:1] == b'{':
+            return score_body(body, include)
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            return await loop.run_in_executor(self.executor, score_body, body, include)
+
+    async def route(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        if url.path == '/score':
+            if method != 'POST':
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            include = tuple(
+                part for value in parse_qs(url.query).get('include', []) for part in value.split(',')
+            )
+            return await self._score(body, include)
+        if url.path == '/metrics/latency':
+            return {path: hist.to_dict() for path, hist in self.latency.items()}
+        if url.path == '/health':
+            return {'status': 'ok'}
+        raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                started = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    try:
+                        length = int(headers.get('content-length') or 0)
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        # Body framing is unknown: answer, then drop the connection
+                        keep_alive = False
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length header")
+                    if length > MAX_BODY_BYTES:
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = HTTPStatus.OK, await self.route(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                    keep_alive = keep_alive and e.status != HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {'error': f"{status.phrase}: {type(e).__name__}"}
+
+                # /score bodies arrive encoded from the workers
+                data = payload if isinstance(payload, bytes) else encode_json(payload)
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+
+                path = urlsplit(target).path
+                path = path if path in ROUTES else 'other'
+                self.latency.setdefault(path, LatencyHistogram()).observe(
+                    (time.perf_counter() - started) * 1000
+                )
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8600) -> asyncio.AbstractServer:
+        """Listen on host:port (0 picks a free port); returns the asyncio server"""
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8600):
+        server = await self.start(host, port)
+        print(f"Scoring service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+def run(host: str = '127.0.0.1', port: int = 8600, workers: int = None, max_concurrency: int = 64):
+    server = ScoringServer(workers, max_concurrency)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(cancel_futures=True)
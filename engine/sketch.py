@@ -0,0 +1,112 @@
+# engine/sketch.py - EU Digital Resilience Toolkit
+# Mergeable quantile sketches for assessment scores
+#
+# Scores are small bounded integers (domains 0-25, total 0-100), so a
+# sketch keeps one counter per possible score instead of sampled
+# centroids (t-digest) or compactors (KLL). Error bounds: none - every
+# quantile is exact (rank error 0) and merging is plain addition, at a
+# fixed size of 26 or 101 counters however many scores are added. A
+# t-digest over the same stream would be larger and only approximate.
+#
+# Quantile definition (nearest rank): the smallest score s such that at
+# least ceil(q * n) of the n scores are <= s; q=0 gives the minimum.
+
+import math
+
+from .questions import DOMAIN_KEYS
+from .rules import DOMAIN_MAX_SCORE
+
+# Sketched score fields of a result, and their maximum value
+SCORE_KEYS = DOMAIN_KEYS + ('total',)
+SCORE_MAX = dict(dict.fromkeys(DOMAIN_KEYS, DOMAIN_MAX_SCORE), total=DOMAIN_MAX_SCORE * len(DOMAIN_KEYS))
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+def histogram_quantile(counts: list, q: float):
+    """Nearest-rank quantile of a score histogram (counts[score] = n); None if empty"""
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+    n = sum(counts)
+    if not n:
+        return None
+    rank = max(1, math.ceil(q * n))
+    seen = 0
+    for score, count in enumerate(counts):
+        seen += count
+        if seen >= rank:
+            return score
+
+class ScoreSketch:
+    """Exact, mergeable quantile summary of integer scores in 0..max_value"""
+
+    __slots__ = ('max_value', 'counts')
+
+    def __init__(self, max_value: int):
+        self.max_value = max_value
+        self.counts = [0] * (max_value + 1)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def add(self, score: int, n: int = 1):
+        self.counts[score] += n
+
+    def merge(self, other: 'ScoreSketch') -> 'ScoreSketch':
+        """Add another sketch of the same range into this one; returns self"""
+        if other.max_value != self.max_value:
+            raise ValueError(f"Cannot merge sketches of range 0-{self.max_value} and 0-{other.max_value}")
+        counts = self.counts
+        for score, n in enumerate(other.counts):
+            counts[score] += n
+        return self
+
+    def quantile(self, q: float):
+        return histogram_quantile(self.counts, q)
+
+    def quantiles(self, qs: tuple = DEFAULT_QUANTILES) -> list:
+        return [self.quantile(q) for q in qs]
+
+    def __eq__(self, other):
+        if not isinstance(other, ScoreSketch):
+            return NotImplemented
+        return self.max_value == other.max_value and self.counts == other.counts
+
+    def __repr__(self):
+        return f"ScoreSketch(max_value={self.max_value}, count={self.count})"
+
+    def to_dict(self) -> dict:
+        """Sparse JSON-friendly form: only scores that occurred"""
+        return {
+            'max_value': self.max_value,
+            'counts': {str(score): n for score, n in enumerate(self.counts) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> 'ScoreSketch':
+        sketch = cls(payload['max_value'])
+        for score, n in payload['counts'].items():
+            sketch.counts[int(score)] = n
+        return sketch
+
+# -----------------------------
+# Per-Result Sketch Sets
+# -----------------------------
+
+def new_sketches() -> dict:
+    """One empty sketch per SCORE_KEYS field"""
+    return {key: ScoreSketch(SCORE_MAX[key]) for key in SCORE_KEYS}
+
+def add_result(sketches: dict, result):
+    """Add the domain scores and total of one result to a sketch set"""
+    sketches['governance'].counts[result.governance_score] += 1
+    sketches['logging'].counts[result.logging_score] += 1
+    sketches['third_party'].counts[result.third_party_score] += 1
+    sketches['incident'].counts[result.incident_score] += 1
+    sketches['total'].counts[result.total_score] += 1
+
+def merge_sketches(sketches: dict, other: dict) -> dict:
+    """Merge sketch set `other` into `sketches`; returns `sketches`"""
+    for key, sketch in other.items():
+        sketches[key].merge(sketch)
+    return sketches
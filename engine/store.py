@@ -0,0 +1,519 @@
+# engine/store.py - EU Digital Resilience Toolkit
+# Persistent result history on SQLite (WAL mode)
+#
+# One row per assessment: identification, scores, rule_mask, the report
+# texts and the raw answers (JSON). Each entry of a multi-scope result
+# ('NIS2 Essential Entity, DORA Financial Entity') also gets a row in
+# assessment_scopes, so single-scope filters use an index instead of LIKE.
+#
+# Timestamps use TIMESTAMP_FORMAT ('2025-01-31 09:00 UTC'), which sorts
+# chronologically as text, so since/until filters are index range scans.
+#
+# Trend rollups (count, score sums, min/max per quarter x sector x risk
+# level, and per entity x quarter) are maintained in the same transaction
+# as every insert: each batch is folded into per-group deltas in Python
+# and applied with one UPSERT executemany, so trend queries read a few
+# rollup rows instead of scanning the history.
+
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator
+
+from .models import AssessmentResult
+from .questions import scope_entries
+from .scoring import RISK_LEVELS
+
+DEFAULT_STORE_PATH = os.environ.get('RESILIENCE_STORE', 'assessments.db')
+SCHEMA_VERSION = 2
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    entity_id TEXT,
+    timestamp TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    governance_score INTEGER NOT NULL,
+    logging_score INTEGER NOT NULL,
+    third_party_score INTEGER NOT NULL,
+    incident_score INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    risk_level TEXT NOT NULL,
+    rule_mask INTEGER NOT NULL,
+    findings TEXT NOT NULL,
+    recommendations TEXT NOT NULL,
+    regulatory_gaps TEXT NOT NULL,
+    answers TEXT
+);
+CREATE TABLE IF NOT EXISTS assessment_scopes (
+    assessment_id INTEGER NOT NULL REFERENCES assessments(id) ON DELETE CASCADE,
+    scope TEXT NOT NULL,
+    PRIMARY KEY (scope, assessment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_assessments_sector ON assessments(sector, timestamp);
+CREATE INDEX IF NOT EXISTS idx_assessments_scope ON assessments(scope, timestamp);
+CREATE INDEX IF NOT EXISTS idx_assessments_timestamp ON assessments(timestamp);
+CREATE INDEX IF NOT EXISTS idx_assessments_risk_level ON assessments(risk_level, timestamp);
+CREATE INDEX IF NOT EXISTS idx_assessments_entity ON assessments(entity_id, timestamp);
+CREATE TABLE IF NOT EXISTS rollup_sector_quarter (
+    sector TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    sum_total INTEGER NOT NULL,
+    sum_governance INTEGER NOT NULL,
+    sum_logging INTEGER NOT NULL,
+    sum_third_party INTEGER NOT NULL,
+    sum_incident INTEGER NOT NULL,
+    min_total INTEGER NOT NULL,
+    max_total INTEGER NOT NULL,
+    PRIMARY KEY (sector, quarter, risk_level)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_entity_quarter (
+    entity_id TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    sum_total INTEGER NOT NULL,
+    sum_governance INTEGER NOT NULL,
+    sum_logging INTEGER NOT NULL,
+    sum_third_party INTEGER NOT NULL,
+    sum_incident INTEGER NOT NULL,
+    min_total INTEGER NOT NULL,
+    max_total INTEGER NOT NULL,
+    last_timestamp TEXT NOT NULL,
+    last_total INTEGER NOT NULL,
+    PRIMARY KEY (entity_id, quarter)
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = (
+    'id', 'entity_id', 'timestamp', 'sector', 'scope',
+    'governance_score', 'logging_score', 'third_party_score', 'incident_score',
+    'total_score', 'risk_level', 'rule_mask',
+    'findings', 'recommendations', 'regulatory_gaps', 'answers',
+)
+
+# Constant SQL text: sqlite3 keeps these compiled in its statement cache
+INSERT_ASSESSMENT = (
+    f"INSERT INTO assessments ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS))})"
+)
+INSERT_SCOPE = "INSERT INTO assessment_scopes (assessment_id, scope) VALUES (?, ?)"
+SELECT_BY_ID = f"SELECT {', '.join(_COLUMNS)} FROM assessments WHERE id = ?"
+SELECT_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM assessments"
+
+SELECT_ENTITY_TIMELINE = (
+    "SELECT entity_id, timestamp, id FROM assessments WHERE entity_id IS NOT NULL "
+    "ORDER BY entity_id, timestamp DESC, id DESC"
+)
+_ID_CHUNK = 500
+
+# Summed score fields: rollup column suffix -> AssessmentResult attribute
+_SUMS = (
+    ('total', 'total_score'),
+    ('governance', 'governance_score'),
+    ('logging', 'logging_score'),
+    ('third_party', 'third_party_score'),
+    ('incident', 'incident_score'),
+)
+# Score columns read back when the rollups are rebuilt from the history
+_ScoreRow = namedtuple('_ScoreRow', ['timestamp', 'sector', 'risk_level'] + [attr for _, attr in _SUMS])
+
+_SUM_COLUMNS = ', '.join(f"sum_{name}" for name, _ in _SUMS)
+_SUM_UPDATES = ', '.join(f"sum_{name} = sum_{name} + excluded.sum_{name}" for name, _ in _SUMS)
+
+UPSERT_SECTOR_ROLLUP = (
+    f"INSERT INTO rollup_sector_quarter (sector, quarter, risk_level, n, {_SUM_COLUMNS}, min_total, max_total) "
+    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    f"ON CONFLICT (sector, quarter, risk_level) DO UPDATE SET n = n + excluded.n, {_SUM_UPDATES}, "
+    f"min_total = MIN(min_total, excluded.min_total), max_total = MAX(max_total, excluded.max_total)"
+)
+# SET expressions all see the old row, so last_total is picked before
+# last_timestamp moves
+UPSERT_ENTITY_ROLLUP = (
+    f"INSERT INTO rollup_entity_quarter (entity_id, quarter, n, {_SUM_COLUMNS}, min_total, max_total, "
+    f"last_timestamp, last_total) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    f"ON CONFLICT (entity_id, quarter) DO UPDATE SET n = n + excluded.n, {_SUM_UPDATES}, "
+    f"min_total = MIN(min_total, excluded.min_total), max_total = MAX(max_total, excluded.max_total), "
+    f"last_total = CASE WHEN excluded.last_timestamp >= last_timestamp "
+    f"THEN excluded.last_total ELSE last_total END, "
+    f"last_timestamp = MAX(last_timestamp, excluded.last_timestamp)"
+)
+SELECT_SECTOR_TREND = (
+    f"SELECT quarter, risk_level, n, {_SUM_COLUMNS}, min_total, max_total FROM rollup_sector_quarter "
+    f"WHERE sector = ? AND quarter >= ? AND quarter <= ? ORDER BY quarter"
+)
+SELECT_PORTFOLIO_TREND = (
+    f"SELECT quarter, risk_level, n, {_SUM_COLUMNS}, min_total, max_total FROM rollup_sector_quarter "
+    f"WHERE quarter >= ? AND quarter <= ? ORDER BY quarter"
+)
+SELECT_ENTITY_TREND = (
+    f"SELECT quarter, n, {_SUM_COLUMNS}, min_total, max_total, last_timestamp, last_total "
+    f"FROM rollup_entity_quarter WHERE entity_id = ? AND quarter >= ? AND quarter <= ? ORDER BY quarter"
+)
+# Bounds used when a trend query has no since/until
+_FIRST_QUARTER, _LAST_QUARTER = '', '~'
+
+# Filter name -> WHERE fragment, in a fixed order so every combination of
+# filters maps to one SQL string
+_FILTERS = (
+    ('entity_id', "a.entity_id = ?"),
+    ('sector', "a.sector = ?"),
+    ('scope', "a.id IN (SELECT assessment_id FROM assessment_scopes WHERE scope = ?)"),
+    ('risk_level', "a.risk_level = ?"),
+    ('since', "a.timestamp >= ?"),
+    ('until', "a.timestamp < ?"),
+)
+
+def quarter_of(timestamp: str) -> str:
+    """Calendar quarter of a TIMESTAMP_FORMAT timestamp ('2025-05-14 09:00 UTC' -> '2025-Q2')"""
+    try:
+        year, month = int(timestamp[:4]), int(timestamp[5:7])
+    except (TypeError, ValueError):
+        return 'unknown'
+    if not 1 <= month <= 12:
+        return 'unknown'
+    return f"{year:04d}-Q{(month - 1) // 3 + 1}"
+
+@dataclass
+class StoredResult:
+    """An assessment read back from the store"""
+    id: int
+    entity_id: str
+    answers: dict
+    result: AssessmentResult
+
+def _row(assessment_id: int, entity_id, answers, result: AssessmentResult) -> tuple:
+    return (
+        assessment_id, entity_id, result.timestamp, result.sector, result.scope,
+        result.governance_score, result.logging_score, result.third_party_score,
+        result.incident_score, result.total_score, result.risk_level, result.rule_mask,
+        json.dumps(result.findings, ensure_ascii=False),
+        json.dumps(result.recommendations, ensure_ascii=False),
+        json.dumps(result.regulatory_gaps, ensure_ascii=False),
+        None if answers is None else json.dumps(answers, ensure_ascii=False),
+    )
+
+def _stored(row: tuple) -> StoredResult:
+    (assessment_id, entity_id, timestamp, sector, scope, gov, log, tp, inc,
+     total, risk_level, rule_mask, findings, recommendations, gaps, answers) = row
+    result = AssessmentResult(
+        timestamp=timestamp,
+        sector=sector,
+        scope=scope,
+        governance_score=gov,
+        logging_score=log,
+        third_party_score=tp,
+        incident_score=inc,
+        total_score=total,
+        risk_level=risk_level,
+        findings=json.loads(findings),
+        recommendations=json.loads(recommendations),
+        regulatory_gaps=json.loads(gaps),
+        rule_mask=rule_mask
+    )
+    return StoredResult(assessment_id, entity_id, None if answers is None else json.loads(answers), result)
+
+# -----------------------------
+# Trend Rollups
+# -----------------------------
+
+def _fold(groups: dict, key: tuple, scores: tuple) -> list:
+    """Add one result's scores to a [n, sums..., min_total, max_total] accumulator"""
+    acc = groups.get(key)
+    if acc is None:
+        acc = groups[key] = [0] * (len(scores) + 1) + [scores[0], scores[0]]
+    acc[0] += 1
+    for i, score in enumerate(scores, 1):
+        acc[i] += score
+    if scores[0] < acc[-2]:
+        acc[-2] = scores[0]
+    if scores[0] > acc[-1]:
+        acc[-1] = scores[0]
+    return acc
+
+def rollup_deltas(items: Iterable[tuple]) -> tuple:
+    """UPSERT parameters (sector rows, entity rows) for (entity_id, result) pairs"""
+    sectors, entities, latest = {}, {}, {}
+    for entity_id, result in items:
+        quarter = quarter_of(result.timestamp)
+        scores = tuple(getattr(result, attr) for _, attr in _SUMS)
+        _fold(sectors, (result.sector, quarter, result.risk_level), scores)
+        if entity_id is not None:
+            key = (entity_id, quarter)
+            _fold(entities, key, scores)
+            if key not in latest or result.timestamp >= latest[key][0]:
+                latest[key] = (result.timestamp, result.total_score)
+    return (
+        [key + tuple(acc) for key, acc in sectors.items()],
+        [key + tuple(acc) + latest[key] for key, acc in entities.items()],
+    )
+
+def _trend_point(quarter: str, n: int, sums: tuple, min_total: int, max_total: int) -> dict:
+    point = {'quarter': quarter, 'count': n}
+    for (name, _), total in zip(_SUMS, sums):
+        point[f"mean_{name}"] = round(total / n, 2)
+    point['min_total'] = min_total
+    point['max_total'] = max_total
+    return point
+
+def _sector_trend(rows: list) -> list:
+    """Combine (quarter, risk level) rollup rows into one point per quarter"""
+    quarters = {}
+    for quarter, risk_level, n, *rest in rows:
+        sums, min_total, max_total = rest[:len(_SUMS)], rest[-2], rest[-1]
+        q = quarters.get(quarter)
+        if q is None:
+            q = quarters[quarter] = [0, [0] * len(_SUMS), min_total, max_total, dict.fromkeys(RISK_LEVELS, 0)]
+        q[0] += n
+        q[1] = [a + b for a, b in zip(q[1], sums)]
+        q[2] = min(q[2], min_total)
+        q[3] = max(q[3], max_total)
+        q[4][risk_level] = q[4].get(risk_level, 0) + n
+    trend = []
+    for quarter, (n, sums, min_total, max_total, risk_levels) in quarters.items():
+        point = _trend_point(quarter, n, sums, min_total, max_total)
+        point['risk_levels'] = risk_levels
+        trend.append(point)
+    return trend
+
+class ResultStore:
+    """SQLite-backed assessment history, safe to share between threads"""
+
+    def __init__(self, path=None):
+        self.path = str(path or DEFAULT_STORE_PATH)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False,
+                                     isolation_level=None, cached_statements=256)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            self._conn.executescript(SCHEMA)
+            if version == 1:
+                # Stores created before the trend rollups existed
+                self._rebuild_rollups()
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def _insert_batch(self, batch: list) -> list:
+        """Insert (entity_id, answers, result) items in one transaction; returns their ids"""
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Ids are assigned here (the write lock is held) so the scope
+            # rows can be inserted with executemany too
+            first = conn.execute(SELECT_MAX_ID).fetchone()[0] + 1
+            ids = range(first, first + len(batch))
+            conn.executemany(INSERT_ASSESSMENT, (
+                _row(assessment_id, entity_id, answers, result)
+                for assessment_id, (entity_id, answers, result) in zip(ids, batch)
+            ))
+            conn.executemany(INSERT_SCOPE, (
+                (assessment_id, scope)
+                for assessment_id, (_, _, result) in zip(ids, batch)
+                for scope in dict.fromkeys(scope_entries(result.scope))
+            ))
+            sector_rows, entity_rows = rollup_deltas(
+                (entity_id, result) for entity_id, _, result in batch
+            )
+            conn.executemany(UPSERT_SECTOR_ROLLUP, sector_rows)
+            conn.executemany(UPSERT_ENTITY_ROLLUP, entity_rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return list(ids)
+
+    def add(self, result: AssessmentResult, answers: dict = None, entity_id: str = None) -> int:
+        """Store one result; returns its id"""
+        with self._lock:
+            return self._insert_batch([(entity_id, answers, result)])[0]
+
+    def add_many(self, items: Iterable[tuple], batch_size: int = BATCH_SIZE) -> int:
+        """Store (entity_id, answers, result) items in batched transactions
+
+        Each batch of `batch_size` items is one executemany per table and one
+        commit. Returns the number of stored results.
+        """
+        items = iter(items)
+        count = 0
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return count
+            with self._lock:
+                self._insert_batch(batch)
+            count += len(batch)
+
+    def _rebuild_rollups(self):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM rollup_sector_quarter")
+            conn.execute("DELETE FROM rollup_entity_quarter")
+            cursor = conn.execute(
+                "SELECT entity_id, timestamp, sector, risk_level, "
+                "total_score, governance_score, logging_score, third_party_score, incident_score "
+                "FROM assessments"
+            )
+            sector_rows, entity_rows = rollup_deltas(
+                (entity_id, _ScoreRow(timestamp, sector, risk_level, *scores))
+                for entity_id, timestamp, sector, risk_level, *scores in cursor
+            )
+            conn.executemany(UPSERT_SECTOR_ROLLUP, sector_rows)
+            conn.executemany(UPSERT_ENTITY_ROLLUP, entity_rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def rebuild_rollups(self):
+        """Recompute the trend rollups from the full history (repair only)"""
+        with self._lock:
+            self._rebuild_rollups()
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+
+    def get(self, assessment_id: int) -> StoredResult:
+        with self._lock:
+            row = self._conn.execute(SELECT_BY_ID, (assessment_id,)).fetchone()
+        return _stored(row) if row else None
+
+    @staticmethod
+    def _where(filters: dict) -> tuple:
+        unknown = set(filters) - {name for name, _ in _FILTERS}
+        if unknown:
+            raise TypeError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+        clauses, params = [], []
+        for name, clause in _FILTERS:
+            value = filters.get(name)
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, limit: int = None, newest_first: bool = False, **filters) -> list:
+        """Stored results matching the filters, in timestamp order
+
+        Filters: entity_id, sector, scope (a single scope entry), risk_level,
+        since (inclusive) and until (exclusive) timestamps.
+        """
+        where, params = self._where(filters)
+        order = 'DESC' if newest_first else 'ASC'
+        sql = (f"SELECT {', '.join('a.' + c for c in _COLUMNS)} FROM assessments a{where} "
+               f"ORDER BY a.timestamp {order}, a.id {order}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_stored(row) for row in rows]
+
+    def iter_query(self, limit: int = None, newest_first: bool = False, **filters) -> Iterator[StoredResult]:
+        """query() as a generator: only the ids are read up front, results in chunks"""
+        where, params = self._where(filters)
+        order = 'DESC' if newest_first else 'ASC'
+        sql = f"SELECT a.id FROM assessments a{where} ORDER BY a.timestamp {order}, a.id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(sql, params)]
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[start:start + _ID_CHUNK]
+            found = self.get_many(chunk)
+            yield from (found[assessment_id] for assessment_id in chunk if assessment_id in found)
+
+    def count(self, **filters) -> int:
+        where, params = self._where(filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM assessments a{where}", params).fetchone()[0]
+
+    def history(self, entity_id: str) -> list:
+        """All stored assessments of one entity, oldest first"""
+        return self.query(entity_id=entity_id)
+
+    def latest(self, n: int = 10, **filters) -> list:
+        """The `n` most recent assessments matching the filters"""
+        return self.query(limit=n, newest_first=True, **filters)
+
+    def get_many(self, ids: list) -> dict:
+        """id -> StoredResult for a list of ids, fetched in chunks"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), _ID_CHUNK):
+                chunk = ids[start:start + _ID_CHUNK]
+                sql = (f"SELECT {', '.join(_COLUMNS)} FROM assessments "
+                       f"WHERE id IN ({', '.join('?' * len(chunk))})")
+                for row in self._conn.execute(sql, chunk):
+                    found[row[0]] = _stored(row)
+        return found
+
+    def latest_pairs(self, by_quarter: bool = True) -> list:
+        """(entity_id, previous, latest) StoredResults for every entity with history
+
+        by_quarter=True compares the latest assessment of each entity's two
+        most recent quarters; False compares its last two assessments.
+        One scan of the entity index, then one batched fetch.
+        """
+        pairs = []
+        with self._lock:
+            current = latest = None
+            for entity_id, timestamp, assessment_id in self._conn.execute(SELECT_ENTITY_TIMELINE):
+                if entity_id != current:
+                    current, latest = entity_id, (timestamp, assessment_id)
+                elif latest is not None and (
+                        not by_quarter or quarter_of(timestamp) != quarter_of(latest[0])):
+                    pairs.append((entity_id, assessment_id, latest[1]))
+                    latest = None
+        found = self.get_many([i for _, before, after in pairs for i in (before, after)])
+        return [(entity_id, found[before], found[after]) for entity_id, before, after in pairs]
+
+    def sector_trend(self, sector: str = None, since: str = None, until: str = None) -> list:
+        """Per-quarter count, mean scores, min/max total and risk mix
+
+        sector=None covers the whole portfolio. since/until are inclusive
+        quarters ('2024-Q1'). Reads only the rollup rows.
+        """
+        bounds = (since or _FIRST_QUARTER, until or _LAST_QUARTER)
+        with self._lock:
+            if sector is None:
+                rows = self._conn.execute(SELECT_PORTFOLIO_TREND, bounds).fetchall()
+            else:
+                rows = self._conn.execute(SELECT_SECTOR_TREND, (sector,) + bounds).fetchall()
+        return _sector_trend(rows)
+
+    def entity_trend(self, entity_id: str, since: str = None, until: str = None) -> list:
+        """Per-quarter scores of one entity, with its latest total in each quarter"""
+        bounds = (since or _FIRST_QUARTER, until or _LAST_QUARTER)
+        with self._lock:
+            rows = self._conn.execute(SELECT_ENTITY_TREND, (entity_id,) + bounds).fetchall()
+        trend = []
+        for quarter, n, *rest in rows:
+            point = _trend_point(quarter, n, rest[:len(_SUMS)], rest[-4], rest[-3])
+            point['last_timestamp'], point['last_total'] = rest[-2], rest[-1]
+            trend.append(point)
+        return trend
@@ -0,0 +1,172 @@
+# engine/table.py - EU Digital Resilience Toolkit
+# Precomputed score tables over the full answer space of each domain
+#
+# Every domain has a handful of questions with small fixed option sets
+# (plus the cloud service count), so its whole answer space fits in a few
+# thousand entries. The build step evaluates the rule table once for every
+# combination; scoring is then one mixed-radix index per domain.
+#
+# Build:  python -m engine.table build <directory>
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .questions import QUESTIONS, DOMAIN_KEYS, DOMAIN_QUESTIONS, MAX_CLOUD_COUNT
+from .rules import RULES, RULE_PENALTIES, DOMAIN_RULES, DOMAIN_MAX_SCORE, rules_fingerprint
+from .vectorized import COLUMNS, CLOUD_COLUMN, RISK_CLASS, encode_matrix
+
+# score: domain score; fired: bit k set when the k-th rule of the domain
+# (DOMAIN_RULES order) fired
+ENTRY_DTYPE = np.dtype([('score', np.uint8), ('fired', np.uint8)])
+
+MANIFEST_NAME = 'manifest.json'
+
+def domain_radices(domain: str) -> list:
+    """Radix of each digit of a domain code: its questions, then cloud count"""
+    return [len(QUESTIONS[q]) + 1 for q in DOMAIN_QUESTIONS[domain]] + [MAX_CLOUD_COUNT + 1]
+
+def _strides(radices: list) -> np.ndarray:
+    """Mixed-radix place values (first digit most significant)"""
+    strides = np.ones(len(radices), dtype=np.int64)
+    for i in range(len(radices) - 2, -1, -1):
+        strides[i] = strides[i + 1] * radices[i + 1]
+    return strides
+
+def _domain_columns(domain: str) -> list:
+    return [COLUMNS.index(q) for q in DOMAIN_QUESTIONS[domain]] + [CLOUD_COLUMN]
+
+# -----------------------------
+# Build
+# -----------------------------
+
+def build_domain_table(domain: str) -> np.ndarray:
+    """Evaluate the domain's rules on every answer combination"""
+    radices = domain_radices(domain)
+    # Row k of `digits` is the answer combination whose code is k
+    digits = np.indices(radices).reshape(len(radices), -1).T
+    questions = DOMAIN_QUESTIONS[domain]
+    cloud = digits[:, -1]
+
+    table = np.zeros(len(digits), dtype=ENTRY_DTYPE)
+    score = np.full(len(digits), DOMAIN_MAX_SCORE, dtype=np.int16)
+    fired = np.zeros(len(digits), dtype=np.uint8)
+
+    for bit, i in enumerate(DOMAIN_RULES[domain]):
+        rule = RULES[i]
+        penalties = np.array(RULE_PENALTIES[i], dtype=np.int16)
+        deduction = penalties[digits[:, questions.index(rule.question)]] * (cloud >= rule.min_cloud)
+        score -= deduction
+        fired |= (deduction > 0).astype(np.uint8) << bit
+
+    table['score'] = score
+    table['fired'] = fired
+    return table
+
+def build_tables(directory) -> Path:
+    """Build every domain table and write it to `directory` as .npy files"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest = {'fingerprint': rules_fingerprint(), 'domains': {}}
+    for domain in DOMAIN_KEYS:
+        table = build_domain_table(domain)
+        np.save(directory / f"{domain}.npy", table)
+        manifest['domains'][domain] = {
+            'questions': DOMAIN_QUESTIONS[domain] + ['cloud_usage'],
+            'radices': domain_radices(domain),
+            'entries': len(table),
+        }
+
+    with open(directory / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+# -----------------------------
+# Lookup
+# -----------------------------
+
+class ScoreTable:
+    """Memory-mapped domain tables produced by build_tables()"""
+
+    def __init__(self, tables: dict):
+        self.tables = tables
+        self._columns = {domain: _domain_columns(domain) for domain in DOMAIN_KEYS}
+        self._strides = {domain: _strides(domain_radices(domain)) for domain in DOMAIN_KEYS}
+
+    @classmethod
+    def load(cls, directory, mmap: bool = True) -> 'ScoreTable':
+        """Open tables built for the current rules (ValueError if stale)"""
+        directory = Path(directory)
+        with open(directory / MANIFEST_NAME, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('fingerprint') != rules_fingerprint():
+            raise ValueError(
+                f"Score tables in {directory} were built for different rules; "
+                f"rebuild with: python -m engine.table build {directory}"
+            )
+        mode = 'r' if mmap else None
+        return cls({
+            domain: np.load(directory / f"{domain}.npy", mmap_mode=mode)
+            for domain in DOMAIN_KEYS
+        })
+
+    @classmethod
+    def build(cls) -> 'ScoreTable':
+        """In-memory tables, without touching disk"""
+        return cls({domain: build_domain_table(domain) for domain in DOMAIN_KEYS})
+
+    def domain_codes(self, codes: np.ndarray, domain: str) -> np.ndarray:
+        """Mixed-radix index of each encoded row into the domain table"""
+        codes = np.asarray(codes)
+        index = np.zeros(len(codes), dtype=np.int32)
+        for column, stride in zip(self._columns[domain], self._strides[domain]):
+            index += codes[:, column].astype(np.int32) * int(stride)
+        return index
+
+    def score_matrix(self, codes: np.ndarray) -> dict:
+        """Same output as vectorized.score_matrix, plus '<domain>_fired' bits
+
+        Column-major input (np.asfortranarray) avoids strided column reads
+        on very large matrices.
+        """
+        out = {}
+        total = 0
+        rule_mask = 0
+        for domain in DOMAIN_KEYS:
+            entries = self.tables[domain][self.domain_codes(codes, domain)]
+            out[domain] = entries['score']
+            out[f"{domain}_fired"] = entries['fired']
+            total = total + entries['score'].astype(np.int16)
+            # A domain's rules are contiguous in RULES, so its bits shift into place
+            rule_mask = rule_mask | entries['fired'].astype(np.uint32) << np.uint32(DOMAIN_RULES[domain][0])
+        out['total'] = total
+        out['risk_class'] = RISK_CLASS[total]
+        out['rule_mask'] = rule_mask
+        return out
+
+    def score_rows(self, rows) -> dict:
+        """Encode and score an iterable of answer dicts"""
+        return self.score_matrix(encode_matrix(rows))
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.table',
+                                     description="Precompute domain score tables")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="build tables into a directory")
+    build.add_argument('directory')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        directory = build_tables(args.directory)
+        sizes = ", ".join(f"{d}={len(ScoreTable.load(directory).tables[d])}" for d in DOMAIN_KEYS)
+        print(f"Score tables written to {directory} ({sizes})")
+
+if __name__ == "__main__":
+    main()
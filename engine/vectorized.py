@@ -0,0 +1,85 @@
+# engine/vectorized.py - EU Digital Resilience Toolkit
+# NumPy scoring over integer-encoded answer matrices
+
+import numpy as np
+
+from .questions import QUESTIONS, DOMAIN_KEYS, option_index, cloud_count
+from .rules import RULES, RULE_PENALTIES, DOMAIN_MAX_SCORE
+from .scoring import RISK_LEVELS, calculate_risk_level
+
+# Matrix layout: one uint8 column per question, cloud service count last
+COLUMNS = tuple(QUESTIONS) + ('cloud_usage',)
+CLOUD_COLUMN = len(COLUMNS) - 1
+
+# Risk class for every reachable total (0-100), taken from calculate_risk_level
+RISK_CLASS = np.array(
+    [RISK_LEVELS.index(calculate_risk_level(total)) for total in range(101)],
+    dtype=np.uint8
+)
+
+def _compile_penalties():
+    """(rule index, domain index, column, penalty lookup array, min cloud) per rule"""
+    return [
+        (i, DOMAIN_KEYS.index(rule.domain), COLUMNS.index(rule.question),
+         np.array(penalties, dtype=np.uint8), rule.min_cloud)
+        for i, (rule, penalties) in enumerate(zip(RULES, RULE_PENALTIES))
+    ]
+
+_COMPILED = _compile_penalties()
+
+# -----------------------------
+# Encoding
+# -----------------------------
+
+def encode_answers(data: dict) -> list:
+    """Encode one answer dict as a row of option codes (COLUMNS order)"""
+    row = [option_index(question_id, data.get(question_id)) for question_id in QUESTIONS]
+    row.append(cloud_count(data))
+    return row
+
+def encode_matrix(rows) -> np.ndarray:
+    """Encode an iterable of answer dicts as an (N, len(COLUMNS)) uint8 matrix"""
+    return np.array([encode_answers(data) for data in rows], dtype=np.uint8).reshape(-1, len(COLUMNS))
+
+# -----------------------------
+# Scoring
+# -----------------------------
+
+def score_matrix(codes: np.ndarray) -> dict:
+    """Score N encoded rows at once
+
+    Returns int arrays of length N: one per domain key ('governance',
+    'logging', 'third_party', 'incident'), 'total', 'risk_class' (index
+    into RISK_LEVELS) and 'rule_mask' (bit i set when RULES[i] fired).
+    """
+    codes = np.asarray(codes)
+    cloud = codes[:, CLOUD_COLUMN]
+    penalties = np.zeros((len(codes), len(DOMAIN_KEYS)), dtype=np.int16)
+    rule_mask = np.zeros(len(codes), dtype=np.uint32)
+
+    for i, domain, column, lookup, min_cloud in _COMPILED:
+        deduction = lookup[codes[:, column]]
+        if min_cloud:
+            deduction = deduction * (cloud >= min_cloud)
+        penalties[:, domain] += deduction
+        rule_mask |= (deduction > 0).astype(np.uint32) << np.uint32(i)
+
+    scores = DOMAIN_MAX_SCORE - penalties
+    total = scores.sum(axis=1)
+
+    out = {key: scores[:, i] for i, key in enumerate(DOMAIN_KEYS)}
+    out['total'] = total
+    out['risk_class'] = RISK_CLASS[total]
+    out['rule_mask'] = rule_mask
+    return out
+
+def rule_counts(rule_masks: np.ndarray) -> np.ndarray:
+    """How many results fired each rule (index i = RULES[i]), from bitmasks"""
+    rule_masks = np.asarray(rule_masks, dtype=np.uint32)
+    return np.array([
+        np.count_nonzero(rule_masks & np.uint32(1 << i)) for i in range(len(RULES))
+    ], dtype=np.int64)
+
+def score_rows(rows) -> dict:
+    """Encode and score an iterable of answer dicts"""
+    return score_matrix(encode_matrix(rows))
@@ -0,0 +1,209 @@
+# tests/legacy_scoring.py - EU Digital Resilience Toolkit
+# Frozen copy of the hand-written domain scorers the rule table replaced
+#
+# Golden reference for tests/test_engine.py: RULES must reproduce these
+# scores and texts exactly. Do not edit to match a rule change; a change
+# in behaviour belongs in the rules and in the tests that pin it.
+
+def assess_governance(data: dict) -> tuple:
+    """Phase 1: Governance & Scope - 25 points
+    
+    Detailed scoring:
+    - Sector classification: 5 pts
+    - ICT risk framework: 10 pts
+    - Board oversight: 5 pts
+    - Cloud governance: 5 pts
+    """
+    score = 25
+    findings = []
+    recs = []
+    gaps = []
+    
+    # Sector classification (5 pts)
+    if data.get('sector') in ['Unknown', 'Not applicable']:
+        score -= 3
+        gaps.append("NIS2/DORA: Sector classification unclear")
+        recs.append("Determine if organization qualifies as Essential/Important Entity (NIS2) or Financial Entity (DORA)")
+    
+    # ICT risk framework (10 pts)
+    if data.get('risk_framework') != "Yes, documented and tested":
+        score -= 8
+        findings.append("No mature ICT risk management framework in place")
+        gaps.append("NIS2 Art. 21 / DORA Art. 6: ICT risk management framework missing")
+        recs.append("Establish documented ICT risk management framework covering identification, protection, detection, response, recovery")
+    elif data.get('risk_framework') == "Partially documented":
+        score -= 4
+        findings.append("ICT risk framework exists but not fully operationalized")
+        recs.append("Complete ICT risk framework documentation and conduct annual testing/validation")
+    
+    # Governance oversight (5 pts)
+    if data.get('board_oversight') != "Yes, quarterly reviews":
+        score -= 4
+        findings.append("Insufficient board-level oversight of ICT and cyber risks")
+        gaps.append("NIS2 Art. 20 / DORA Art. 5: Management body accountability")
+        recs.append("Establish quarterly board reporting on ICT risks, incidents, and resilience metrics")
+    
+    # Cloud usage assessment (5 pts)
+    cloud_types = data.get('cloud_usage', [])
+    if len(cloud_types) >= 2 and data.get('cloud_governance') != "Yes, formalized":
+        score -= 3
+        findings.append(f"Significant cloud usage ({len(cloud_types)} service types) without formalized governance")
+        gaps.append("DORA Art. 28: Cloud service provider governance")
+        recs.append("Implement cloud governance framework: inventory, risk assessment, contractual controls, exit strategies")
+    
+    return score, findings, recs, gaps
+
+def assess_logging(data: dict) -> tuple:
+    """Phase 2: Logging & Monitoring - 25 points
+    
+    Detailed scoring:
+    - Centralized logging: 7 pts
+    - Log retention: 7 pts
+    - Log integrity: 5 pts
+    - Cloud log integration: 3 pts
+    - Real-time monitoring: 3 pts
+    """
+    score = 25
+    findings = []
+    recs = []
+    gaps = []
+    
+    # Centralized logging (7 pts)
+    if data.get('centralized_logging') != "Yes, SIEM deployed":
+        score -= 6
+        findings.append("Logs not centralized in SIEM/log management platform")
+        gaps.append("NIS2 Art. 21: Log collection and monitoring")
+        recs.append("Deploy SIEM solution (Splunk, ELK, Sentinel) for centralized log collection and correlation")
+    
+    # Log retention (7 pts)
+    retention = data.get('log_retention')
+    if retention not in ["18-24 months", "24+ months"]:
+        score -= 6
+        findings.append(f"Log retention ({retention}) below regulatory minimum (18 months)")
+        gaps.append("NIS2: 18-month minimum retention for audit logs")
+        recs.append("CRITICAL: Extend log retention to minimum 18 months for all security-relevant logs")
+    
+    # Log integrity (5 pts)
+    if data.get('log_integrity') != "Yes, automated verification":
+        score -= 4
+        findings.append("Log integrity not cryptographically verified")
+        gaps.append("NIS2/DORA: Log tamper-evidence for audit purposes")
+        recs.append("Implement automated log hashing (SHA-256) with secure hash storage and periodic verification")
+    
+    # Cloud log integration (3 pts)
+    cloud_types = data.get('cloud_usage', [])
+    if cloud_types and data.get('cloud_logs_integrated') != "Yes, all sources":
+        score -= 3
+        findings.append("Cloud platform logs not fully integrated into central monitoring")
+        recs.append("Integrate all cloud provider logs (AWS CloudTrail, Azure Monitor, GCP Cloud Logging) into SIEM")
+    
+    # Real-time monitoring (3 pts)
+    if data.get('realtime_monitoring') != "Yes, 24/7 SOC":
+        score -= 2
+        findings.append("No 24/7 security monitoring capability")
+        recs.append("Establish 24/7 SOC or engage managed detection and response (MDR) provider")
+    
+    return score, findings, recs, gaps
+
+def assess_third_party(data: dict) -> tuple:
+    """Phase 3: ICT Third-Party Risk - 25 points
+    
+    Detailed scoring:
+    - Vendor inventory: 6 pts
+    - Audit rights: 6 pts
+    - Incident notification SLA: 5 pts
+    - Cloud exit strategies: 4 pts
+    - Supply chain monitoring: 4 pts
+    """
+    score = 25
+    findings = []
+    recs = []
+    gaps = []
+    
+    # Critical vendor inventory (6 pts)
+    if data.get('vendor_inventory') != "Yes, complete and current":
+        score -= 5
+        findings.append("ICT third-party inventory incomplete or outdated")
+        gaps.append("DORA Art. 28: Register of ICT third-party providers")
+        recs.append("Maintain current register of all ICT third-party providers with criticality classification")
+    
+    # Contractual audit rights (6 pts)
+    if data.get('audit_rights') != "Yes, in all critical contracts":
+        score -= 5
+        findings.append("Right-to-audit clauses missing in critical vendor contracts")
+        gaps.append("DORA Art. 30: Contractual audit and access rights")
+        recs.append("Negotiate right-to-audit, security testing rights, and access to SOC 2/ISO certifications in all critical contracts")
+    
+    # Incident notification SLAs (5 pts)
+    if data.get('incident_notification_sla') not in ["24 hours", "12 hours"]:
+        score -= 4
+        findings.append("Vendor incident notification SLAs inadequate or undefined")
+        gaps.append("DORA Art. 19: Incident reporting by ICT providers")
+        recs.append("Require 24-hour notification for security incidents in all critical vendor contracts")
+    
+    # Cloud exit strategies (4 pts)
+    cloud_types = data.get('cloud_usage', [])
+    if cloud_types and data.get('cloud_exit_plan') != "Yes, tested annually":
+        score -= 4
+        findings.append("Cloud exit/portability strategies not tested")
+        gaps.append("DORA Art. 28: Exit strategies for critical cloud providers")
+        recs.append("Develop and test annual cloud exit plans: data portability, alternative CSPs, 90-day transition timeline")
+    
+    # Supply chain risk monitoring (4 pts)
+    if data.get('supply_chain_monitoring') != "Yes, continuous assessment":
+        score -= 3
+        findings.append("No continuous monitoring of third-party security posture")
+        recs.append("Deploy third-party risk monitoring platform (BitSight, SecurityScorecard, Prevalent) for continuous assessment")
+    
+    return score, findings, recs, gaps
+
+def assess_incident(data: dict) -> tuple:
+    """Phase 4: Incident & Resilience - 25 points
+    
+    Detailed scoring:
+    - Incident response process: 7 pts
+    - 24h reporting capability: 7 pts
+    - Resilience testing: 5 pts
+    - RTO/RPO defined: 3 pts
+    - Cloud incident integration: 3 pts
+    """
+    score = 25
+    findings = []
+    recs = []
+    gaps = []
+    
+    # Incident response process (7 pts)
+    if data.get('incident_process') != "Yes, documented and tested":
+        score -= 6
+        findings.append("Incident response process not mature")
+        gaps.append("NIS2 Art. 23: Incident handling and reporting")
+        recs.append("Establish documented incident response plan with quarterly tabletop exercises")
+    
+    # 24-hour reporting capability (7 pts)
+    if data.get('24h_reporting') != "Yes, process established":
+        score -= 6
+        findings.append("Cannot meet 24-hour initial incident notification requirement")
+        gaps.append("NIS2 Art. 23: 24-hour early warning, 72-hour notification deadlines")
+        recs.append("CRITICAL: Establish 24/7 incident detection and 24-hour reporting capability to authorities")
+    
+    # Resilience testing (5 pts)
+    if data.get('resilience_testing') not in ["Quarterly", "Bi-annually"]:
+        score -= 4
+        findings.append("Insufficient resilience and recovery testing frequency")
+        gaps.append("DORA Art. 24: ICT resilience testing")
+        recs.append("Conduct resilience testing at least bi-annually: disaster recovery, incident response, threat-led penetration testing (TLPT)")
+    
+    # RTO/RPO defined (3 pts)
+    if data.get('rto_rpo_defined') != "Yes, for all critical systems":
+        score -= 2
+        findings.append("Recovery time/point objectives not defined for all critical systems")
+        recs.append("Define and document RTO/RPO for all critical ICT systems and applications")
+    
+    # Cloud incident integration (3 pts)
+    cloud_types = data.get('cloud_usage', [])
+    if cloud_types and data.get('cloud_incident_integration') != "Yes":
+        score -= 2
+        findings.append("Cloud provider incidents not integrated into organizational incident response")
+        recs.append("Integrate cloud provider incident notifications into organizational incident management workflow")
+    
+    return score, findings, recs, gaps
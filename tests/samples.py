@@ -0,0 +1,48 @@
+# tests/samples.py - EU Digital Resilience Toolkit
+# Shared test data: seeded random questionnaires
+
+import random
+
+from engine import assess
+from engine.questions import QUESTIONS, CLOUD_SERVICES
+
+TIMESTAMP = '2025-03-31 09:00 UTC'
+
+# Besides the offered options: missing answer, "N/A" (no cloud) and free text
+EXTRA_ANSWERS = (None, 'N/A', 'Something else')
+
+def drop_missing(values: dict) -> dict:
+    """Answer dict with None values left out (a question never answered)"""
+    return {key: value for key, value in values.items() if value is not None}
+
+def random_answers(rng: random.Random) -> dict:
+    values = {q: rng.choice(options + list(EXTRA_ANSWERS)) for q, options in QUESTIONS.items()}
+    values['scope'] = rng.choice(['NIS2 Essential Entity', 'DORA Financial Entity', None])
+    cloud = rng.sample(CLOUD_SERVICES, rng.randint(0, len(CLOUD_SERVICES)))
+    values['cloud_usage'] = cloud if cloud or rng.random() < 0.5 else None
+    return drop_missing(values)
+
+def random_portfolio(n: int, seed: int = 2025) -> list:
+    rng = random.Random(seed)
+    return [random_answers(rng) for _ in range(n)]
+
+# -----------------------------
+# Stored History
+# -----------------------------
+
+SECTORS = ('Energy', 'Banking', 'Healthcare')
+
+def random_timestamp(rng: random.Random) -> str:
+    return f"{rng.randint(2023, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00 UTC"
+
+def stored_items(n: int, seed: int) -> list:
+    """(entity_id, answers, result) with a few entities, sectors and scopes"""
+    rng = random.Random(seed)
+    items = []
+    for data in random_portfolio(n, seed):
+        data['sector'] = rng.choice(SECTORS)
+        if rng.random() < 0.3:
+            data['scope'] = 'NIS2 Essential Entity, DORA Financial Entity'
+        entity_id = rng.choice([None, 'E-1', 'E-2', 'E-3', 'E-4'])
+        items.append((entity_id, data, assess(data, random_timestamp(rng))))
+    return items
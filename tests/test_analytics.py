@@ -0,0 +1,69 @@
+# tests/test_analytics.py - EU Digital Resilience Toolkit
+# Single-pass portfolio stats vs a direct computation over the results
+
+import json
+from collections import Counter
+
+import pytest
+
+from samples import TIMESTAMP, random_portfolio
+from engine import assess, CompactResult
+from engine.analytics import PortfolioStats, portfolio_stats
+from engine.questions import DOMAIN_KEYS
+from engine.rules import RULE_IDS
+from engine.scoring import RISK_LEVELS
+
+@pytest.fixture(scope='module')
+def portfolio() -> list:
+    return random_portfolio(1000, seed=14)
+
+@pytest.fixture(scope='module')
+def results(portfolio) -> list:
+    return [assess(data, TIMESTAMP) for data in portfolio]
+
+def _score(result, key: str) -> int:
+    return result.total_score if key == 'total' else getattr(result, f"{key}_score")
+
+def test_stats_match_direct_computation(results):
+    stats = portfolio_stats(results)
+    assert stats.count == len(results)
+    for key in DOMAIN_KEYS + ('total',):
+        scores = [_score(result, key) for result in results]
+        assert stats.mean(key) == pytest.approx(sum(scores) / len(scores))
+        assert sum(stats.histograms[key]) == len(results)
+    assert stats.risk_counts() == dict(dict.fromkeys(RISK_LEVELS, 0), **Counter(r.risk_level for r in results))
+    for sector in {result.sector for result in results}:
+        in_sector = Counter(r.risk_level for r in results if r.sector == sector)
+        assert {level: n for level, n in stats.risk_by_sector[sector].items() if n} == in_sector
+    assert stats.rule_frequencies() == {
+        rule_id: sum(result.rule_mask >> i & 1 for result in results) for i, rule_id in enumerate(RULE_IDS)
+    }
+    counts = [gap['count'] for gap in stats.top_gaps(len(RULE_IDS))]
+    assert counts == sorted(counts, reverse=True)
+
+def test_merged_shards_equal_one_pass(results):
+    whole = portfolio_stats(results)
+    shards = [portfolio_stats(results[start:start + 300]) for start in range(0, len(results), 300)]
+    merged = PortfolioStats()
+    for shard in shards:
+        merged.merge(shard)
+    assert merged == whole
+    assert shards[0] + shards[1] + shards[2] + shards[3] == whole
+    assert merged.summary() == whole.summary()
+    # merge leaves the other accumulator alone
+    assert shards[0] == portfolio_stats(results[:300])
+
+def test_compact_results_give_the_same_stats(portfolio, results):
+    compact = [CompactResult.from_answers(data, TIMESTAMP) for data in portfolio[:200]]
+    assert portfolio_stats(compact) == portfolio_stats(results[:200])
+
+def test_snapshot_round_trips_through_json(results):
+    stats = portfolio_stats(results)
+    restored = PortfolioStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+    assert restored == stats
+    restored.merge(stats)
+    assert restored.count == 2 * stats.count
+
+def test_empty_stats():
+    stats = PortfolioStats()
+    assert (stats.mean(), stats.quantile(0.5), stats.top_gaps()) == (0.0, None, [])
@@ -0,0 +1,69 @@
+# tests/test_bundle.py - EU Digital Resilience Toolkit
+# ZIP bundle layout, index and failure handling
+
+import csv
+import io
+import zipfile
+
+import pytest
+
+from engine import assess, generate_text_report, generate_csv_export
+from engine.bundle import INDEX_COLUMNS, BundleWriter, iter_bundle, write_bundle
+
+TIMESTAMP = '2025-03-31 09:00 UTC'
+
+def _items():
+    return [
+        ('ACME', assess({'sector': 'Energy'}, TIMESTAMP)),
+        ('acme', assess({'sector': 'Unknown'}, TIMESTAMP)),
+        ('ACME', assess({'sector': 'Transport'}, TIMESTAMP)),
+        ('ACME-2', assess({'sector': 'Healthcare'}, TIMESTAMP)),
+        ('a/b', assess({}, TIMESTAMP)),
+    ]
+
+def _index(archive: zipfile.ZipFile) -> list:
+    return list(csv.DictReader(io.StringIO(archive.read('index.csv').decode('utf-8'))))
+
+def test_layout_and_index():
+    buffer = io.BytesIO()
+    assert write_bundle(_items(), buffer, ('txt', 'csv')) == 5
+    archive = zipfile.ZipFile(buffer)
+    rows = _index(archive)
+    assert list(rows[0]) == INDEX_COLUMNS
+    folders = [row['folder'] for row in rows]
+    # Unique case-insensitively, and never a real id's name
+    assert folders == ['ACME', 'acme-2', 'ACME-3', 'ACME-2-2', 'a_b']
+    assert archive.namelist() == [f"{folder}/{folder}.{ext}" for folder in folders for ext in ('txt', 'csv')] + ['index.csv']
+    for (entity_id, result), row in zip(_items(), rows):
+        folder = row['folder']
+        assert row['entity_id'] == entity_id
+        assert archive.read(f"{folder}/{folder}.txt").decode('utf-8') == generate_text_report(result)
+        assert archive.read(f"{folder}/{folder}.csv").decode('utf-8') == generate_csv_export(result)
+        assert int(row['total_score']) == result.total_score
+
+def test_workers_and_streaming_write_the_same_entries():
+    serial = io.BytesIO()
+    write_bundle(_items(), serial, ('txt', 'csv'))
+    parallel = io.BytesIO()
+    write_bundle(_items(), parallel, ('txt', 'csv'), workers=2, shard_size=2)
+    streamed = b''.join(iter_bundle(_items(), ('txt', 'csv')))
+    expected = {name: zipfile.ZipFile(serial).read(name) for name in zipfile.ZipFile(serial).namelist()}
+    for data in (parallel, io.BytesIO(streamed)):
+        archive = zipfile.ZipFile(data)
+        assert {name: archive.read(name) for name in archive.namelist()} == expected
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        BundleWriter(io.BytesIO(), ('txt', 'docx'))
+
+def test_failed_run_leaves_no_valid_archive():
+    def failing():
+        yield from _items()[:2]
+        raise RuntimeError('source failed')
+
+    buffer = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        write_bundle(failing(), buffer, ('txt',), shard_size=1)
+    assert buffer.getvalue()  # entries were written...
+    with pytest.raises(zipfile.BadZipFile):  # ...but no central directory
+        zipfile.ZipFile(buffer)
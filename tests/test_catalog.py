@@ -0,0 +1,67 @@
+# tests/test_catalog.py - EU Digital Resilience Toolkit
+# Catalog validation and lookups
+
+import json
+
+import pytest
+
+from engine import get_answer_feedback, get_practical_advice
+from engine.catalog import CATALOG_PATH, DEFAULT_FEEDBACK, CatalogError, compile_catalog, get_catalog
+from engine.questions import QUESTIONS
+
+def _raw() -> dict:
+    return json.loads(CATALOG_PATH.read_text(encoding='utf-8'))
+
+def test_bundled_catalog_covers_every_scored_option():
+    catalog = get_catalog()
+    for question_id, options in QUESTIONS.items():
+        if question_id == 'sector':
+            continue
+        for option in options:
+            assert catalog.get_feedback(question_id, option) is not DEFAULT_FEEDBACK, (question_id, option)
+
+def test_lookups_match_the_catalog_file():
+    raw = _raw()
+    for question_id, options in raw['feedback'].items():
+        for option, entry in options.items():
+            assert dict(get_answer_feedback(question_id, option)) == entry
+    for question_id, options in raw['advice'].items():
+        for option, text in options.items():
+            assert get_practical_advice(question_id, option) == text
+
+def test_unknown_answers_get_defaults():
+    assert get_answer_feedback('risk_framework', 'Something else') is DEFAULT_FEEDBACK
+    assert get_answer_feedback('no_such_question', 'No framework') is DEFAULT_FEEDBACK
+    assert get_answer_feedback('risk_framework', None) is DEFAULT_FEEDBACK
+    assert get_practical_advice('risk_framework', 'Yes, documented and tested') == ''
+
+def test_feedback_is_read_only():
+    with pytest.raises(TypeError):
+        get_answer_feedback('risk_framework', 'No framework')['status'] = 'optimal'
+
+def _broken(path: tuple, value) -> dict:
+    raw = _raw()
+    target = raw
+    for key in path[:-1]:
+        target = target[key]
+    if value is KeyError:
+        del target[path[-1]]
+    else:
+        target[path[-1]] = value
+    return raw
+
+FEEDBACK = ('feedback', 'risk_framework', 'No framework')
+
+@pytest.mark.parametrize('raw, message', [
+    (_broken(('version',), 2), 'version'),
+    (_broken(('feedback', 'no_such_question'), {'x': {}}), 'unknown question'),
+    (_broken(('advice', 'risk_framework', 'Maybe'), 'text'), 'not an option'),
+    (_broken(FEEDBACK + ('icon',), KeyError), 'fields'),
+    (_broken(FEEDBACK + ('extra',), ''), 'fields'),
+    (_broken(FEEDBACK + ('status',), 'fine'), 'unknown status'),
+    (_broken(('advice', 'risk_framework', 'No framework'), ''), 'non-empty'),
+    (_broken(('advice', 'risk_framework', 'No framework'), None), 'non-empty'),
+])
+def test_invalid_catalogs_are_rejected(raw, message):
+    with pytest.raises(CatalogError, match=message):
+        compile_catalog(raw)
@@ -0,0 +1,65 @@
+# tests/test_diff.py - EU Digital Resilience Toolkit
+# Rule-level diff vs comparing two full assessments
+
+import random
+
+import pytest
+
+from samples import TIMESTAMP, random_answers
+from engine import assess, diff_answers, diff_many, diff_results
+from engine.diff import mask_scores
+from engine.questions import DOMAIN_KEYS
+from engine.rules import RULE_IDS
+
+FIELDS = {domain: f"{domain}_score" for domain in DOMAIN_KEYS}
+
+@pytest.fixture(scope='module')
+def pairs() -> list:
+    rng = random.Random(18)
+    return [(random_answers(rng), random_answers(rng)) for _ in range(500)]
+
+def _fired(result) -> set:
+    return {rule_id for i, rule_id in enumerate(RULE_IDS) if result.rule_mask >> i & 1}
+
+def test_diff_matches_full_assessments(pairs):
+    for before_answers, after_answers in pairs:
+        before, after = assess(before_answers, TIMESTAMP), assess(after_answers, TIMESTAMP)
+        diff = diff_results(before, after, before_answers, after_answers)
+        assert set(diff.rules_started) == _fired(after) - _fired(before)
+        assert set(diff.rules_stopped) == _fired(before) - _fired(after)
+        assert diff.score_deltas == dict(
+            {domain: getattr(after, field) - getattr(before, field) for domain, field in FIELDS.items()},
+            total=after.total_score - before.total_score)
+        assert (diff.risk_before, diff.risk_after) == (before.risk_level, after.risk_level)
+        for label, gaps in after.regulatory_gaps.items():
+            assert diff.gaps_opened.get(label, []) == [g for g in gaps if g not in before.regulatory_gaps[label]]
+            assert diff.gaps_closed.get(label, []) == [g for g in before.regulatory_gaps[label] if g not in gaps]
+        # Answers alone give the same diff
+        assert diff_answers(before_answers, after_answers) == diff
+
+def test_mask_scores_match_assess(pairs):
+    for answers, _ in pairs:
+        result = assess(answers, TIMESTAMP)
+        scores = mask_scores(result.rule_mask)
+        assert [scores[domain] for domain in DOMAIN_KEYS] == [getattr(result, f) for f in FIELDS.values()]
+        assert scores['total'] == result.total_score
+
+def test_same_answers_are_unchanged():
+    answers = {'sector': 'Energy', 'log_retention': '<6 months', 'cloud_usage': ['PaaS', 'SaaS']}
+    reordered = dict(answers, cloud_usage=['SaaS', 'PaaS'])
+    diff = diff_answers(answers, reordered)
+    assert diff.unchanged and diff.changed_answers == {}
+    assert set(diff.score_deltas.values()) == {0}
+    changed = diff_answers(answers, dict(answers, cloud_usage=['PaaS']))
+    assert changed.changed_answers == {'cloud_usage': (['PaaS', 'SaaS'], ['PaaS'])}
+
+def test_diff_many_over_stored_history(tmp_path, pairs):
+    from engine.store import ResultStore
+    with ResultStore(tmp_path / 'history.db') as store:
+        for n, (before, after) in enumerate(pairs[:20]):
+            store.add(assess(before, '2025-03-31 09:00 UTC'), before, f"E-{n}")
+            store.add(assess(after, '2025-06-30 09:00 UTC'), after, f"E-{n}")
+        diffs = dict(diff_many(store.latest_pairs()))
+    assert sorted(diffs) == sorted(f"E-{n}" for n in range(20))
+    for n, (before, after) in enumerate(pairs[:20]):
+        assert diffs[f"E-{n}"] == diff_answers(before, after)
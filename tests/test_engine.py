@@ -0,0 +1,236 @@
+# tests/test_engine.py - EU Digital Resilience Toolkit
+# Scoring equivalence and report pinning
+#
+# Run: python -m pytest
+#
+# The rule table is checked against the hand-written scorers it replaced
+# (tests/legacy_scoring.py) over the whole answer space of every domain.
+# The other scoring paths (vectorized, precomputed tables, CompactResult,
+# LiveAssessment, cached_assess) are checked against assess() on a seeded
+# random portfolio, and the TXT report and CSV export are pinned byte for
+# byte.
+
+import itertools
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import legacy_scoring
+from samples import EXTRA_ANSWERS, TIMESTAMP, drop_missing, random_portfolio
+from engine import (
+    RISK_LEVELS, RULES, RULE_IDS, DOMAIN_CACHE, assess, build_result, cached_assess, cached_assess_masked,
+    generate_text_report, generate_csv_export, render_report, CompactResult, LiveAssessment,
+)
+from engine.questions import QUESTIONS, CLOUD_SERVICES, DOMAIN_KEYS, DOMAIN_QUESTIONS
+from engine.rules import DOMAIN_MAX_SCORE, evaluate_domain
+from engine.table import ScoreTable
+from engine.vectorized import score_rows
+
+GOLDEN = Path(__file__).parent / 'golden'
+
+LEGACY_SCORERS = {
+    'governance': legacy_scoring.assess_governance,
+    'logging': legacy_scoring.assess_logging,
+    'third_party': legacy_scoring.assess_third_party,
+    'incident': legacy_scoring.assess_incident,
+}
+
+@pytest.fixture(scope='module')
+def portfolio() -> list:
+    return random_portfolio(3000)
+
+@pytest.fixture(scope='module')
+def expected(portfolio) -> list:
+    return [assess(data, TIMESTAMP) for data in portfolio]
+
+# -----------------------------
+# Rule Table vs Legacy Scorers
+# -----------------------------
+
+@pytest.mark.parametrize('domain', DOMAIN_KEYS)
+def test_domain_matches_legacy_over_answer_space(domain):
+    """Every answer combination of the domain: same score, texts and order"""
+    questions = DOMAIN_QUESTIONS[domain]
+    choices = [QUESTIONS[q] + list(EXTRA_ANSWERS) for q in questions]
+    clouds = [None] + [CLOUD_SERVICES[:n] for n in range(1, len(CLOUD_SERVICES) + 1)]
+    legacy = LEGACY_SCORERS[domain]
+    checked = 0
+    for combination in itertools.product(*choices):
+        for cloud in clouds:
+            data = drop_missing(dict(zip(questions, combination), cloud_usage=cloud))
+            assert evaluate_domain(domain, data) == legacy(data), data
+            checked += 1
+    assert checked > 1000
+
+@pytest.mark.parametrize('rule_id', RULE_IDS)
+def test_each_rule_deducts_its_penalty_alone(rule_id):
+    """One failing answer on a mature questionnaire fires exactly that rule"""
+    i = RULE_IDS.index(rule_id)
+    rule = RULES[i]
+    data = json.loads((GOLDEN / 'answers.json').read_text(encoding='utf-8'))['mature']
+    data['cloud_usage'] = CLOUD_SERVICES[:max(rule.min_cloud, 1)]
+    data[rule.question] = rule.failing[0] if rule.failing else 'Something else'
+
+    result = assess(data, TIMESTAMP)
+    score, findings, recs, gaps = LEGACY_SCORERS[rule.domain](data)
+    assert result.rule_mask == 1 << i
+    assert getattr(result, f"{rule.domain}_score") == score == DOMAIN_MAX_SCORE - rule.penalty
+    assert result.total_score == 3 * DOMAIN_MAX_SCORE + score
+    assert (result.findings, result.recommendations) == (findings, recs)
+    assert sum(result.regulatory_gaps.values(), []) == gaps
+
+def test_gated_rules_need_cloud_usage():
+    data = {rule.question: 'Something else' for rule in RULES if rule.min_cloud}
+    assert assess(data, TIMESTAMP).rule_mask & sum(1 << i for i, r in enumerate(RULES) if r.min_cloud) == 0
+
+# -----------------------------
+# Scoring Paths vs assess()
+# -----------------------------
+
+def _check_arrays(scores: dict, expected: list):
+    for n, result in enumerate(expected):
+        assert [int(scores[domain][n]) for domain in DOMAIN_KEYS] == [
+            result.governance_score, result.logging_score, result.third_party_score, result.incident_score
+        ]
+        assert int(scores['total'][n]) == result.total_score
+        assert RISK_LEVELS[scores['risk_class'][n]] == result.risk_level
+        assert int(scores['rule_mask'][n]) == result.rule_mask
+
+def test_vectorized_matches_assess(portfolio, expected):
+    _check_arrays(score_rows(portfolio), expected)
+
+def test_score_table_matches_assess(portfolio, expected):
+    _check_arrays(ScoreTable.build().score_rows(portfolio), expected)
+
+def test_score_table_round_trips_through_disk(tmp_path, portfolio, expected):
+    from engine.table import build_tables
+    table = ScoreTable.load(build_tables(tmp_path))
+    _check_arrays(table.score_rows(portfolio[:200]), expected[:200])
+
+def test_compact_result_matches_assess(portfolio, expected):
+    for data, result in zip(portfolio, expected):
+        compact = CompactResult.from_answers(data, TIMESTAMP)
+        assert compact.to_result() == result
+        assert (compact.total_score, compact.risk_level) == (result.total_score, result.risk_level)
+
+def test_compact_results_hash_by_value(portfolio):
+    import pickle
+    records = [CompactResult.from_answers(data, TIMESTAMP) for data in portfolio[:300]]
+    copies = [pickle.loads(pickle.dumps(record)) for record in records]
+    assert [hash(c) for c in copies] == [hash(r) for r in records]
+    assert set(records) == set(copies)
+    assert len(set(records + copies)) == len({r._key() for r in records})
+
+def test_live_assessment_matches_assess(portfolio, expected):
+    for data, result in zip(portfolio, expected):
+        assert LiveAssessment(data).result(TIMESTAMP) == result
+
+def test_live_assessment_stays_in_sync_answer_by_answer(portfolio):
+    """Updates on top of earlier answers, as the page records them"""
+    live = LiveAssessment()
+    for data in portfolio[:300]:
+        for question_id, value in data.items():
+            live.set(question_id, value)
+            assert live.result(TIMESTAMP) == assess(live.data, TIMESTAMP)
+
+def test_cached_assess_matches_scorers(portfolio):
+    DOMAIN_CACHE.clear()
+    for _ in range(2):  # cold, then from the cache
+        for data in portfolio[:500]:
+            for domain in DOMAIN_KEYS:
+                assert cached_assess(domain, data) == evaluate_domain(domain, data)
+    assert DOMAIN_CACHE.stats()['hits'] > 0
+
+def test_cached_masks_build_the_same_result(portfolio, expected):
+    DOMAIN_CACHE.clear()
+    for data, result in zip(portfolio[:500], expected):
+        domain_results = [cached_assess_masked(domain, data) for domain in DOMAIN_KEYS]
+        built = build_result(data, [entry[:4] for entry in domain_results], TIMESTAMP,
+                             domain_masks=[entry[4] for entry in domain_results])
+        assert built == result
+
+def test_cached_assess_results_are_not_shared():
+    data = {'sector': 'Unknown'}
+    score, findings, recs, gaps = cached_assess('governance', data)
+    findings.append('edited by the caller')
+    assert 'edited by the caller' not in cached_assess('governance', data)[1]
+
+# -----------------------------
+# JSON Export
+# -----------------------------
+
+ODD_ANSWERS = {1: 'numeric key', 'float': 1.5e16, 'flag': True, 'big': 2 ** 70,
+               'missing': None, 'cloud_usage': ('PaaS', 3)}
+
+def test_json_backends_write_identical_bytes(portfolio, expected):
+    orjson = pytest.importorskip('orjson')
+    from engine.serialize import result_document, to_json
+    cases = [(f"E-{n}", result, data) for n, (data, result) in enumerate(zip(portfolio[:300], expected))]
+    cases.append((1.5e16, expected[0], ODD_ANSWERS))
+    for entity_id, result, answers in cases:
+        assert to_json(result, entity_id, answers).encode('utf-8') == \
+            orjson.dumps(result_document(result, entity_id, answers))
+
+def test_json_export_normalizes_answers(expected):
+    from engine.serialize import load_result, to_json_bytes
+    entity_id, result, answers = load_result(to_json_bytes(expected[0], 42, ODD_ANSWERS))
+    assert (entity_id, result) == ('42', expected[0])
+    assert answers == {'1': 'numeric key', 'float': '1.5e+16', 'flag': 'True',
+                       'big': str(2 ** 70), 'missing': None, 'cloud_usage': ['PaaS', '3']}
+
+# -----------------------------
+# Imports
+# -----------------------------
+
+def test_engine_import_leaves_fpdf_unloaded():
+    """fpdf2 is only imported once a PDF is rendered (the home page never does)"""
+    code = "import sys, engine; assert 'fpdf' not in sys.modules, 'fpdf imported by engine'"
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=Path(__file__).parent.parent)
+
+# Loaded on demand by engine.bundle, engine.serialize, engine.store,
+# engine.vectorized and the exports; never by `import engine`
+HEAVY_MODULES = ('concurrent.futures.process', 'multiprocessing', 'sqlite3', 'orjson', 'numpy', 'streamlit')
+IMPORT_BUDGET_MS = 150
+
+def test_engine_import_stays_light():
+    """Worker processes and the home page import the package on every start"""
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        "import engine\n"
+        "print((time.perf_counter() - started) * 1000)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    timings = []
+    for _ in range(3):
+        run = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True,
+                             cwd=Path(__file__).parent.parent)
+        elapsed, loaded = run.stdout.splitlines()
+        assert loaded == '', f"import engine loads {loaded}"
+        timings.append(float(elapsed))
+    assert min(timings) < IMPORT_BUDGET_MS, f"import engine took {min(timings):.0f} ms"
+
+# -----------------------------
+# Pinned Reports
+# -----------------------------
+
+FIXTURES = ('mature', 'gaps', 'unanswered')
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_text_report_bytes_are_pinned(name):
+    data = json.loads((GOLDEN / 'answers.json').read_text(encoding='utf-8'))[name]
+    result = assess(data, TIMESTAMP)
+    golden = (GOLDEN / f"{name}.txt").read_bytes()
+    assert generate_text_report(result).encode('utf-8') == golden
+    assert render_report(result, 'txt').encode('utf-8') == golden
+    assert generate_text_report(CompactResult.from_answers(data, TIMESTAMP).to_result()).encode('utf-8') == golden
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_csv_export_bytes_are_pinned(name):
+    """The page's CSV layout; the rule mask is only in the JSON and wide CSV exports"""
+    data = json.loads((GOLDEN / 'answers.json').read_text(encoding='utf-8'))[name]
+    golden = (GOLDEN / f"{name}.csv").read_bytes()
+    assert generate_csv_export(assess(data, TIMESTAMP)).encode('utf-8') == golden
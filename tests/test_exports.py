@@ -0,0 +1,82 @@
+# tests/test_exports.py - EU Digital Resilience Toolkit
+# Content-addressed export cache
+
+import json
+
+import pytest
+
+from engine import assess
+from engine.exports import ExportCache, get_export, result_digest
+
+TIMESTAMP = '2025-03-31 09:00 UTC'
+ANSWERS = {'sector': 'Energy', 'log_retention': '<6 months', 'cloud_usage': ['PaaS']}
+
+@pytest.fixture
+def result():
+    return assess(ANSWERS, TIMESTAMP)
+
+def test_json_export_is_cached_per_answers(result):
+    cache = ExportCache()
+    first = get_export(result, 'json', cache=cache, answers=ANSWERS)
+    assert json.loads(first)['answers'] == ANSWERS
+    # Same answers in another order: served from the cache
+    assert get_export(result, 'json', cache=cache, answers=dict(reversed(list(ANSWERS.items())))) is first
+    assert cache.stats()['hits'] == 1
+    # Different answers, same result: its own entry
+    other = get_export(result, 'json', cache=cache, answers=dict(ANSWERS, scope='NIS2 Essential Entity'))
+    assert json.loads(other)['answers']['scope'] == 'NIS2 Essential Entity'
+    assert len(cache) == 2
+
+def test_json_export_without_answers(result):
+    assert json.loads(get_export(result, 'json', cache=ExportCache()))['answers'] is None
+
+def test_answers_only_for_answer_formats(result):
+    with pytest.raises(ValueError):
+        get_export(result, 'txt', cache=ExportCache(), answers=ANSWERS)
+
+def test_digest_depends_on_content_only(result):
+    assert result_digest(result) == result_digest(assess(dict(ANSWERS), TIMESTAMP))
+    assert result_digest(result) != result_digest(assess(ANSWERS, '2025-04-01 09:00 UTC'))
+
+# -----------------------------
+# Byte-bounded LRU
+# -----------------------------
+
+def test_cache_accounts_bytes_and_evicts_least_recent():
+    cache = ExportCache(max_bytes=10)
+    cache.put('a', b'1234')
+    cache.put('b', 'àèì')  # 6 bytes as UTF-8
+    assert cache.bytes == 10
+    cache.get('a')  # 'b' is now the least recently used
+    cache.put('c', b'12')
+    assert (cache.get('b'), cache.get('a'), cache.get('c')) == (None, b'1234', b'12')
+    assert cache.bytes == 6
+
+def test_cache_replaces_entries_in_place():
+    cache = ExportCache(max_bytes=10)
+    cache.put('a', b'12345678')
+    cache.put('a', b'12')
+    assert (cache.bytes, len(cache)) == (2, 1)
+
+def test_cache_skips_oversized_exports_and_clears():
+    cache = ExportCache(max_bytes=4, maxsize=2)
+    cache.put('big', b'12345')
+    assert cache.get('big') is None and cache.bytes == 0
+    for key in 'xyz':
+        cache.put(key, b'1')
+    assert len(cache) == 2 and cache.bytes == 2  # maxsize also bounds it
+    cache.clear()
+    assert cache.stats()['bytes'] == 0 and len(cache) == 0
+
+def test_pdf_is_only_built_when_requested(result, monkeypatch):
+    import engine.exports as exports
+    built = []
+    monkeypatch.setitem(exports.EXPORTERS, 'pdf', (lambda r: built.append(r) or b'%PDF', 'application/pdf'))
+    cache = ExportCache()
+    digest = result_digest(result)
+    for fmt in ('txt', 'csv', 'json'):
+        get_export(result, fmt, digest, cache=cache)
+    assert built == []
+    get_export(result, 'pdf', digest, cache=cache)
+    get_export(result, 'pdf', digest, cache=cache)
+    assert built == [result]
@@ -0,0 +1,72 @@
+# tests/test_montecarlo.py - EU Digital Resilience Toolkit
+# Monte Carlo simulation vs the exact score of each scenario
+
+import math
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from samples import TIMESTAMP
+from engine import assess
+from engine.montecarlo import simulate
+from engine.questions import CLOUD_SERVICES
+
+BASE = {'sector': 'Energy', 'risk_framework': 'Partially documented', 'log_retention': '<6 months',
+        'cloud_usage': ['IaaS', 'PaaS']}
+
+def exact(data: dict, question_id: str, distribution: dict) -> dict:
+    """Total score -> probability, by assessing every option"""
+    weight = sum(distribution.values())
+    scores = {}
+    for option, p in distribution.items():
+        if question_id == 'cloud_usage':
+            option = CLOUD_SERVICES[:option]
+        total = assess(dict(data, **{question_id: option}), TIMESTAMP).total_score
+        scores[total] = scores.get(total, 0) + p / weight
+    return scores
+
+def test_known_answers_give_one_score():
+    result = assess(BASE, TIMESTAMP)
+    sim = simulate(BASE, {}, samples=1000, seed=1)
+    assert (sim.mean, sim.std) == (result.total_score, 0)
+    assert sim.histogram[result.total_score] == 1000
+    assert sim.risk_probabilities[result.risk_level] == 1
+    assert set(sim.percentiles.values()) == {result.total_score}
+
+@pytest.mark.parametrize('question_id, distribution', [
+    ('24h_reporting', {'Yes, process established': 0.3, 'Uncertain': 0.7}),
+    ('log_retention', {'<6 months': 1, '6-12 months': 1, '18-24 months': 1, '24+ months': 2}),
+    ('cloud_usage', {0: 0.5, 1: 0.25, 3: 0.25}),
+])
+def test_sampled_distribution_matches_exact(question_id, distribution):
+    samples = 50_000
+    sim = simulate(BASE, {question_id: distribution}, samples=samples, seed=20)
+    expected = exact(BASE, question_id, distribution)
+    mean = sum(score * p for score, p in expected.items())
+    std = math.sqrt(sum(p * (score - mean) ** 2 for score, p in expected.items()))
+    assert sim.mean == pytest.approx(mean, abs=5 * std / math.sqrt(samples) + 1e-9)
+    assert sim.std == pytest.approx(std, rel=0.05)
+    # Only reachable scores occur, each about as often as expected
+    for score, n in enumerate(sim.histogram):
+        p = expected.get(score, 0)
+        assert abs(n / samples - p) <= 5 * math.sqrt(p * (1 - p) / samples) + 1e-9
+
+def test_seed_makes_runs_repeatable():
+    distributions = {'24h_reporting': {'Yes, process established': 1, 'Uncertain': 1},
+                     'risk_framework': {'No framework': 1, 'Yes, documented and tested': 3}}
+    assert simulate(BASE, distributions, 2000, seed=7) == simulate(BASE, distributions, 2000, seed=7)
+
+@pytest.mark.parametrize('distributions', [
+    {'no_such_question': {'x': 1}},
+    {'risk_framework': {'Maybe': 1}},
+    {'risk_framework': {'No framework': -1, 'Ad-hoc processes': 2}},
+    {'risk_framework': {'No framework': 0}},
+])
+def test_invalid_distributions_are_rejected(distributions):
+    with pytest.raises(ValueError):
+        simulate(BASE, distributions, samples=10)
+
+def test_samples_must_be_positive():
+    with pytest.raises(ValueError):
+        simulate(BASE, {}, samples=0)
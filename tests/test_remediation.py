@@ -0,0 +1,87 @@
+# tests/test_remediation.py - EU Digital Resilience Toolkit
+# Remediation plans vs trying every subset of changes
+
+import itertools
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from samples import TIMESTAMP, random_answers
+from engine import assess
+from engine.remediation import LOW_THRESHOLD, plan_remediation, ranked_changes
+
+MATURE = json.loads((Path(__file__).parent / 'golden' / 'answers.json').read_text(encoding='utf-8'))['mature']
+
+def near_mature(rng: random.Random) -> dict:
+    """Mature answers with a random subset replaced (few enough changes to enumerate)"""
+    noisy = random_answers(rng)
+    data = dict(MATURE)
+    for key, value in noisy.items():
+        if rng.random() < 0.4:
+            data[key] = value
+    return data
+
+@pytest.fixture(scope='module')
+def cases() -> list:
+    rng = random.Random(19)
+    return [near_mature(rng) for _ in range(150)]
+
+def apply(data: dict, changes: list) -> dict:
+    improved = dict(data)
+    for change in changes:
+        improved[change.question] = change.target if change.target is not None else MATURE[change.question]
+    return improved
+
+def brute_force(changes: list, needed: int) -> tuple:
+    """(cost, -gain) of the best subset reaching `needed`; None if none does"""
+    best = None
+    for k in range(len(changes) + 1):
+        for subset in itertools.combinations(changes, k):
+            gain = sum(change.gain for change in subset)
+            if gain >= needed:
+                candidate = (sum(change.cost for change in subset), -gain)
+                best = candidate if best is None else min(best, candidate)
+    return best
+
+def _check(data: dict, costs: dict = None):
+    plan = plan_remediation(data, costs=costs)
+    result = assess(data, TIMESTAMP)
+    assert plan.total_score == result.total_score
+    needed = LOW_THRESHOLD - result.total_score
+    if needed <= 0:
+        assert plan.changes == [] and plan.feasible
+        return plan
+    best = brute_force(ranked_changes(data, costs), needed)
+    assert plan.feasible == (best is not None)
+    if best is None:
+        return plan
+    assert plan.cost == best[0]
+    if not costs:  # fewest changes, then the largest gain
+        assert -plan.gain == best[1]
+    # Applying the plan really reaches the projected score
+    improved = assess(apply(data, plan.changes), TIMESTAMP)
+    assert improved.total_score == plan.projected_score >= LOW_THRESHOLD
+    assert improved.risk_level == plan.projected_risk_level
+    return plan
+
+def test_default_plan_has_fewest_changes(cases):
+    assert sum(bool(_check(data).changes) for data in cases) > 50
+
+def test_weighted_plan_is_cheapest(cases):
+    rng = random.Random(19)
+    for data in cases:
+        costs = {change.question: rng.randint(1, 6) for change in ranked_changes(data)}
+        _check(data, costs)
+
+def test_every_change_fixes_its_rules(cases):
+    for data in cases[:50]:
+        for change in ranked_changes(data):
+            before = assess(data, TIMESTAMP)
+            after = assess(apply(data, [change]), TIMESTAMP)
+            assert after.total_score - before.total_score == change.gain
+
+def test_unreachable_target_is_reported():
+    plan = plan_remediation({}, target_score=101)
+    assert not plan.feasible and plan.projected_score == 100
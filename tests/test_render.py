@@ -0,0 +1,33 @@
+# tests/test_render.py - EU Digital Resilience Toolkit
+# Markdown and HTML report styles
+
+from dataclasses import replace
+
+import pytest
+
+from samples import TIMESTAMP
+from engine import assess, render_report
+from engine.render import DOCUMENT_TITLE
+
+@pytest.fixture
+def result():
+    result = assess({'sector': 'Energy', 'log_retention': '<6 months'}, TIMESTAMP)
+    return replace(result, sector='R&D *core* _ops_ #1 [x] <b>',
+                   findings=['Use of `root` and *wildcard* IAM_roles'] + result.findings)
+
+def test_markdown_escapes_answer_text(result):
+    report = render_report(result, 'md')
+    assert r"- **Sector:** R&D \*core\* \_ops\_ \#1 \[x\] <b>" in report
+    assert r"1. Use of \`root\` and \*wildcard\* IAM\_roles" in report
+    # Template markup itself is untouched
+    assert report.startswith('# EU DIGITAL RESILIENCE ASSESSMENT REPORT\n')
+
+def test_html_escapes_answer_text(result):
+    report = render_report(result, 'html')
+    assert "R&amp;D *core* _ops_ #1 [x] &lt;b&gt;" in report
+    assert f"<title>{DOCUMENT_TITLE}</title>" in report and 'Eu ' not in report
+
+def test_pdf_title_keeps_acronym(result):
+    pytest.importorskip('fpdf')
+    from engine.pdf import ReportPDF
+    assert ReportPDF().title == DOCUMENT_TITLE == "EU Digital Resilience Assessment Report"
@@ -0,0 +1,100 @@
+# tests/test_server.py - EU Digital Resilience Toolkit
+# HTTP scoring service: responses and error statuses
+
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+
+import engine.server as server_module
+from engine import assess
+from engine.server import INLINE_BODY_BYTES, MAX_BATCH, MAX_BODY_BYTES, ScoringServer, score_records
+
+ANSWERS = {'sector': 'Energy', 'log_retention': '<6 months', 'cloud_usage': ['PaaS']}
+
+@pytest.fixture(scope='module')
+def port():
+    scoring = ScoringServer(workers=1)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    listener = asyncio.run_coroutine_threadsafe(scoring.start('127.0.0.1', 0), loop).result()
+    yield listener.sockets[0].getsockname()[1]
+
+    async def stop():
+        listener.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    scoring.executor.shutdown()
+
+def request(port: int, method: str, path: str, body: bytes = None, headers: dict = None) -> tuple:
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+def post(port: int, payload, path: str = '/score') -> tuple:
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+    return request(port, 'POST', path, body)
+
+def test_single_record(port):
+    status, payload = post(port, ANSWERS, '/score?include=text')
+    assert status == 200
+    assert payload == score_records([ANSWERS], ('text',))[0]
+    assert payload['total_score'] == assess(ANSWERS).total_score
+
+def test_batch_is_scored_in_workers(port):
+    records = [ANSWERS, {}, dict(ANSWERS, sector='Unknown')]
+    status, payload = post(port, records)
+    assert status == 200
+    assert [item['total_score'] for item in payload['results']] == [assess(r).total_score for r in records]
+
+@pytest.mark.parametrize('body, message', [
+    (b'{"sector": ', 'not valid JSON'),
+    (b'"just a string"', 'Expected an answer object'),
+    (json.dumps([ANSWERS, {'sector': 3}]).encode(), 'sector must be a string or null in record 1'),
+    (json.dumps({'cloud_usage': 'PaaS'}).encode(), 'cloud_usage must be a list of strings'),
+    # Past the inline limit: the error comes back from a worker process
+    (b'[' + b'{"sector": "Energy"}, ' * (INLINE_BODY_BYTES // 20) + b'{"sector": 1}]', 'sector must be'),
+    (b'[' + b' ' * INLINE_BODY_BYTES + b'{', 'not valid JSON'),
+])
+def test_bad_payloads_get_400(port, body, message):
+    status, payload = post(port, body)
+    assert status == 400
+    assert message in payload['error']
+
+def test_bad_content_length_gets_400(port):
+    assert request(port, 'POST', '/score', headers={'Content-Length': 'ten'})[0] == 400
+
+def test_oversized_requests_get_413(port):
+    status, _ = request(port, 'POST', '/score', headers={'Content-Length': str(MAX_BODY_BYTES + 1)})
+    assert status == 413
+    status, payload = post(port, [{}] * (MAX_BATCH + 1))
+    assert status == 413 and str(MAX_BATCH) in payload['error']
+
+def test_unexpected_failure_gets_500(port, monkeypatch):
+    def broken(data, timestamp=None):
+        raise KeyError('boom')
+    monkeypatch.setattr(server_module, 'assess', broken)  # single records are scored in-process
+    status, payload = post(port, ANSWERS)
+    assert status == 500
+    assert payload['error'] == 'Internal Server Error: KeyError'
+
+def test_other_routes(port):
+    assert request(port, 'GET', '/health') == (200, {'status': 'ok'})
+    assert request(port, 'GET', '/score')[0] == 405
+    assert request(port, 'GET', '/nowhere')[0] == 404
+    status, metrics = request(port, 'GET', '/metrics/latency')
+    assert status == 200 and metrics['/score']['count'] > 0
@@ -0,0 +1,68 @@
+# tests/test_sketch.py - EU Digital Resilience Toolkit
+# Score sketch quantiles vs sorting the scores
+
+import math
+import random
+
+import pytest
+
+from samples import TIMESTAMP, random_portfolio
+from engine import assess
+from engine.analytics import portfolio_stats
+from engine.questions import scope_entries
+from engine.sketch import ScoreSketch
+
+QS = (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1)
+
+def nearest_rank(scores: list, q: float) -> int:
+    ordered = sorted(scores)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+def test_quantiles_are_exact():
+    rng = random.Random(15)
+    for n in (1, 2, 7, 100, 1001):
+        scores = [rng.randint(0, 100) for _ in range(n)]
+        sketch = ScoreSketch(100)
+        for score in scores:
+            sketch.add(score)
+        assert sketch.quantiles(QS) == [nearest_rank(scores, q) for q in QS]
+
+def test_merge_is_addition():
+    rng = random.Random(15)
+    parts = [[rng.randint(0, 25) for _ in range(rng.randint(0, 50))] for _ in range(5)]
+    sketches = []
+    for scores in parts:
+        sketch = ScoreSketch(25)
+        for score in scores:
+            sketch.add(score)
+        sketches.append(sketch)
+    merged = ScoreSketch(25)
+    for sketch in sketches:
+        merged.merge(sketch)
+    everything = sum(parts, [])
+    assert merged.count == len(everything)
+    assert merged.quantiles(QS) == [nearest_rank(everything, q) for q in QS]
+    assert ScoreSketch.from_dict(merged.to_dict()) == merged
+
+def test_invalid_use_is_rejected():
+    with pytest.raises(ValueError):
+        ScoreSketch(25).merge(ScoreSketch(100))
+    with pytest.raises(ValueError):
+        ScoreSketch(25).quantile(1.5)
+    assert ScoreSketch(25).quantile(0.5) is None
+
+def test_percentiles_by_sector_and_scope():
+    portfolio = random_portfolio(800, seed=15)
+    for data in portfolio[::3]:
+        data['scope'] = 'NIS2 Essential Entity, DORA Financial Entity'
+    results = [assess(data, TIMESTAMP) for data in portfolio]
+    stats = portfolio_stats(results)
+    by_sector = stats.percentiles('sector', 'total', QS)
+    assert list(by_sector) == sorted({r.sector for r in results})
+    for sector, quantiles in by_sector.items():
+        assert quantiles == [nearest_rank([r.total_score for r in results if r.sector == sector], q) for q in QS]
+    # An assessment in several scopes counts in each
+    for scope, quantiles in stats.percentiles('scope', 'logging', QS).items():
+        scores = [r.logging_score for r in results if scope in scope_entries(r.scope)]
+        assert quantiles == [nearest_rank(scores, q) for q in QS]
+    assert stats.quantile(0.5) == nearest_rank([r.total_score for r in results], 0.5)
@@ -0,0 +1,74 @@
+# tests/test_store.py - EU Digital Resilience Toolkit
+# SQLite result store: round trips, filters and batched writes
+
+import sqlite3
+from dataclasses import replace
+
+import pytest
+
+from samples import stored_items
+from engine.store import ResultStore
+
+@pytest.fixture
+def items() -> list:
+    return stored_items(400, seed=16)
+
+@pytest.fixture
+def store(tmp_path, items):
+    with ResultStore(tmp_path / 'store.db') as store:
+        store.add_many(items, batch_size=64)
+        yield store
+
+def _expected(items: list, **filters) -> list:
+    """Ids (1-based insertion order) matching the filters, in timestamp order"""
+    matching = []
+    for n, (entity_id, _, result) in enumerate(items, 1):
+        scopes = [part.strip() for part in result.scope.split(',')]
+        if (filters.get('entity_id', entity_id) == entity_id
+                and filters.get('sector', result.sector) == result.sector
+                and ('scope' not in filters or filters['scope'] in scopes)
+                and filters.get('risk_level', result.risk_level) == result.risk_level
+                and result.timestamp >= filters.get('since', '')
+                and result.timestamp < filters.get('until', '~')):
+            matching.append((result.timestamp, n))
+    return [n for _, n in sorted(matching)]
+
+def test_results_round_trip(store, items):
+    for n, (entity_id, answers, result) in enumerate(items, 1):
+        stored = store.get(n)
+        assert (stored.id, stored.entity_id, stored.answers, stored.result) == (n, entity_id, answers, result)
+    assert store.get(len(items) + 1) is None
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'sector': 'Energy'},
+    {'scope': 'DORA Financial Entity'},
+    {'risk_level': 'HIGH', 'sector': 'Banking'},
+    {'since': '2024-01-01', 'until': '2024-07-01'},
+    {'entity_id': 'E-2', 'since': '2024-04-01'},
+])
+def test_filters_match_a_scan(store, items, filters):
+    expected = _expected(items, **filters)
+    assert [s.id for s in store.query(**filters)] == expected
+    assert [s.id for s in store.iter_query(**filters)] == expected
+    assert [s.id for s in store.query(newest_first=True, limit=5, **filters)] == expected[::-1][:5]
+    assert store.count(**filters) == len(expected)
+
+def test_history_and_latest(store, items):
+    assert [s.id for s in store.history('E-1')] == _expected(items, entity_id='E-1')
+    assert [s.id for s in store.latest(3, entity_id='E-1')] == _expected(items, entity_id='E-1')[::-1][:3]
+
+def test_unknown_filter_is_rejected(store):
+    with pytest.raises(TypeError):
+        store.query(colour='red')
+
+def test_failed_batch_is_rolled_back(store, items):
+    broken = [items[0], ('E-1', None, replace(items[1][2], sector=None))]  # sector is NOT NULL
+    before = store.count()
+    trend = store.sector_trend()
+    with pytest.raises(sqlite3.IntegrityError):
+        store.add_many(broken)
+    assert store.count() == before
+    assert store.sector_trend() == trend
+    # The store is still usable
+    assert store.add(items[0][2]) == before + 1
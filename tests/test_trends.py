@@ -0,0 +1,95 @@
+# tests/test_trends.py - EU Digital Resilience Toolkit
+# Incrementally maintained trend rollups vs the raw history
+
+from collections import defaultdict
+
+import pytest
+
+from samples import stored_items
+from engine.scoring import RISK_LEVELS
+from engine.store import ResultStore, quarter_of
+
+SCORES = ('total', 'governance', 'logging', 'third_party', 'incident')
+
+def _score(result, name: str) -> int:
+    return result.total_score if name == 'total' else getattr(result, f"{name}_score")
+
+def _point(quarter: str, results: list) -> dict:
+    n = len(results)
+    point = {'quarter': quarter, 'count': n}
+    for name in SCORES:
+        point[f"mean_{name}"] = round(sum(_score(r, name) for r in results) / n, 2)
+    totals = [r.total_score for r in results]
+    point['min_total'], point['max_total'] = min(totals), max(totals)
+    return point
+
+def expected_sector_trend(items: list, sector: str = None) -> list:
+    quarters = defaultdict(list)
+    for _, _, result in items:
+        if sector in (None, result.sector):
+            quarters[quarter_of(result.timestamp)].append(result)
+    trend = []
+    for quarter, results in sorted(quarters.items()):
+        point = _point(quarter, results)
+        point['risk_levels'] = dict.fromkeys(RISK_LEVELS, 0)
+        for result in results:
+            point['risk_levels'][result.risk_level] += 1
+        trend.append(point)
+    return trend
+
+def expected_entity_trend(items: list, entity_id: str) -> list:
+    quarters = defaultdict(list)
+    for item_entity, _, result in items:
+        if item_entity == entity_id:
+            quarters[quarter_of(result.timestamp)].append(result)
+    trend = []
+    for quarter, results in sorted(quarters.items()):
+        point = _point(quarter, results)
+        last = max(results, key=lambda r: r.timestamp)
+        point['last_timestamp'], point['last_total'] = last.timestamp, last.total_score
+        trend.append(point)
+    return trend
+
+@pytest.fixture
+def items() -> list:
+    return stored_items(600, seed=17)
+
+def _check(store: ResultStore, items: list):
+    for sector in (None, 'Energy', 'Banking', 'Healthcare'):
+        assert store.sector_trend(sector) == expected_sector_trend(items, sector)
+    for entity_id in ('E-1', 'E-2', 'E-3', 'E-4'):
+        assert store.entity_trend(entity_id) == expected_entity_trend(items, entity_id)
+
+def test_rollups_follow_every_insert(tmp_path, items):
+    """Batches of several sizes, inserted out of timestamp order"""
+    with ResultStore(tmp_path / 'trends.db') as store:
+        store.add_many(items[:250], batch_size=7)
+        _check(store, items[:250])
+        for entity_id, answers, result in items[250:300]:
+            store.add(result, answers, entity_id)
+        store.add_many(items[300:])
+        _check(store, items)
+        store.rebuild_rollups()
+        _check(store, items)
+
+def test_trend_bounds_are_inclusive_quarters(tmp_path, items):
+    with ResultStore(tmp_path / 'trends.db') as store:
+        store.add_many(items)
+        expected = [p for p in expected_sector_trend(items) if '2024-Q2' <= p['quarter'] <= '2024-Q4']
+        assert store.sector_trend(since='2024-Q2', until='2024-Q4') == expected
+
+def test_version_1_store_gets_rollups_on_open(tmp_path, items):
+    path = tmp_path / 'v1.db'
+    with ResultStore(path) as store:
+        store.add_many(items)
+    # A store written before the rollup tables existed
+    with ResultStore(path) as store:
+        store._conn.executescript(
+            "DROP TABLE rollup_sector_quarter; DROP TABLE rollup_entity_quarter; PRAGMA user_version=1;"
+        )
+    with ResultStore(path) as store:
+        assert store._conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        _check(store, items)
+    # Opening a current store again does not rebuild (or double) the rollups
+    with ResultStore(path) as store:
+        _check(store, items)